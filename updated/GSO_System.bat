@@ -19,10 +19,27 @@ start cmd /k "cd /d C:\Users\Client\Desktop\New_Version\gso_latest_gso && uvicor
 echo Starting Main Django Server...
 start cmd /k "cd /d C:\Users\Client\Desktop\New_Version\gso_latest_gso && python manage.py runserver"
 
+:: Background workers: each must keep running while the system is in use.
+::   process_war_jobs - generates queued WAR descriptions (otherwise they stay "pending")
+echo Starting WAR Description Worker...
+start "WAR Description Worker" cmd /k "cd /d C:\Users\Client\Desktop\New_Version\gso_latest_gso && python manage.py process_war_jobs"
+
+::   refresh_ipmt_summaries - recomputes IPMT summaries after WAR changes (otherwise the preview goes stale)
+echo Starting IPMT Summary Worker...
+start "IPMT Summary Worker" cmd /k "cd /d C:\Users\Client\Desktop\New_Version\gso_latest_gso && python manage.py refresh_ipmt_summaries"
+
+::   process_export_jobs - renders queued WAR / IPMT / month-end / feedback exports (otherwise they stay queued)
+echo Starting Export Worker...
+start "Export Worker" cmd /k "cd /d C:\Users\Client\Desktop\New_Version\gso_latest_gso && python manage.py process_export_jobs"
+
 echo ==============================================
-echo   Both servers are now running!
+echo   The GSO System is now running!
 echo   - FastAPI (AI Service): http://127.0.0.1:8001
 echo   - Django (Main System): http://127.0.0.1:8000
+echo   - Worker: WAR descriptions (process_war_jobs)
+echo   - Worker: IPMT summaries (refresh_ipmt_summaries)
+echo   - Worker: report exports (process_export_jobs)
+echo   Keep every window open; closing a worker stops its queue.
 echo ==============================================
 
 timeout /t 5 /nobreak >nul
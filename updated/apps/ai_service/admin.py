@@ -1,4 +1,18 @@
 from django.contrib import admin
-from .models import AIReportSummary
+from .models import AIReportSummary, AIResultCache, WARDescriptionJob
 
 admin.site.register(AIReportSummary)
+
+
+@admin.register(AIResultCache)
+class AIResultCacheAdmin(admin.ModelAdmin):
+    list_display = ("key", "model_name", "prompt_version", "hit_count", "created_at", "last_used_at")
+    list_filter = ("model_name", "prompt_version")
+    search_fields = ("key", "prompt")
+
+
+@admin.register(WARDescriptionJob)
+class WARDescriptionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "war", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("war__id", "last_error")
@@ -0,0 +1,99 @@
+# apps/ai_service/cache.py
+import os
+import hashlib
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AIResultCache
+
+# -------------------------------
+# Cache Config
+# -------------------------------
+AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "phi3")  # must match the inference server model
+PROMPT_TEMPLATE_VERSION = "1"  # bump when a prompt template changes to retire old results
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000"))
+AI_CACHE_EVICT_EVERY = int(os.getenv("AI_CACHE_EVICT_EVERY", "100"))  # stores between eviction passes
+
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, amount: int = 1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def cache_key(prompt: str, model_name: str = AI_MODEL_NAME, prompt_version: str = PROMPT_TEMPLATE_VERSION) -> str:
+    payload = "\x1f".join([model_name, prompt_version, prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_result(prompt: str) -> Optional[str]:
+    """Return the cached output for `prompt`, or None on a miss or an expired entry."""
+    key = cache_key(prompt)
+    entry = AIResultCache.objects.filter(key=key).only("id", "result", "created_at").first()
+    if entry is None or entry.created_at < timezone.now() - timedelta(seconds=AI_CACHE_TTL):
+        _count("misses")
+        return None
+
+    AIResultCache.objects.filter(id=entry.id).update(hit_count=F("hit_count") + 1, last_used_at=timezone.now())
+    _count("hits")
+    return entry.result
+
+
+def store_result(prompt: str, result: str):
+    """
+    Save (or overwrite) the output for `prompt`.
+    Every AI_CACHE_EVICT_EVERY stores, expired and excess entries are evicted; in between the cache
+    may run over its limit by that many entries (expired ones are never served).
+    """
+    now = timezone.now()
+    AIResultCache.objects.update_or_create(
+        key=cache_key(prompt),
+        defaults={
+            "model_name": AI_MODEL_NAME,
+            "prompt_version": PROMPT_TEMPLATE_VERSION,
+            "prompt": prompt,
+            "result": result,
+            "created_at": now,
+            "last_used_at": now,
+        },
+    )
+    with _stats_lock:
+        _stats["stores"] += 1
+        due = _stats["stores"] % max(1, AI_CACHE_EVICT_EVERY) == 0
+    if due:
+        evict()
+
+
+def evict() -> int:
+    """Drop entries older than the TTL, then the least recently used ones above the size limit."""
+    removed, _ = AIResultCache.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=AI_CACHE_TTL)
+    ).delete()
+
+    excess = AIResultCache.objects.count() - AI_CACHE_MAX_ENTRIES
+    if excess > 0:
+        oldest_ids = list(
+            AIResultCache.objects.order_by("last_used_at").values_list("id", flat=True)[:excess]
+        )
+        removed += AIResultCache.objects.filter(id__in=oldest_ids).delete()[0]
+
+    if removed:
+        _count("evictions", removed)
+    return removed
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for this process plus the size of the persistent cache."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    stats["entries"] = AIResultCache.objects.count()
+    return stats
@@ -0,0 +1,25 @@
+# apps/ai_service/exceptions.py
+
+
+class AIServiceError(Exception):
+    """Base error for calls to the local AI inference server."""
+
+
+class AIServiceUnavailable(AIServiceError):
+    """The inference server could not be reached or answered with a server error."""
+
+
+class AICircuitOpen(AIServiceUnavailable):
+    """Recent calls kept failing; calls fail fast until the cool-down window passes."""
+
+
+class AITimeout(AIServiceError):
+    """The call did not finish within its deadline."""
+
+
+class AIBadResponse(AIServiceError):
+    """The server rejected the prompt or returned unusable output."""
+
+
+class AIServiceBusy(AIServiceUnavailable):
+    """The server's admission queue is full (HTTP 429); try again later."""
@@ -1,7 +1,13 @@
 # apps/ai_service/inference_server.py
-from fastapi import FastAPI, HTTPException, Header
+from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-import subprocess, os
+from typing import List, Literal
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, bisect, hashlib, heapq, itertools, math, queue, random, threading, time
+import requests, os
 from dotenv import load_dotenv
 
 # === LOAD ENV ===
@@ -10,15 +16,472 @@ load_dotenv()  # <-- this will load AI_API_URL and AI_API_KEY from your .env
 # === CONFIG ===
 API_KEY = os.environ.get("AI_API_KEY", "changeme")
 MODEL_NAME = "phi3"  # Ollama model name
-OLLAMA_PATH = r"C:\Users\CLIENT\AppData\Local\Programs\Ollama\ollama.exe"  # full path
+AI_BACKEND = os.environ.get("AI_BACKEND", "ollama")  # "ollama" or "fake" (see BACKENDS)
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")  # Ollama daemon started by ollama.exe
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")  # keep model loaded between prompts
+POOL_SIZE = int(os.environ.get("AI_POOL_SIZE", "2"))  # number of long-lived model sessions
+MAX_CONCURRENCY = int(os.environ.get("AI_MAX_CONCURRENCY", str(POOL_SIZE)))  # prompts running at once
+MODEL_TIMEOUT = 120  # seconds per prompt
+MAX_PROMPT_CHARS = int(os.environ.get("AI_MAX_PROMPT_CHARS", "1000"))
+MAX_BATCH_SIZE = int(os.environ.get("AI_MAX_BATCH_SIZE", "50"))  # prompts per /v1/generate_batch call
+MAX_QUEUE_DEPTH = int(os.environ.get("AI_MAX_QUEUE_DEPTH", "100"))  # waiting prompts before 429
+RETRY_AFTER = 5  # seconds suggested to callers turned away with 429
+
+# Lower number = admitted first
+PRIORITIES = {"interactive": 0, "background": 1, "bulk": 2}
+
+# Fake backend (AI_BACKEND=fake) for benchmarking without Ollama
+FAKE_LATENCY_DIST = os.environ.get("AI_FAKE_LATENCY_DIST", "lognormal")  # fixed, uniform, normal, lognormal
+FAKE_LATENCY_MEAN = float(os.environ.get("AI_FAKE_LATENCY_MEAN", "0.5"))  # seconds
+FAKE_LATENCY_STDDEV = float(os.environ.get("AI_FAKE_LATENCY_STDDEV", "0.2"))  # seconds
+FAKE_OUTPUT_WORDS = int(os.environ.get("AI_FAKE_OUTPUT_WORDS", "30"))
+FAKE_FAILURE_RATE = float(os.environ.get("AI_FAKE_FAILURE_RATE", "0.0"))  # 0.0 - 1.0
+FAKE_SEED = int(os.environ.get("AI_FAKE_SEED", "42"))
+
+
+# === MODEL BACKENDS ===
+class ModelBackend(ABC):
+    """
+    What the pool needs from a model session. Pick one with AI_BACKEND.
+    """
+
+    @abstractmethod
+    def generate(self, prompt: str, timeout: float = MODEL_TIMEOUT) -> str:
+        """Return the model's text for `prompt`; raise on failure or timeout."""
+
+    def warm_up(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ModelSession(ModelBackend):
+    """
+    One long-lived session to the Ollama daemon.
+    Keeps its HTTP connection open and the model resident (keep_alive),
+    so a prompt no longer pays process startup and model attach cost.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, host=OLLAMA_HOST):
+        self.model_name = model_name
+        self.url = f"{host.rstrip('/')}/api/generate"
+        self.http = requests.Session()
+
+    def generate(self, prompt: str, timeout: float = MODEL_TIMEOUT) -> str:
+        response = self.http.post(
+            self.url,
+            json={
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE,
+            },
+            timeout=timeout,
+        )
+        if response.status_code != 200:
+            raise Exception(response.text.strip() or f"Ollama returned HTTP {response.status_code}")
+        return response.json().get("response", "").strip()
+
+    def warm_up(self):
+        # An empty prompt makes Ollama load the model without generating anything
+        self.generate("")
+
+    def close(self):
+        self.http.close()
+
+
+class FakeSession(ModelBackend):
+    """
+    Drop-in replacement for ModelSession that never touches Ollama.
+
+    Sleeps for a latency drawn from the configured distribution, fails with
+    probability `failure_rate`, and otherwise returns `output_words` words
+    derived from the prompt. Seeded, so a run is reproducible.
+    """
+
+    _instances = itertools.count()
+    _WORDS = ("Completed", "repair", "of", "the", "electrical", "lines", "and", "fixtures", "at", "office")
+
+    def __init__(self, dist=None, mean=None, stddev=None, output_words=None, failure_rate=None, seed=None):
+        self.dist = dist or FAKE_LATENCY_DIST
+        self.mean = FAKE_LATENCY_MEAN if mean is None else mean
+        self.stddev = FAKE_LATENCY_STDDEV if stddev is None else stddev
+        self.output_words = FAKE_OUTPUT_WORDS if output_words is None else output_words
+        self.failure_rate = FAKE_FAILURE_RATE if failure_rate is None else failure_rate
+        # Each pooled session gets its own stream so sessions don't share RNG state across threads
+        self.rng = random.Random((FAKE_SEED if seed is None else seed) + next(self._instances))
+
+    def latency(self) -> float:
+        if self.dist == "fixed":
+            return self.mean
+        if self.dist == "uniform":
+            return self.rng.uniform(max(0.0, self.mean - self.stddev), self.mean + self.stddev)
+        if self.dist == "normal":
+            return max(0.0, self.rng.gauss(self.mean, self.stddev))
+        if self.dist == "lognormal":
+            if self.mean <= 0:
+                return 0.0
+            # Parameters chosen so the samples have the configured mean and stddev
+            sigma2 = math.log(1 + (self.stddev / self.mean) ** 2)
+            return self.rng.lognormvariate(math.log(self.mean) - sigma2 / 2, math.sqrt(sigma2))
+        raise ValueError(f"Unknown fake latency distribution: {self.dist}")
+
+    def generate(self, prompt: str, timeout: float = MODEL_TIMEOUT) -> str:
+        delay = self.latency()
+        fail = self.rng.random() < self.failure_rate
+        if delay > timeout:
+            time.sleep(timeout)
+            raise requests.Timeout(f"Fake model exceeded {timeout}s")
+        time.sleep(delay)
+        if fail:
+            raise Exception("Fake model failure")
+        # Same prompt -> same output, whatever the RNG state
+        offset = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        words = [self._WORDS[(offset + i) % len(self._WORDS)] for i in range(self.output_words)]
+        return " ".join(words) + "."
+
+
+BACKENDS = {
+    "ollama": ModelSession,
+    "fake": FakeSession,
+}
+
+
+# === MODEL SESSION POOL ===
+class ModelPool:
+    """
+    Fixed-size pool of ModelSession objects reused across requests.
+    """
+
+    def __init__(self, size=POOL_SIZE, session_factory=None):
+        self.size = max(1, size)
+        self.session_factory = session_factory or BACKENDS[AI_BACKEND]
+        self._sessions = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self, warm_up=True):
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                session = self.session_factory()
+                if warm_up:
+                    try:
+                        session.warm_up()
+                    except Exception as e:
+                        print(f"[AI Warm-up] {e}")
+                self._sessions.put(session)
+            self._started = True
+
+    def stop(self):
+        with self._lock:
+            while not self._sessions.empty():
+                self._sessions.get_nowait().close()
+            self._started = False
+
+    @contextmanager
+    def session(self):
+        if not self._started:
+            self.start(warm_up=False)
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+
+pool = ModelPool()
+
+# Model calls block, so they run here instead of on the event loop.
+# The admission queue below decides which waiting caller runs next.
+executor = ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENCY), thread_name_prefix="model")
+
+
+def run_model(prompt: str) -> str:
+    with pool.session() as session:
+        start = time.perf_counter()
+        try:
+            return session.generate(prompt)
+        finally:
+            MODEL_LATENCY.observe(time.perf_counter() - start)
+
+
+# === METRICS ===
+class Metric:
+    """
+    Minimal Prometheus metric: a dict of label values -> number.
+    Updates are a dict write under a lock, so instrumenting the hot path is cheap.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        if not labels and self.kind in ("counter", "gauge"):
+            self._values[()] = 0  # export 0 before the first event
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _label_text(self, key, extra=()):
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{self._label_text(key)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, labels=()):
+        super().__init__(name, help_text, labels)
+        self.buckets = sorted(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # per-bucket counts (+Inf last), sum, count
+                counts = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts[0][bisect.bisect_left(self.buckets, value)] += 1
+            counts[1] += value
+            counts[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = [(key, (list(c[0]), c[1], c[2])) for key, c in self._values.items()]
+        for key, (bucket_counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + [float("inf")], bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{self._label_text(key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {total}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {count}")
+        return lines
+
+
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120]
+SIZE_BUCKETS = [50, 100, 250, 500, 750, 1000, 2000, 4000]
+
+HTTP_REQUESTS = Counter("ai_http_requests_total", "HTTP requests by path and status code.", ("path", "status"))
+HTTP_IN_FLIGHT = Gauge("ai_http_requests_in_flight", "HTTP requests being handled.", ("path",))
+PROMPTS = Counter("ai_prompts_total", "Prompts by priority class and outcome.", ("priority", "outcome"))
+MODEL_LATENCY = Histogram("ai_model_latency_seconds", "Time spent in the model per prompt.", LATENCY_BUCKETS)
+QUEUE_WAIT = Histogram("ai_queue_wait_seconds", "Time a prompt waited for an admission slot.",
+                       LATENCY_BUCKETS, ("priority",))
+PROMPT_CHARS = Histogram("ai_prompt_chars", "Prompt size in characters.", SIZE_BUCKETS)
+OUTPUT_CHARS = Histogram("ai_output_chars", "Model output size in characters.", SIZE_BUCKETS)
+TIMEOUTS = Counter("ai_timeouts_total", "Prompts that hit the model timeout.")
+ERRORS = Counter("ai_errors_total", "Failed prompts by exception type.", ("type",))
+QUEUE_DEPTH = Gauge("ai_queue_depth", "Prompts waiting for an admission slot.")
+ACTIVE_PROMPTS = Gauge("ai_active_prompts", "Prompts holding an admission slot.")
+
+METRICS = [HTTP_REQUESTS, HTTP_IN_FLIGHT, PROMPTS, MODEL_LATENCY, QUEUE_WAIT, PROMPT_CHARS,
+           OUTPUT_CHARS, TIMEOUTS, ERRORS, QUEUE_DEPTH, ACTIVE_PROMPTS]
+
+
+# === ADMISSION QUEUE ===
+class QueueFull(Exception):
+    pass
+
+
+class AdmissionQueue:
+    """
+    Bounded priority queue in front of the model.
+
+    At most `slots` prompts run at once. Others wait ordered by priority class
+    (interactive, then background, then bulk) and arrival, so a month-end bulk
+    run cannot push an interactive request to the back of the line.
+    More than `max_depth` waiting prompts are rejected (HTTP 429).
+    """
+
+    def __init__(self, slots=MAX_CONCURRENCY, max_depth=MAX_QUEUE_DEPTH):
+        self.slots = max(1, slots)
+        self.max_depth = max_depth
+        self.active = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        self.stats = {
+            name: {"admitted": 0, "rejected": 0, "queue_time_total": 0.0, "queue_time_max": 0.0}
+            for name in PRIORITIES
+        }
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def has_room(self, count=1) -> bool:
+        free_slots = max(0, self.slots - self.active) if not self._waiters else 0
+        return self.depth + max(0, count - free_slots) <= self.max_depth
+
+    async def acquire(self, priority: str) -> float:
+        start = time.monotonic()
+        if self.active < self.slots and not self._waiters:
+            self.active += 1
+        else:
+            if self.depth >= self.max_depth:
+                self.stats[priority]["rejected"] += 1
+                raise QueueFull()
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._seq), future))
+            try:
+                await future  # resolved by release(), which hands over its slot
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()  # slot was handed over just before the caller went away
+                raise
+
+        waited = time.monotonic() - start
+        stats = self.stats[priority]
+        stats["admitted"] += 1
+        stats["queue_time_total"] += waited
+        stats["queue_time_max"] = max(stats["queue_time_max"], waited)
+        return waited
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "slots": self.slots,
+            "active": self.active,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "classes": {
+                name: dict(
+                    stats,
+                    queue_time_avg=round(stats["queue_time_total"] / stats["admitted"], 4) if stats["admitted"] else 0.0,
+                )
+                for name, stats in self.stats.items()
+            },
+        }
+
+
+admission = AdmissionQueue()
+
+
+async def run_prompt(prompt: str, priority: str) -> str:
+    """Wait for an admission slot, then run the prompt on the model executor."""
+    PROMPT_CHARS.observe(len(prompt))
+    try:
+        waited = await admission.acquire(priority)
+    except QueueFull:
+        PROMPTS.inc(priority=priority, outcome="rejected")
+        raise
+    QUEUE_WAIT.observe(waited, priority=priority)
+    try:
+        output = await asyncio.get_running_loop().run_in_executor(executor, run_model, prompt)
+    except requests.Timeout:
+        TIMEOUTS.inc()
+        PROMPTS.inc(priority=priority, outcome="timeout")
+        raise
+    except Exception as e:
+        ERRORS.inc(type=type(e).__name__)
+        PROMPTS.inc(priority=priority, outcome="error")
+        raise
+    finally:
+        admission.release()
+    OUTPUT_CHARS.observe(len(output))
+    PROMPTS.inc(priority=priority, outcome="ok" if output else "empty")
+    return output
+
+
+def queue_full_error():
+    return HTTPException(
+        status_code=429,
+        detail="AI queue is full, try again later",
+        headers={"Retry-After": str(RETRY_AFTER)},
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Warm up every session at boot so the first prompt doesn't load the model
+    await asyncio.get_running_loop().run_in_executor(executor, pool.start)
+    yield
+    pool.stop()
+
 
 # === APP INIT ===
-app = FastAPI(title="GSO Private AI Service (Phi-3 via Ollama)")
+app = FastAPI(title="GSO Private AI Service (Phi-3 via Ollama)", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def count_requests(request: Request, call_next):
+    # Label by route so unknown URLs can't create unbounded label values
+    path = request.url.path if request.url.path in ROUTE_PATHS else "other"
+    HTTP_IN_FLIGHT.inc(path=path)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec(path=path)
+        HTTP_REQUESTS.inc(path=path, status=status)
+
 
 # === DATA SCHEMA ===
 class RequestData(BaseModel):
     prompt: str
     max_length: int = 150  # optional, not used by Ollama directly
+    priority: Literal["interactive", "background", "bulk"] = "interactive"
+
+
+class BatchRequestData(BaseModel):
+    prompts: List[str]
+    max_length: int = 150  # optional, not used by Ollama directly
+    priority: Literal["interactive", "background", "bulk"] = "bulk"
 
 # === API ROUTE ===
 @app.post("/v1/generate")
@@ -28,33 +491,98 @@ async def generate(data: RequestData, x_api_key: str = Header(None)):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     # --- Input validation ---
-    if len(data.prompt) > 1000:
+    if len(data.prompt) > MAX_PROMPT_CHARS:
         raise HTTPException(status_code=400, detail="Prompt too long")
 
     try:
-        # --- Call Ollama ---
-        result = subprocess.run(
-            [OLLAMA_PATH, "run", MODEL_NAME, data.prompt],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",  # ⚡ Windows encoding fix
-            timeout=120
-        )
-
-        # --- Handle subprocess errors ---
-        if result.returncode != 0:
-            err_msg = result.stderr.strip() or "Unknown subprocess error"
-            raise Exception(err_msg)
-
-        output = result.stdout.strip()
-        if not output:
-            output = "[AI Error] Model returned empty output."
-
-        return {"result": output}
+        # --- Wait for admission, then call Ollama through a pooled session, off the event loop ---
+        output = await run_prompt(data.prompt, data.priority)
 
-    except subprocess.TimeoutExpired:
+    except QueueFull:
+        raise queue_full_error()
+    except requests.Timeout:
         raise HTTPException(status_code=504, detail="Model request timed out")
     except Exception as e:
         # Log full exception for debugging
         print(f"[AI Error] {e}")
         raise HTTPException(status_code=500, detail=f"Model error: {str(e)}")
+
+    if not output:
+        raise HTTPException(status_code=502, detail="Model returned empty output.")
+
+    return {"result": output}
+
+
+@app.post("/v1/generate_batch")
+async def generate_batch(data: BatchRequestData, x_api_key: str = Header(None)):
+    """
+    Run a list of prompts as one unit and return the results in the same order.
+    A failed prompt does not fail the batch; its slot in `errors` says why.
+    """
+    # --- Authorization ---
+    if x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    # --- Input validation ---
+    if len(data.prompts) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large (max {MAX_BATCH_SIZE} prompts)")
+    for index, prompt in enumerate(data.prompts):
+        if len(prompt) > MAX_PROMPT_CHARS:
+            raise HTTPException(status_code=400, detail=f"Prompt {index} too long")
+
+    # --- Admit the whole batch or none of it ---
+    if not admission.has_room(len(data.prompts)):
+        admission.stats[data.priority]["rejected"] += len(data.prompts)
+        raise queue_full_error()
+
+    # --- Schedule every prompt at once; the admission queue bounds how many run together ---
+    outcomes = await asyncio.gather(
+        *[run_prompt(prompt, data.priority) for prompt in data.prompts],
+        return_exceptions=True,
+    )
+
+    results, errors = [], []
+    for outcome in outcomes:
+        if isinstance(outcome, QueueFull):
+            results.append("")
+            errors.append("AI queue is full")
+        elif isinstance(outcome, requests.Timeout):
+            results.append("")
+            errors.append("Model request timed out")
+        elif isinstance(outcome, Exception):
+            print(f"[AI Error] {outcome}")
+            results.append("")
+            errors.append(f"Model error: {outcome}")
+        elif not outcome:
+            results.append("")
+            errors.append("Model returned empty output.")
+        else:
+            results.append(outcome)
+            errors.append(None)
+
+    return {"results": results, "errors": errors}
+
+
+@app.get("/v1/stats")
+async def stats(x_api_key: str = Header(None)):
+    """Admission queue depth, active prompts and queue-time metrics per priority class."""
+    if x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return admission.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus text exposition of the counters above.
+    Open like a health check: it only exposes counts and timings, no prompts.
+    """
+    QUEUE_DEPTH.set(admission.depth)
+    ACTIVE_PROMPTS.set(admission.active)
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
+ROUTE_PATHS = {route.path for route in app.routes}
@@ -0,0 +1,147 @@
+# apps/ai_service/jobs.py
+import os
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.gso_reports.models import WorkAccomplishmentReport
+from .models import WARDescriptionJob
+from .utils import generate_war_description, AI_BREAKER_COOLDOWN
+from .exceptions import AICircuitOpen
+
+# -------------------------------
+# Job Queue Config
+# -------------------------------
+JOB_BACKOFF_BASE = int(os.getenv("AI_JOB_BACKOFF_BASE", "30"))  # seconds before the first retry
+JOB_BACKOFF_MAX = int(os.getenv("AI_JOB_BACKOFF_MAX", "3600"))  # cap between retries
+JOB_LOCK_TIMEOUT = int(os.getenv("AI_JOB_LOCK_TIMEOUT", "600"))  # running jobs older than this were abandoned
+
+UNFINISHED = ["pending", "running"]
+
+
+# -------------------------------
+# Enqueue
+# -------------------------------
+def enqueue_war_description(war: WorkAccomplishmentReport) -> WARDescriptionJob:
+    """
+    Queue description generation for one WAR.
+    Reuses the WAR's unfinished job instead of creating a duplicate.
+    """
+    job = WARDescriptionJob.objects.filter(war=war, status__in=UNFINISHED).first()
+    if job:
+        return job
+    return WARDescriptionJob.objects.create(war=war)
+
+
+def enqueue_war_descriptions(war_ids: Iterable[int]) -> int:
+    """
+    Queue description generation for many WARs with one insert.
+    WARs that already have an unfinished job are skipped. Returns the number queued.
+    """
+    war_ids = set(war_ids)
+    if not war_ids:
+        return 0
+    already_queued = set(
+        WARDescriptionJob.objects.filter(war_id__in=war_ids, status__in=UNFINISHED)
+        .values_list("war_id", flat=True)
+    )
+    jobs = [WARDescriptionJob(war_id=war_id) for war_id in war_ids - already_queued]
+    WARDescriptionJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def enqueue_blank_war_descriptions() -> int:
+    """
+    Backfill: queue every WAR that still has a blank description.
+    Only WARs linked to a ServiceRequest can be described (migrated WARs have no inputs).
+    """
+    war_ids = WorkAccomplishmentReport.objects.filter(
+        Q(description="") | Q(description__isnull=True),
+        request__isnull=False,
+    ).values_list("id", flat=True)
+    return enqueue_war_descriptions(war_ids)
+
+
+# -------------------------------
+# Worker Helpers
+# -------------------------------
+def claim_jobs(limit: int) -> List[WARDescriptionJob]:
+    """
+    Lock up to `limit` due jobs and mark them running, emergency requests first.
+    Jobs left running by a dead worker are reclaimed after JOB_LOCK_TIMEOUT.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            WARDescriptionJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(status="pending", run_after__lte=now)
+                | Q(status="running", locked_at__lt=now - timedelta(seconds=JOB_LOCK_TIMEOUT))
+            )
+            .order_by("-war__request__is_emergency", "run_after", "id")[:limit]
+        )
+        for job in jobs:
+            job.status = "running"
+            job.locked_at = now
+            job.attempts += 1
+            job.save(update_fields=["status", "locked_at", "attempts", "updated_at"])
+    return jobs
+
+
+def retry_delay(attempts: int) -> int:
+    """Exponential backoff: base, 2x base, 4x base, ... capped at JOB_BACKOFF_MAX."""
+    return min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * 2 ** max(0, attempts - 1))
+
+
+def run_job(job: WARDescriptionJob) -> bool:
+    """
+    Generate and save the WAR description for a claimed job.
+    Returns True when the job is finished, False when it was rescheduled or failed.
+    """
+    war = WorkAccomplishmentReport.objects.select_related("request", "request__unit", "request__department") \
+        .filter(id=job.war_id).first()
+
+    try:
+        if war is None or war.request is None:
+            raise ValueError("WAR has no linked service request to describe.")
+
+        if (war.description or "").strip():
+            # Filled in by hand (or another job) while this one waited
+            return _finish(job)
+
+        description = generate_war_description(war.request)
+        war.description = description
+        war.save(update_fields=["description"])
+        return _finish(job)
+
+    except AICircuitOpen as e:
+        # The AI server is known to be down; wait out the cool-down without using up an attempt
+        job.attempts -= 1
+        job.status = "pending"
+        job.run_after = timezone.now() + timedelta(seconds=AI_BREAKER_COOLDOWN)
+        job.last_error = str(e)
+        job.locked_at = None
+        job.save(update_fields=["status", "attempts", "run_after", "locked_at", "last_error", "updated_at"])
+        return False
+
+    except Exception as e:
+        job.last_error = str(e)
+        job.locked_at = None
+        if job.attempts < job.max_attempts and war is not None and war.request is not None:
+            job.status = "pending"
+            job.run_after = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+        else:
+            job.status = "failed"
+        job.save(update_fields=["status", "run_after", "locked_at", "last_error", "updated_at"])
+        return False
+
+
+def _finish(job: WARDescriptionJob) -> bool:
+    job.status = "done"
+    job.locked_at = None
+    job.last_error = ""
+    job.save(update_fields=["status", "locked_at", "last_error", "updated_at"])
+    return True
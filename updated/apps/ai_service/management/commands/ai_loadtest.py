@@ -0,0 +1,81 @@
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+from apps.ai_service.utils import AI_API_URL, AI_API_KEY
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.4999)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive /v1/generate with concurrent requests and report throughput and p50/p95/p99 latency. "
+        "Start the server with AI_BACKEND=fake to benchmark without Ollama."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=AI_API_URL, help="Generate endpoint to call.")
+        parser.add_argument("--requests", type=int, default=100, help="Total requests to send.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+        parser.add_argument("--priority", default="interactive", choices=["interactive", "background", "bulk"])
+        parser.add_argument("--prompt-chars", type=int, default=400, help="Length of each generated prompt.")
+        parser.add_argument("--timeout", type=float, default=180.0, help="Per-request timeout in seconds.")
+
+    def handle(self, *args, **options):
+        total = max(1, options["requests"])
+        concurrency = max(1, options["concurrency"])
+        local = threading.local()
+
+        def send(index):
+            # One keep-alive session per worker thread
+            if not hasattr(local, "http"):
+                local.http = requests.Session()
+            prompt = f"Load test prompt {index}: " + "x" * options["prompt_chars"]
+            start = time.perf_counter()
+            try:
+                response = local.http.post(
+                    options["url"],
+                    json={"prompt": prompt[:options["prompt_chars"]], "priority": options["priority"]},
+                    headers={"x-api-key": AI_API_KEY},
+                    timeout=options["timeout"],
+                )
+                outcome = str(response.status_code)
+            except requests.Timeout:
+                outcome = "timeout"
+            except requests.RequestException:
+                outcome = "connection error"
+            return outcome, time.perf_counter() - start
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Sending {total} request(s) to {options['url']} (concurrency={concurrency})"
+        ))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(send, range(total)))
+        elapsed = time.perf_counter() - started
+
+        statuses = Counter(outcome for outcome, _ in outcomes)
+        latencies = sorted(latency for outcome, latency in outcomes if outcome == "200")
+
+        self.stdout.write(f"Elapsed:    {elapsed:.2f}s")
+        self.stdout.write(f"Throughput: {len(latencies) / elapsed:.2f} ok req/s ({total / elapsed:.2f} req/s sent)")
+        self.stdout.write("Outcomes:   " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items())))
+        if latencies:
+            self.stdout.write(
+                "Latency:    "
+                f"p50={percentile(latencies, 50):.3f}s  "
+                f"p95={percentile(latencies, 95):.3f}s  "
+                f"p99={percentile(latencies, 99):.3f}s  "
+                f"max={latencies[-1]:.3f}s"
+            )
+        self.stdout.write(self.style.SUCCESS("Load test finished."))
@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.ai_service.jobs import claim_jobs, run_job, enqueue_blank_war_descriptions
+
+
+def _run_in_thread(job):
+    # Each worker thread gets its own DB connection; close it when done
+    try:
+        return run_job(job)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued WAR description jobs (AI generation with retry and backoff). "
+        "Must run continuously alongside the web server (GSO_System.bat starts it); "
+        "without it WAR descriptions stay pending."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2,
+                            help="Maximum number of jobs generating at the same time.")
+        parser.add_argument("--poll-interval", type=float, default=5.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no due jobs are left instead of polling forever.")
+        parser.add_argument("--backfill", action="store_true",
+                            help="First queue every WAR whose description is still blank.")
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+
+        if options["backfill"]:
+            queued = enqueue_blank_war_descriptions()
+            self.stdout.write(self.style.SUCCESS(f"Backfill queued {queued} WAR(s) with blank descriptions."))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Processing WAR description jobs (concurrency={concurrency})"))
+        done = failed = 0
+
+        in_flight = {}  # future -> job
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                # Refill free slots as soon as any job finishes, so one slow generation
+                # doesn't hold back the others (or emergency jobs queued meanwhile)
+                free = concurrency - len(in_flight)
+                if free:
+                    for job in claim_jobs(limit=free):
+                        in_flight[executor.submit(_run_in_thread, job)] = job
+                if not in_flight:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                finished_futures, _ = wait(in_flight, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                for future in finished_futures:
+                    job = in_flight.pop(future)
+                    if future.result():
+                        done += 1
+                        self.stdout.write(f"WAR #{job.war_id}: description generated.")
+                    else:
+                        failed += 1
+                        job.refresh_from_db()
+                        self.stderr.write(self.style.WARNING(
+                            f"WAR #{job.war_id}: attempt {job.attempts} failed ({job.status}): {job.last_error}"
+                        ))
+
+        self.stdout.write(self.style.SUCCESS(f"Finished: {done} done, {failed} failed or rescheduled."))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from apps.ai_service.models import AIReportSummary
+from apps.ai_service.utils import summarize_war, war_input_fingerprint
+from apps.ai_service.exceptions import AIServiceError
+from apps.gso_reports.models import WorkAccomplishmentReport
+
+
+class Command(BaseCommand):
+    help = "Regenerate AI summaries only for WARs whose inputs changed since their last summary."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--include-missing", action="store_true",
+                            help="Also summarize WARs that have no AI summary yet.")
+        parser.add_argument("--limit", type=int, default=0,
+                            help="Stop after regenerating this many summaries (0 = no limit).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only list the stale WARs.")
+
+    def handle(self, *args, **options):
+        wars = (
+            WorkAccomplishmentReport.objects.filter(request__isnull=False)
+            .select_related("request", "request__unit", "request__department")
+            .prefetch_related(
+                "request__reports",
+                Prefetch("ai_summaries", queryset=AIReportSummary.objects.order_by("-created_at", "-id")),
+            )
+            .order_by("id")
+        )
+        if not options["include_missing"]:
+            wars = wars.filter(ai_summaries__isnull=False).distinct()
+
+        checked = stale = regenerated = failed = 0
+        for war in wars.iterator(chunk_size=200):
+            checked += 1
+            summaries = list(war.ai_summaries.all())
+            if summaries and summaries[0].input_fingerprint == war_input_fingerprint(war.request):
+                continue
+
+            stale += 1
+            if options["dry_run"]:
+                self.stdout.write(f"WAR #{war.id}: stale")
+                continue
+
+            try:
+                summarize_war(war, force=True, priority="bulk")
+                regenerated += 1
+                self.stdout.write(f"WAR #{war.id}: summary regenerated.")
+            except AIServiceError as e:
+                failed += 1
+                self.stderr.write(self.style.WARNING(f"WAR #{war.id}: {e}"))
+
+            if options["limit"] and regenerated >= options["limit"]:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} WAR(s): {stale} stale, {regenerated} regenerated, {failed} failed."
+        ))
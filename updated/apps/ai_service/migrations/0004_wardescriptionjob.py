@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_service', '0003_airesultcache'),
+        ('gso_reports', '0005_remove_successindicator_activity_name_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WARDescriptionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('run_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('war', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='description_jobs', to='gso_reports.workaccomplishmentreport')),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_service', '0004_wardescriptionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aireportsummary',
+            name='input_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='aireportsummary',
+            name='prompt_version',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.gso_reports.models import WorkAccomplishmentReport
 
 
@@ -21,7 +22,65 @@ class AIReportSummary(models.Model):
         null=True,
         blank=True
     )
+    # sha256 of the inputs the summary was generated from (see war_input_fingerprint)
+    input_fingerprint = models.CharField(max_length=64, blank=True, db_index=True)
+    prompt_version = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"AI Summary for WAR #{self.report.id} (by {self.generated_by or 'System'})"
+
+
+class AIResultCache(models.Model):
+    """
+    Content-addressed cache of model outputs.
+    `key` is a sha256 of (model name, prompt template version, prompt),
+    so an identical prompt is answered from here instead of the model.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=100)
+    prompt_version = models.CharField(max_length=20)
+    prompt = models.TextField()
+    result = models.TextField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"AI cache {self.key[:12]} ({self.model_name}, v{self.prompt_version}, {self.hit_count} hits)"
+
+
+class WARDescriptionJob(models.Model):
+    """
+    Durable queue entry for generating a WAR description with the local AI.
+    Picked up by `manage.py process_war_jobs`; failed attempts are retried
+    with exponential backoff until `max_attempts` is reached.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    war = models.ForeignKey(
+        WorkAccomplishmentReport,
+        on_delete=models.CASCADE,
+        related_name="description_jobs"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending", db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now, db_index=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+
+    def __str__(self):
+        return f"WAR description job #{self.id} for WAR #{self.war_id} ({self.status})"
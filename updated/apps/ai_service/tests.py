@@ -1,3 +1,318 @@
-from django.test import TestCase
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from fastapi import HTTPException
+
+from apps.ai_service import inference_server as server
+from apps.ai_service import cache, utils
+from apps.ai_service.management.commands import process_war_jobs
+from apps.ai_service.models import AIResultCache
+
+
+class SlowFakeSession:
+    """Stands in for an Ollama session; every prompt takes `delay` seconds."""
+
+    delay = 0.3
+
+    def generate(self, prompt, timeout=None):
+        time.sleep(self.delay)
+        return f"done: {prompt}"
+
+    def warm_up(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class GenerateConcurrencyTests(SimpleTestCase):
+    concurrency = 4
+
+    def setUp(self):
+        pool = server.ModelPool(size=self.concurrency, session_factory=SlowFakeSession)
+        pool.start(warm_up=False)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self.addCleanup(executor.shutdown)
+        admission = server.AdmissionQueue(slots=self.concurrency)
+        patcher = mock.patch.multiple(server, pool=pool, executor=executor, admission=admission)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fire(self, count):
+        async def run():
+            calls = [
+                server.generate(server.RequestData(prompt=f"prompt {i}"), x_api_key=server.API_KEY)
+                for i in range(count)
+            ]
+            return await asyncio.gather(*calls)
+
+        start = time.perf_counter()
+        results = asyncio.run(run())
+        return results, time.perf_counter() - start
+
+    def test_concurrent_requests_run_in_parallel(self):
+        results, elapsed = self._fire(self.concurrency)
+
+        self.assertEqual([r["result"] for r in results], [f"done: prompt {i}" for i in range(self.concurrency)])
+        # Serial execution would take concurrency * delay
+        self.assertLess(elapsed, 2 * SlowFakeSession.delay)
+
+    def test_requests_beyond_limit_wait_for_a_free_worker(self):
+        results, elapsed = self._fire(self.concurrency * 2)
+
+        self.assertEqual(len(results), self.concurrency * 2)
+        self.assertGreaterEqual(elapsed, 2 * SlowFakeSession.delay)
+        self.assertLess(elapsed, 3 * SlowFakeSession.delay)
+
+    def test_batch_returns_results_in_order(self):
+        prompts = [f"prompt {i}" for i in range(self.concurrency * 2)]
+
+        start = time.perf_counter()
+        response = asyncio.run(
+            server.generate_batch(server.BatchRequestData(prompts=prompts), x_api_key=server.API_KEY)
+        )
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response["results"], [f"done: {p}" for p in prompts])
+        self.assertEqual(response["errors"], [None] * len(prompts))
+        self.assertLess(elapsed, 3 * SlowFakeSession.delay)
+
+
+class AdmissionQueueTests(SimpleTestCase):
+
+    def setUp(self):
+        pool = server.ModelPool(size=1, session_factory=SlowFakeSession)
+        pool.start(warm_up=False)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.admission = server.AdmissionQueue(slots=1, max_depth=2)
+        patcher = mock.patch.multiple(server, pool=pool, executor=executor, admission=self.admission)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, prompt, priority):
+        return server.generate(server.RequestData(prompt=prompt, priority=priority), x_api_key=server.API_KEY)
+
+    def test_interactive_requests_jump_ahead_of_bulk(self):
+        finished = []
+
+        async def call(prompt, priority, delay=0):
+            await asyncio.sleep(delay)
+            await self._request(prompt, priority)
+            finished.append(prompt)
+
+        async def run():
+            await asyncio.gather(
+                call("bulk 1", "bulk"),
+                call("bulk 2", "bulk", delay=0.05),
+                call("interactive", "interactive", delay=0.1),
+            )
+
+        asyncio.run(run())
+
+        self.assertEqual(finished, ["bulk 1", "interactive", "bulk 2"])
+        self.assertEqual(self.admission.stats["interactive"]["admitted"], 1)
+        self.assertGreater(self.admission.stats["bulk"]["queue_time_max"], 0)
+
+    def test_full_queue_answers_429(self):
+        async def run():
+            return await asyncio.gather(
+                *[self._request(f"prompt {i}", "bulk") for i in range(4)],
+                return_exceptions=True,
+            )
+
+        outcomes = asyncio.run(run())
+
+        rejected = [o for o in outcomes if isinstance(o, HTTPException)]
+        self.assertEqual([o.status_code for o in rejected], [429])
+        self.assertEqual(self.admission.stats["bulk"]["rejected"], 1)
+
+
+class FakeBackendTests(SimpleTestCase):
+    def test_output_depends_only_on_prompt(self):
+        first = server.FakeSession(dist="fixed", mean=0, output_words=5, seed=1)
+        second = server.FakeSession(dist="fixed", mean=0, output_words=5, seed=2)
+
+        self.assertEqual(first.generate("same prompt"), second.generate("same prompt"))
+        self.assertEqual(len(first.generate("other prompt").split()), 5)
+
+    def test_backend_without_generate_fails_at_construction(self):
+        class Incomplete(server.ModelBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_failure_rate_and_latency_are_applied(self):
+        session = server.FakeSession(dist="uniform", mean=0.01, stddev=0.005, failure_rate=1.0)
+
+        start = time.perf_counter()
+        with self.assertRaises(Exception):
+            session.generate("prompt")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.005)
+
+    def test_slow_sample_times_out(self):
+        session = server.FakeSession(dist="fixed", mean=0.05)
+
+        with self.assertRaises(server.requests.Timeout):
+            session.generate("prompt", timeout=0.01)
+
+
+class MapReduceSummaryTests(SimpleTestCase):
+    descriptions = [f"Repaired the electrical wiring of building {i} and replaced its fixtures." for i in range(60)]
+
+    def test_chunks_fit_the_prompt_budget(self):
+        chunks = utils.chunk_for_prompt("CF1", self.descriptions, utils.build_ipmt_prompt, budget=1000)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(len(c) for c in chunks), len(self.descriptions))
+        for chunk in chunks:
+            self.assertLessEqual(len(utils.build_ipmt_prompt("CF1", chunk)), 1000)
+
+    def test_many_wars_are_reduced_to_one_remark(self):
+        sent = []
+
+        def fake_batch(prompts, bypass_cache, priority):
+            sent.append(prompts)
+            return [f"partial {i}" for i in range(len(prompts))]
+
+        with mock.patch.object(utils, "query_local_ai_batch", side_effect=fake_batch):
+            results = utils.summarize_indicator_groups({"CF1": ("CF1", self.descriptions)})
+
+        self.assertEqual(list(results), ["CF1"])
+        self.assertEqual(len(sent[-1]), 1)  # the last level merges everything into one prompt
+        self.assertTrue(all(len(p) <= utils.AI_MAX_PROMPT_CHARS for level in sent for p in level))
+
+    def test_long_label_with_tiny_budget_still_converges(self):
+        indicator = "Core Function " * 20
+        # Just enough for either template plus two shortened texts; the label has to be cut
+        budget = max(len(utils.build_ipmt_prompt("", [])), len(utils.build_ipmt_reduce_prompt("", []))) + 60
+        sent = []
+
+        def fake_batch(prompts, bypass_cache, priority):
+            sent.append(prompts)
+            self.assertLess(len(sent), 20, "reduce levels are not shrinking")
+            return [f"partial {i}" for i in range(len(prompts))]
+
+        with mock.patch.object(utils, "AI_MAX_PROMPT_CHARS", budget), \
+                mock.patch.object(utils, "query_local_ai_batch", side_effect=fake_batch):
+            results = utils.summarize_indicator_groups({"CF1": (indicator, self.descriptions)})
+
+        self.assertEqual(list(results), ["CF1"])
+        self.assertEqual(len(sent[-1]), 1)
+        self.assertTrue(all(len(p) <= budget for level in sent for p in level))
+
+    def test_budget_smaller_than_the_template_is_rejected(self):
+        with self.assertRaises(ValueError):
+            utils.fit_indicator_label("CF1", utils.build_ipmt_prompt, budget=50)
+
+
+class AIClientResponseTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(utils, "breaker", utils.CircuitBreaker(threshold=1, cooldown=60))
+        self.breaker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def response(self, status, body):
+        response = utils.requests.Response()
+        response.status_code = status
+        response._content = body.encode()
+        return response
+
+    def test_non_json_success_is_a_bad_response(self):
+        with mock.patch.object(utils.http_session, "post", return_value=self.response(200, "<html>proxy</html>")):
+            with self.assertRaises(utils.AIBadResponse):
+                utils._post_to_ai(utils.AI_API_URL, {"prompt": "x"})
+        self.assertEqual(self.breaker.state, "open")
+
+    def test_non_json_error_body_keeps_the_status(self):
+        with mock.patch.object(utils.http_session, "post", return_value=self.response(400, "[1, 2]")):
+            with self.assertRaisesMessage(utils.AIBadResponse, "AI service error 400: [1, 2]"):
+                utils._post_to_ai(utils.AI_API_URL, {"prompt": "x"})
+
+
+class WARJobWorkerTests(SimpleTestCase):
+    def test_free_slot_is_refilled_while_a_slow_job_runs(self):
+        queue = [SimpleNamespace(war_id=i, delay=0.5 if i == 0 else 0.02) for i in range(5)]
+        lock, events = threading.Lock(), []
+
+        def claim(limit):
+            with lock:
+                claimed, queue[:] = queue[:limit], queue[limit:]
+            return claimed
+
+        def run(job):
+            time.sleep(job.delay)
+            with lock:
+                events.append(job.war_id)
+            return True
+
+        with mock.patch.object(process_war_jobs, "claim_jobs", side_effect=claim), \
+                mock.patch.object(process_war_jobs, "run_job", side_effect=run):
+            call_command("process_war_jobs", "--once", "--concurrency=2", "--poll-interval=0.01", stdout=io.StringIO())
+
+        # The fast jobs all finish in the second slot before the slow one does
+        self.assertEqual(events, [1, 2, 3, 4, 0])
+
+
+class AIResultCacheTests(TestCase):
+    def age(self, prompt, seconds):
+        AIResultCache.objects.filter(key=cache.cache_key(prompt)).update(
+            created_at=timezone.now() - timedelta(seconds=seconds),
+            last_used_at=timezone.now() - timedelta(seconds=seconds),
+        )
+
+    def test_expired_entry_is_a_miss_and_is_evicted(self):
+        cache.store_result("old prompt", "old answer")
+        cache.store_result("new prompt", "new answer")
+        self.age("old prompt", cache.AI_CACHE_TTL + 60)
+
+        self.assertIsNone(cache.get_cached_result("old prompt"))
+        self.assertEqual(cache.get_cached_result("new prompt"), "new answer")
+        self.assertEqual(cache.evict(), 1)
+        self.assertFalse(AIResultCache.objects.filter(key=cache.cache_key("old prompt")).exists())
+
+    def test_least_recently_used_entries_are_trimmed(self):
+        for i in range(5):
+            cache.store_result(f"prompt {i}", f"answer {i}")
+            self.age(f"prompt {i}", 100 - i)  # prompt 0 is the least recently used
+        cache.get_cached_result("prompt 0")  # ...until it is read again
+
+        with mock.patch.object(cache, "AI_CACHE_MAX_ENTRIES", 3):
+            self.assertEqual(cache.evict(), 2)
+
+        kept = {cache.get_cached_result(f"prompt {i}") for i in range(5)} - {None}
+        self.assertEqual(kept, {"answer 0", "answer 3", "answer 4"})
+
+    def test_eviction_runs_every_n_stores(self):
+        with mock.patch.object(cache, "AI_CACHE_EVICT_EVERY", 3), \
+                mock.patch.object(cache, "evict") as evict, \
+                mock.patch.dict(cache._stats, {"stores": 0}):
+            for i in range(7):
+                cache.store_result(f"prompt {i}", "answer")
+
+        self.assertEqual(evict.call_count, 2)
+
+    def test_bypass_cache_generates_and_replaces_the_entry(self):
+        cache.store_result("prompt", "cached answer")
+        response = utils.requests.Response()
+        response.status_code = 200
+        response._content = b'{"result": "fresh answer"}'
+
+        with mock.patch.object(utils, "breaker", utils.CircuitBreaker(threshold=1, cooldown=60)), \
+                mock.patch.object(utils.http_session, "post", return_value=response) as post:
+            self.assertEqual(utils.query_local_ai("prompt"), "cached answer")
+            post.assert_not_called()
+            self.assertEqual(utils.query_local_ai("prompt", bypass_cache=True), "fresh answer")
+
+        post.assert_called_once()
+        self.assertEqual(cache.get_cached_result("prompt"), "fresh answer")
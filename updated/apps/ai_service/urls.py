@@ -15,4 +15,5 @@ urlpatterns = [
     path("ipmt/generate/<str:unit_name>/<str:month_filter>/", views.generate_ipmt_ai_summary, name="generate_ipmt_ai_summary"),
 
     path("regenerate_ipmt_summary/", views.regenerate_ipmt_summary, name="regenerate_ipmt_summary"),
+    path("cache/stats/", views.ai_cache_stats, name="ai_cache_stats"),
 ]
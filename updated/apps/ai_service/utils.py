@@ -1,10 +1,19 @@
 # apps/ai_service/utils.py
 import os
+import json
+import time
+import hashlib
+import threading
 import requests
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Hashable, Optional, Tuple
 from django.contrib.auth import get_user_model
-from apps.gso_requests.models import ServiceRequest, TaskReport  # ✅ Import models for richer prompts
+from apps.gso_requests.models import ServiceRequest  # ✅ Import models for richer prompts
 from apps.gso_reports.models import WorkAccomplishmentReport
+from .models import AIReportSummary
+from .cache import get_cached_result, store_result, PROMPT_TEMPLATE_VERSION
+from .exceptions import AIServiceError, AIServiceUnavailable, AIServiceBusy, AICircuitOpen, AITimeout, AIBadResponse
 
 User = get_user_model()
 
@@ -12,32 +21,264 @@ User = get_user_model()
 # Local AI Model Config
 # -------------------------------
 AI_API_URL = os.getenv("AI_API_URL", "http://127.0.0.1:8001/v1/generate")
+AI_BATCH_API_URL = os.getenv("AI_BATCH_API_URL", AI_API_URL.rsplit("/", 1)[0] + "/generate_batch")
 AI_API_KEY = os.getenv("AI_API_KEY", "mysecretkey")
+AI_MAX_BATCH_SIZE = int(os.getenv("AI_MAX_BATCH_SIZE", "50"))  # must match the inference server
+
+AI_DEADLINE = float(os.getenv("AI_DEADLINE", "30"))  # seconds per call, retries included
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))  # extra attempts per call
+AI_RETRY_BACKOFF = float(os.getenv("AI_RETRY_BACKOFF", "0.5"))  # seconds, doubled per retry
+AI_BREAKER_THRESHOLD = int(os.getenv("AI_BREAKER_THRESHOLD", "5"))  # consecutive failures to open
+AI_BREAKER_COOLDOWN = float(os.getenv("AI_BREAKER_COOLDOWN", "30"))  # seconds to fail fast
+AI_HTTP_POOL_SIZE = int(os.getenv("AI_HTTP_POOL_SIZE", "10"))  # keep-alive connections
+AI_MAX_PROMPT_CHARS = int(os.getenv("AI_MAX_PROMPT_CHARS", "1000"))  # server rejects longer prompts
+AI_FANOUT_CONCURRENCY = int(os.getenv("AI_FANOUT_CONCURRENCY", "4"))  # parallel prompts per fan-out
+# How IPMT summaries reach the server: "batch" (one /v1/generate_batch call per level)
+# or "concurrent" (single /v1/generate calls, AI_FANOUT_CONCURRENCY at a time)
+AI_IPMT_SUMMARY_MODE = os.getenv("AI_IPMT_SUMMARY_MODE", "batch")
+
+
+# -------------------------------
+# HTTP Session & Circuit Breaker
+# -------------------------------
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for `cooldown`
+    seconds. After the cool-down one trial call is let through (half-open);
+    its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold=AI_BREAKER_THRESHOLD, cooldown=AI_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self.trial_running):
+                remaining = self.cooldown - (time.monotonic() - self.opened_at)
+                raise AICircuitOpen(f"AI service unavailable; retrying in {max(0, int(remaining))}s.")
+            if state == "half-open":
+                self.trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=AI_HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "x-api-key": AI_API_KEY,
+    })
+    return session
+
+
+http_session = _build_session()
+breaker = CircuitBreaker()
+
+
+def _post_to_ai(url: str, payload: dict, deadline: float = AI_DEADLINE) -> dict:
+    """
+    POST to the inference server through the shared session.
+
+    Connection errors, timeouts, 5xx and 429 (queue full) answers are retried
+    with backoff while the retry budget and the deadline allow; other 4xx
+    answers are not retried.
+    Raises an AIServiceError subclass instead of returning error text.
+    """
+    breaker.before_call()
+    give_up_at = time.monotonic() + deadline
+    last_error: AIServiceError = AITimeout("AI request deadline exceeded.")
+
+    for attempt in range(AI_MAX_RETRIES + 1):
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            response = http_session.post(url, json=payload, timeout=remaining)
+        except requests.Timeout:
+            last_error = AITimeout(f"AI request timed out after {deadline:.0f}s.")
+        except requests.RequestException as e:
+            last_error = AIServiceUnavailable(f"AI service unreachable: {e}")
+        else:
+            if response.status_code < 400:
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = None
+                if not isinstance(data, dict):
+                    # A 2xx with an unreadable body is a server fault, not a good answer
+                    breaker.record_failure()
+                    raise AIBadResponse(f"AI service returned a non-JSON response: {response.text[:200]}")
+                breaker.record_success()
+                return data
+            detail = _error_detail(response)
+            if response.status_code == 429:
+                last_error = AIServiceBusy(detail)
+            elif response.status_code == 504:
+                last_error = AITimeout(detail)
+            elif response.status_code >= 500:
+                last_error = AIServiceUnavailable(detail)
+            else:
+                # The server is healthy; the request itself was bad
+                breaker.record_success()
+                raise AIBadResponse(detail)
+
+        backoff = AI_RETRY_BACKOFF * 2 ** attempt
+        if attempt < AI_MAX_RETRIES and time.monotonic() + backoff < give_up_at:
+            time.sleep(backoff)
+        else:
+            break
+
+    if isinstance(last_error, AIServiceBusy):
+        # Back-pressure from a healthy server; don't count it against the breaker
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    raise last_error
+
+
+def _error_detail(response) -> str:
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        return f"AI service error {response.status_code}: {data.get('detail', '')}"
+    return f"AI service error {response.status_code}: {response.text[:200]}"
+
 
 # -------------------------------
 # Query Local Private Model
 # -------------------------------
-def query_local_ai(prompt: str) -> str:
+def query_local_ai(prompt: str, bypass_cache: bool = False, priority: str = "interactive") -> str:
     """
     Send a prompt to the local private AI server (Flan-T5 model)
     and return the generated text.
+
+    Identical prompts are answered from the AI result cache;
+    pass bypass_cache=True to force a fresh generation (e.g. "Regenerate").
+    The fresh result still replaces the cached one.
+    `priority` is the server admission class: interactive, background or bulk.
+
+    Raises AIServiceError (see exceptions.py) when no text could be generated.
     """
-    try:
-        response = requests.post(
-            AI_API_URL,
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": AI_API_KEY,
-            },
-            json={"prompt": prompt},
-            timeout=120,
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data.get("result", "").strip()
-    except Exception as e:
-        return f"[AI Error] {e}"
-    
+    if not bypass_cache:
+        cached = get_cached_result(prompt)
+        if cached is not None:
+            return cached
+
+    data = _post_to_ai(AI_API_URL, {"prompt": prompt, "priority": priority})
+    result = (data.get("result") or "").strip()
+    if not result:
+        raise AIBadResponse("Model returned empty output.")
+
+    store_result(prompt, result)
+    return result
+
+
+def query_local_ai_batch(
+    prompts: List[str], bypass_cache: bool = False, priority: str = "bulk"
+) -> List[Optional[str]]:
+    """
+    Send several prompts to the local AI server in one round trip.
+    Returns the generated texts in the same order as `prompts`;
+    a prompt the model failed on comes back as None.
+    Cached prompts are answered locally and only the misses are sent.
+
+    Raises AIServiceError when the server itself cannot be used.
+    """
+    results: List[Optional[str]] = [None] * len(prompts)
+    missing: List[int] = []
+    for index, prompt in enumerate(prompts):
+        cached = None if bypass_cache else get_cached_result(prompt)
+        if cached is None:
+            missing.append(index)
+        else:
+            results[index] = cached
+
+    for start in range(0, len(missing), AI_MAX_BATCH_SIZE):
+        indexes = missing[start:start + AI_MAX_BATCH_SIZE]
+        data = _post_to_ai(AI_BATCH_API_URL, {"prompts": [prompts[i] for i in indexes], "priority": priority})
+        for index, text, error in zip(indexes, data.get("results", []), data.get("errors", [])):
+            text = (text or "").strip()
+            if text and not error:
+                results[index] = text
+                store_result(prompts[index], text)
+    return results
+
+
+def query_local_ai_many(
+    prompts: List[str], max_workers: int = AI_FANOUT_CONCURRENCY,
+    bypass_cache: bool = False, priority: str = "bulk"
+) -> List[Optional[str]]:
+    """
+    Fan several prompts out to /v1/generate at once, at most `max_workers` in flight.
+    Same contract as query_local_ai_batch: results in order, None for a prompt
+    the model failed on, AIServiceError when the server itself cannot be used.
+    Cache lookups and writes stay on the calling thread.
+    """
+    results: List[Optional[str]] = [None] * len(prompts)
+    missing: List[int] = []
+    for index, prompt in enumerate(prompts):
+        cached = None if bypass_cache else get_cached_result(prompt)
+        if cached is None:
+            missing.append(index)
+        else:
+            results[index] = cached
+
+    if not missing:
+        return results
+
+    def call(prompt):
+        data = _post_to_ai(AI_API_URL, {"prompt": prompt, "priority": priority})
+        return (data.get("result") or "").strip()
+
+    server_error = None
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+        futures = {executor.submit(call, prompts[index]): index for index in missing}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                text = future.result()
+            except (AIBadResponse, AITimeout):
+                continue  # this prompt failed; the others may still succeed
+            except AIServiceError as e:
+                server_error = server_error or e
+                continue
+            if text:
+                results[index] = text
+                store_result(prompts[index], text)
+
+    if server_error is not None:
+        raise server_error
+    return results
 
 
 def get_user_by_identifier(identifier: str):
@@ -72,64 +313,224 @@ def get_user_by_identifier(identifier: str):
 # -------------------------------
 # Enhanced WAR Description Generator
 # -------------------------------
-def generate_war_description(request_obj: ServiceRequest) -> str:
+def war_description_inputs(request_obj: ServiceRequest) -> dict:
+    """Everything the WAR description prompt is built from."""
+    return {
+        "unit": request_obj.unit.name if request_obj.unit else "GSO Team",
+        "department": str(request_obj.department) if request_obj.department else "the designated office",
+        "description": request_obj.description.strip() if request_obj.description else "No description provided.",
+        # .all() so a prefetch_related("reports") is reused
+        "report_texts": [r.report_text.strip() for r in request_obj.reports.all() if r.report_text.strip()],
+    }
+
+
+def war_input_fingerprint(request_obj: ServiceRequest) -> str:
+    """sha256 of the prompt inputs and prompt version; changes only when a new summary could differ."""
+    payload = dict(war_description_inputs(request_obj), prompt_version=PROMPT_TEMPLATE_VERSION)
+    payload["report_texts"] = sorted(payload["report_texts"])  # task reports have no fixed order
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def generate_war_description(request_obj: ServiceRequest, priority: str = "background") -> str:
     """
     Strict one-sentence WAR generator with no explanations,
     no meta commentary, and no hallucinations.
+    Emergency requests are always sent with interactive priority.
+    Raises AIServiceError if the model could not produce the sentence.
     """
-    try:
-        unit_name = request_obj.unit.name if request_obj.unit else "GSO Team"
-
-        requestor_description = (
-            request_obj.description.strip() if request_obj.description else "No description provided."
-        )
-
-        task_reports = TaskReport.objects.filter(request=request_obj)
-        report_texts = [r.report_text.strip() for r in task_reports if r.report_text.strip()]
-        reports_str = "\n".join([f"- {txt}" for txt in report_texts]) or "No personnel reports available."
-
-        department_name = request_obj.department if request_obj.department else "the designated office"
-
-        prompt = (
-            "Generate a Work Accomplishment Report (WAR) statement.\n\n"
-            "STRICT RULES:\n"
-            "- Output ONLY ONE sentence.\n"
-            "- Use ONLY the exact information found in the request description and personnel reports.\n"
-            "- DO NOT guess or create equipment names.\n"
-            "- DO NOT add any assumptions or invented context.\n"
-            "- If equipment or item appears in the personnel report, include it.\n"
-            "- If the department/office is provided, include it at the end of the sentence.\n"
-            "- Write from the perspective of the unit performing the work.\n"
-            "- No pronouns (no our/my/their).\n"
-            "- No names of people.\n"
-            "- Start with a clear action verb such as Completed, Conducted, Performed, Executed.\n"
-            "- Combine the request description with what was actually accomplished.\n\n"
-            f"Unit: {unit_name}\n"
-            f"Department/Office: {department_name}\n"
-            f"Request description: {requestor_description}\n"
-            f"Personnel reports: {reports_str}\n\n"
-            "Now produce the final one-sentence accomplishment strictly based on the provided information:"
-        )
-
-
-        return query_local_ai(prompt).strip()
-
-    except Exception as e:
-        return f"[AI Error] Failed to generate WAR: {e}"
+    inputs = war_description_inputs(request_obj)
+    reports_str = "\n".join([f"- {txt}" for txt in inputs["report_texts"]]) or "No personnel reports available."
+
+    prompt = (
+        "Generate a Work Accomplishment Report (WAR) statement.\n\n"
+        "STRICT RULES:\n"
+        "- Output ONLY ONE sentence.\n"
+        "- Use ONLY the exact information found in the request description and personnel reports.\n"
+        "- DO NOT guess or create equipment names.\n"
+        "- DO NOT add any assumptions or invented context.\n"
+        "- If equipment or item appears in the personnel report, include it.\n"
+        "- If the department/office is provided, include it at the end of the sentence.\n"
+        "- Write from the perspective of the unit performing the work.\n"
+        "- No pronouns (no our/my/their).\n"
+        "- No names of people.\n"
+        "- Start with a clear action verb such as Completed, Conducted, Performed, Executed.\n"
+        "- Combine the request description with what was actually accomplished.\n\n"
+        f"Unit: {inputs['unit']}\n"
+        f"Department/Office: {inputs['department']}\n"
+        f"Request description: {inputs['description']}\n"
+        f"Personnel reports: {reports_str}\n\n"
+        "Now produce the final one-sentence accomplishment strictly based on the provided information:"
+    )
+
+    if request_obj.is_emergency:
+        priority = "interactive"
+
+    return query_local_ai(prompt, priority=priority).strip()
+
+def summarize_war(
+    report: WorkAccomplishmentReport, generated_by=None, force: bool = False, priority: str = "background"
+):
+    """
+    Store an AIReportSummary for a WAR unless its inputs are unchanged.
+
+    Returns (summary, created). When the latest summary was made from the same
+    inputs (same fingerprint) it is returned as-is and the model is not called.
+    Raises ValueError for WARs without a ServiceRequest, AIServiceError on model failure.
+    """
+    if report.request is None:
+        raise ValueError("WAR has no linked service request to summarize.")
+
+    fingerprint = war_input_fingerprint(report.request)
+    latest = report.ai_summaries.order_by("-created_at", "-id").first()
+    if latest and latest.input_fingerprint == fingerprint and not force:
+        return latest, False
+
+    summary = AIReportSummary.objects.create(
+        report=report,
+        summary_text=generate_war_description(report.request, priority=priority),
+        generated_by=generated_by,
+        input_fingerprint=fingerprint,
+        prompt_version=PROMPT_TEMPLATE_VERSION,
+    )
+    return summary, True
+
 
 # -------------------------------
 # IPMT Summary Generator (Improved)
 # -------------------------------
-def generate_ipmt_summary_sync(report_ids: List[int]) -> Dict[str, str]:
+def build_ipmt_prompt(indicator: str, descriptions: List[str]) -> str:
+    """Prompt asking the model for one IPMT sentence covering all WARs of an indicator."""
+    activities_text = "\n".join([f"- {desc}" for desc in descriptions])
+    return (
+        f"Summarize the following work accomplishments for the success indicator '{indicator}':\n\n"
+        f"{activities_text}\n\n"
+        "Write ONE concise sentence describing what the assigned personnel/unit did. "
+        "Do NOT mention requestors. "
+        "Do NOT include names. "
+        "Use active voice and formal government style. "
+        "Keep it clear, specific, and professional."
+    )
+
+
+def build_ipmt_reduce_prompt(indicator: str, partials: List[str]) -> str:
+    """Prompt merging partial IPMT summaries (from chunks of WARs) into one sentence."""
+    partials_text = "\n".join([f"- {partial}" for partial in partials])
+    return (
+        f"Combine these partial accomplishment summaries for the success indicator '{indicator}' "
+        f"into ONE concise sentence:\n\n"
+        f"{partials_text}\n\n"
+        "Keep every distinct activity. "
+        "Do NOT mention requestors. "
+        "Do NOT include names. "
+        "Use active voice and formal government style."
+    )
+
+
+MIN_CHUNK_TEXT_CHARS = 20  # shortest a text is cut to when packing prompts
+
+
+def fit_indicator_label(indicator: str, build_prompt, budget: int = AI_MAX_PROMPT_CHARS) -> str:
     """
-    Synchronous IPMT summary generator.
+    The indicator label, shortened if needed so a prompt still has room for two
+    texts of MIN_CHUNK_TEXT_CHARS. Raises ValueError when even an empty label doesn't fit.
+    """
+    needed = 2 * (MIN_CHUNK_TEXT_CHARS + 3)
+    deficit = needed - (budget - len(build_prompt(indicator, [])))
+    if deficit <= 0:
+        return indicator
+    label = indicator[:max(0, len(indicator) - deficit - 1)].rstrip() + "…"
+    if budget - len(build_prompt(label, [])) < needed:
+        raise ValueError(f"AI_MAX_PROMPT_CHARS={budget} is too small for the summary prompt template.")
+    return label
 
-    - Accepts a list of WAR ids (report_ids).
-    - Groups WARs by their success_indicator.
-    - Calls the local AI to summarize all descriptions per indicator.
-    - Returns a dict mapping success_indicator -> generated remark.
+
+def chunk_for_prompt(indicator: str, texts: List[str], build_prompt, budget: int = AI_MAX_PROMPT_CHARS) -> List[List[str]]:
+    """
+    Greedily pack texts into chunks whose prompt stays within `budget` characters.
+    Each text is cut to half the room left by the template, so every chunk
+    holds at least two texts and a reduce level always shrinks the list.
+    Pass the label through fit_indicator_label() first; a budget without room
+    for two texts raises ValueError.
     """
-    wars = WorkAccomplishmentReport.objects.filter(id__in=report_ids)
+    room = budget - len(build_prompt(indicator, []))
+    if room < 2 * (MIN_CHUNK_TEXT_CHARS + 3):
+        raise ValueError(f"Prompt budget {budget} leaves no room for two texts for indicator {indicator!r}.")
+    limit = room // 2 - 3  # 3 = "- " prefix and newline
+    texts = [t if len(t) <= limit else t[:limit - 1].rstrip() + "…" for t in texts]
+
+    chunks, current, used = [], [], 0
+    for text in texts:
+        cost = len(text) + 3
+        if current and used + cost > room:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def summarize_indicator_groups(
+    groups: Dict[Hashable, Tuple[str, List[str]]], bypass_cache: bool = False, priority: str = "bulk",
+    max_workers: Optional[int] = None,
+) -> Dict[Hashable, str]:
+    """
+    Summarize many (indicator, descriptions) groups, map-reduce style.
+
+    - `groups` maps any key (e.g. indicator code, or (personnel_id, indicator_id))
+      to a tuple of (indicator label, WAR descriptions).
+    - A group whose prompt would exceed AI_MAX_PROMPT_CHARS is split into chunks;
+      the chunk summaries are then merged, level by level, until one sentence is left.
+    - Every level of every group goes out in one batch call (or, with `max_workers`,
+      as concurrent single calls), so latency grows with the number of levels
+      (log of the WAR count), not the number of WARs.
+    - Returns a dict mapping the same keys to the generated remark;
+      a group the model failed on is left out.
+    """
+    results: Dict[Hashable, str] = {}
+    pending: Dict[Hashable, Tuple[str, List[str], bool]] = {}  # key -> (indicator, texts, texts are partials)
+    for key, (indicator, descriptions) in groups.items():
+        if not descriptions:
+            results[key] = f"No accomplishments recorded for indicator: {indicator}."
+            continue
+        pending[key] = (indicator, descriptions, False)
+
+    while pending:
+        keys, prompts = [], []
+        for key, (indicator, texts, reducing) in pending.items():
+            build_prompt = build_ipmt_reduce_prompt if reducing else build_ipmt_prompt
+            label = fit_indicator_label(indicator, build_prompt, AI_MAX_PROMPT_CHARS)
+            for chunk in chunk_for_prompt(label, texts, build_prompt, AI_MAX_PROMPT_CHARS):
+                keys.append(key)
+                prompts.append(build_prompt(label, chunk))
+
+        if max_workers:
+            remarks = query_local_ai_many(prompts, max_workers, bypass_cache, priority)
+        else:
+            remarks = query_local_ai_batch(prompts, bypass_cache, priority)
+
+        outputs: Dict[Hashable, List[Optional[str]]] = {}
+        for key, remark in zip(keys, remarks):
+            outputs.setdefault(key, []).append(remark)
+
+        next_pending = {}
+        for key, remarks in outputs.items():
+            if not all(remarks):
+                continue  # a missing chunk would leave WARs out of the summary
+            if len(remarks) == 1:
+                results[key] = remarks[0]
+            elif len(remarks) < len(pending[key][1]):
+                next_pending[key] = (pending[key][0], remarks, True)
+            # else: the level didn't shrink; give up on the group rather than loop forever
+        pending = next_pending
+
+    return results
+
+
+def group_war_descriptions(report_ids: List[int]) -> Dict[str, List[str]]:
+    """Group the non-blank descriptions of the given WARs by success indicator code."""
+    wars = WorkAccomplishmentReport.objects.filter(id__in=report_ids).select_related("success_indicator")
 
     # Group descriptions by success indicator (use fallback "General" if not present)
     groups: Dict[str, List[str]] = {}
@@ -139,26 +540,32 @@ def generate_ipmt_summary_sync(report_ids: List[int]) -> Dict[str, str]:
         if not desc:
             continue
         groups.setdefault(indicator, []).append(desc)
+    return groups
 
-    results: Dict[str, str] = {}
-    for indicator, descriptions in groups.items():
-        if not descriptions:
-            results[indicator] = f"No accomplishments recorded for indicator: {indicator}."
-            continue
 
-        # Build prompt for AI to write concise, unit-focused sentence
-        activities_text = "\n".join([f"- {desc}" for desc in descriptions])
-        prompt = (
-            f"Summarize the following work accomplishments for the success indicator '{indicator}':\n\n"
-            f"{activities_text}\n\n"
-            "Write ONE concise sentence describing what the assigned personnel/unit did. "
-            "Do NOT mention requestors. "
-            "Do NOT include names. "
-            "Use active voice and formal government style. "
-            "Keep it clear, specific, and professional."
-        )
-
-        remark = query_local_ai(prompt).strip()
-        results[indicator] = remark
-
-    return results
\ No newline at end of file
+def ipmt_summary_workers() -> Optional[int]:
+    """max_workers for summarize_indicator_groups under AI_IPMT_SUMMARY_MODE (None = batch calls)."""
+    return max(1, AI_FANOUT_CONCURRENCY) if AI_IPMT_SUMMARY_MODE == "concurrent" else None
+
+
+def generate_ipmt_summary_sync(
+    report_ids: List[int], bypass_cache: bool = False, priority: str = "bulk"
+) -> Dict[str, str]:
+    """
+    Synchronous IPMT summary generator.
+
+    - Accepts a list of WAR ids (report_ids).
+    - Groups WARs by their success_indicator.
+    - Summarizes every indicator group in one batch call to the local AI, or as
+      concurrent single calls when AI_IPMT_SUMMARY_MODE is "concurrent".
+    - Returns a dict mapping success_indicator -> generated remark.
+    - bypass_cache=True skips cached results (used by "Regenerate").
+    - priority is the server admission class (bulk unless a user is waiting).
+    """
+    groups = group_war_descriptions(report_ids)
+    return summarize_indicator_groups(
+        {indicator: (indicator, descriptions) for indicator, descriptions in groups.items()},
+        bypass_cache=bypass_cache,
+        priority=priority,
+        max_workers=ipmt_summary_workers(),
+    )
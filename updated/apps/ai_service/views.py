@@ -6,7 +6,9 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 
 from .models import AIReportSummary
-from .utils import generate_ipmt_summary_sync, get_user_by_identifier
+from .utils import generate_ipmt_summary_sync, get_user_by_identifier, summarize_war
+from .cache import cache_stats
+from .exceptions import AIServiceError
 from apps.gso_reports.models import WorkAccomplishmentReport, IPMT, SuccessIndicator
 
 # -------------------------------
@@ -42,8 +44,15 @@ def regenerate_ipmt_summary(request):
     # Get linked WARs
     war_ids = [w.id for w in ipmt_obj.reports.all()]
 
-    summary_dict = generate_ipmt_summary_sync(war_ids)
+    # A regenerate click must reach the model, not the result cache
+    try:
+        summary_dict = generate_ipmt_summary_sync(war_ids, bypass_cache=True, priority="interactive")
+    except AIServiceError as e:
+        return JsonResponse({"error": str(e)}, status=503)
+
     new_summary = summary_dict.get(indicator, "")
+    if not new_summary:
+        return JsonResponse({"error": "AI could not summarize this indicator. Please try again."}, status=502)
 
     ipmt_obj.accomplishment = new_summary
     ipmt_obj.save(update_fields=["accomplishment"])
@@ -51,6 +60,15 @@ def regenerate_ipmt_summary(request):
     return JsonResponse({"summary": new_summary})
 
 
+@login_required
+@user_passes_test(is_gso_or_director)
+def ai_cache_stats(request):
+    """
+    Hit/miss counters and size of the AI result cache (JSON).
+    """
+    return JsonResponse(cache_stats())
+
+
 @login_required
 def ai_summary_list(request):
     """
@@ -74,15 +92,20 @@ def ai_summary_detail(request, report_id):
 def generate_ai_summary(request, report_id):
     """
     Trigger synchronous generation of an AI summary for a WAR (Option B: no Celery).
+    Skips the model when the WAR's inputs are unchanged since the last summary.
     """
     report = get_object_or_404(WorkAccomplishmentReport, id=report_id)
 
     if request.method == "POST":
-        ai_summary = generate_war_description_sync(report.id)
-        if ai_summary:
-            messages.success(request, f"AI summary generated for WAR #{report.id}.")
+        try:
+            _, created = summarize_war(report, generated_by=request.user, priority="interactive")
+        except (ValueError, AIServiceError) as e:
+            messages.error(request, f"Failed to generate AI summary for WAR #{report.id}: {e}")
         else:
-            messages.error(request, f"Failed to generate AI summary for WAR #{report.id}.")
+            if created:
+                messages.success(request, f"AI summary generated for WAR #{report.id}.")
+            else:
+                messages.info(request, f"WAR #{report.id} is unchanged since its last AI summary.")
         return redirect("ai_service:ai_summary_detail", report_id=report.id)
 
     return render(request, "ai_service/generate_ai_summary.html", {"report": report})
@@ -105,8 +128,12 @@ def generate_ipmt_ai_summary(request, unit_name, month_filter):
     reports = collect_ipmt_reports(year, month_num, unit_name)
 
     if request.method == "POST":
-        report_ids = [r["war_id"] for r in reports if r.get("war_id")]
-        results = generate_ipmt_summary_sync(report_ids)
+        report_ids = [war_id for r in reports for row in r["rows"] for war_id in row["war_ids"]]
+        try:
+            results = generate_ipmt_summary_sync(report_ids)
+        except AIServiceError as e:
+            messages.error(request, f"AI IPMT summaries could not be generated: {e}")
+            return redirect("gso_reports:preview_ipmt")
 
         # Optionally: persist or process `results` (mapping indicator -> remark).
         # For now we show a success message and redirect.
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WorkAccomplishmentReport, SuccessIndicator
+from .models import WorkAccomplishmentReport, SuccessIndicator, IPMTSummary, ExportJob
 
 @admin.register(SuccessIndicator)
 class SuccessIndicatorAdmin(admin.ModelAdmin):
@@ -13,3 +13,17 @@ class WorkAccomplishmentReportAdmin(admin.ModelAdmin):
     list_display = ("activity_name", "unit", "date_started", "status", "total_cost")
     list_filter = ("unit", "status", "date_started")
     search_fields = ("activity_name", "description")
+
+
+@admin.register(IPMTSummary)
+class IPMTSummaryAdmin(admin.ModelAdmin):
+    list_display = ("personnel", "indicator", "month", "is_dirty", "computed_at")
+    list_filter = ("is_dirty", "month")
+    search_fields = ("summary",)
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "unit", "month", "status", "requested_by", "attempts", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("unit__name", "month", "filename")
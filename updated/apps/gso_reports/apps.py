@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class GsoReportsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.gso_reports"
+
+    def ready(self):
+        from . import signals  # noqa: F401  (keeps IPMT summaries in step with WARs)
@@ -0,0 +1,31 @@
+# apps/gso_reports/bundle_worker.py
+"""
+Entry points for the month-end bundle's worker processes.
+
+Spawned workers (the only start method on Windows) import this module to unpickle the
+initializer before Django is set up, so nothing here may import models at module level.
+"""
+import os
+
+
+def init_worker(settings_module, database_names):
+    """Set Django up in a fresh worker and point it at the parent's databases."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+    from django.conf import settings
+    from django.db import connections
+    # The parent may be using a different database than settings names (e.g. a test database)
+    for alias, name in database_names.items():
+        settings.DATABASES[alias]["NAME"] = name
+        connections[alias].settings_dict["NAME"] = name
+    # Forked workers must not reuse the parent's DB sockets
+    connections.close_all()
+
+
+def render_part(kind, unit_id, month_filter):
+    from .exports import render_bundle_part
+    return render_bundle_part(kind, unit_id, month_filter)
@@ -0,0 +1,266 @@
+# apps/gso_reports/excel.py
+import os
+import threading
+import time
+from copy import copy, deepcopy
+from io import BytesIO
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.image import Image
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+DEFAULT_COLUMN_WIDTH = 10
+LINE_HEIGHT = 15
+
+# Template rows kept above the exported data
+WAR_HEADER_ROWS = 10  # samplewar.xlsx: titles, month/unit lines, column headers
+IPMT_HEADER_ROWS = 12  # sampleipmt.xlsx: logos, personnel details, column headers
+EXPORT_CHUNK_SIZE = 500  # rows fetched from the database at a time
+
+
+# -------------------------------
+# Template Layout
+# -------------------------------
+class SheetTemplate:
+    """
+    The fixed top of an .xlsx report template (logos, titles, column headers),
+    read once with openpyxl so it can be replayed into a write-only sheet.
+
+    Only rows 1..header_rows are kept; everything below is written by the export.
+    """
+
+    def __init__(self, path, header_rows):
+        self.path = path
+        self.header_rows = header_rows
+        started = time.perf_counter()
+
+        wb = load_workbook(path)
+        ws = wb.active
+        self.title = ws.title
+        self.column_widths = {
+            letter: dim.width for letter, dim in ws.column_dimensions.items() if dim.width
+        }
+        self.row_heights = {
+            row: dim.height for row, dim in ws.row_dimensions.items()
+            if dim.height and row <= header_rows
+        }
+        # Each header row as [(column, value, style)] for every styled or filled cell
+        self.rows = [
+            [(cell.column, cell.value, _cell_style(cell)) for cell in row if cell.has_style or cell.value is not None]
+            for row in ws.iter_rows(min_row=1, max_row=header_rows)
+        ]
+        self.merges = [
+            str(rng) for rng in ws.merged_cells.ranges if rng.max_row <= header_rows
+        ]
+        self.images = [(img._data(), deepcopy(img.anchor), img.width, img.height) for img in ws._images]
+        self.page_setup = copy(ws.page_setup)
+        self.page_margins = copy(ws.page_margins)
+        self.print_options = copy(ws.print_options)
+        wb.close()
+        self.compile_seconds = time.perf_counter() - started
+
+    def column_width(self, column):
+        return self.column_widths.get(get_column_letter(column), DEFAULT_COLUMN_WIDTH)
+
+    def new_sheet(self, wb, values=None, styles=None, title=None):
+        """
+        Add a write-only sheet laid out like the template and write the header rows.
+        `values` overrides header cells by coordinate, e.g. {"B8": "Juan Dela Cruz"};
+        `styles` adds style attributes to header cells the same way.
+        """
+        ws = wb.create_sheet(title or self.title)
+        for letter, width in self.column_widths.items():
+            ws.column_dimensions[letter].width = width
+        ws.page_setup = copy(self.page_setup)
+        ws.page_margins = copy(self.page_margins)
+        ws.print_options = copy(self.print_options)
+        for data, anchor, width, height in self.images:
+            image = Image(BytesIO(data))
+            image.anchor, image.width, image.height = deepcopy(anchor), width, height
+            ws.add_image(image)
+
+        sheet = StreamingSheet(ws, self)
+        values, styles = values or {}, styles or {}
+        for row_index, cells in enumerate(self.rows, start=1):
+            row = {column: (value, style) for column, value, style in cells}
+            for coordinate in set(values) | set(styles):
+                cell_range = CellRange(coordinate)
+                if cell_range.min_row != row_index:
+                    continue
+                value, style = row.get(cell_range.min_col, (None, None))
+                row[cell_range.min_col] = (
+                    values.get(coordinate, value),
+                    {**(style or {}), **styles.get(coordinate, {})},
+                )
+            sheet.append_styled(
+                [(column, value, style) for column, (value, style) in sorted(row.items())],
+                height=self.row_heights.get(row_index),
+            )
+        for merge in self.merges:
+            sheet.merge(merge)
+        return sheet
+
+
+def _cell_style(cell):
+    return {
+        "font": copy(cell.font),
+        "border": copy(cell.border),
+        "fill": copy(cell.fill),
+        "alignment": copy(cell.alignment),
+        "number_format": cell.number_format,
+        "protection": copy(cell.protection),
+    }
+
+
+# -------------------------------
+# Template Registry
+# -------------------------------
+class TemplateRegistry:
+    """
+    Compiled SheetTemplates, parsed once per process and shared by every export.
+    A template is recompiled when its file's mtime changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates = {}  # (path, header_rows) -> (mtime_ns, SheetTemplate)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, name, header_rows):
+        """
+        Return (template, saved_seconds) for a file in static/excel_file.
+        saved_seconds is the parse time skipped by this lookup (0 when it compiled).
+        """
+        path = template_path(name)
+        mtime = os.stat(path).st_mtime_ns
+        key = (path, header_rows)
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached and cached[0] == mtime:
+                template = cached[1]
+                self.hits += 1
+                self.saved_seconds += template.compile_seconds
+                return template, template.compile_seconds
+
+        # Compile outside the lock; two racing exports at worst both parse it
+        template = SheetTemplate(path, header_rows)
+        with self._lock:
+            self._templates[key] = (mtime, template)
+            self.misses += 1
+        return template, 0.0
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "hits": self.hits,
+                "misses": self.misses,
+                "saved_seconds": round(self.saved_seconds, 4),
+            }
+
+
+TEMPLATES = TemplateRegistry()
+
+
+# -------------------------------
+# Streaming Sheet
+# -------------------------------
+class StreamingSheet:
+    """
+    Row-at-a-time writer over an openpyxl write-only worksheet.
+    Rows are flushed to a temp file as they are appended, so memory stays flat.
+    """
+
+    def __init__(self, ws, template=None):
+        self.ws = ws
+        self.template = template
+        self.row_count = 0
+
+    @property
+    def next_row(self):
+        return self.row_count + 1
+
+    def append_styled(self, cells, height=None):
+        """
+        Append one row of (column, value, style) tuples; style is a dict of
+        cell style attributes (font, border, fill, alignment, ...) or None.
+        """
+        row_index = self.next_row
+        if height:
+            self.ws.row_dimensions[row_index].height = height
+
+        row = [None] * max((column for column, _, _ in cells), default=0)
+        for column, value, style in cells:
+            cell = WriteOnlyCell(self.ws, value=value)
+            for attr, attr_value in (style or {}).items():
+                setattr(cell, attr, attr_value)
+            row[column - 1] = cell
+        self.ws.append(row)
+        self.row_count = row_index
+
+        if height:
+            # Already written; don't keep one dimension object per row
+            del self.ws.row_dimensions[row_index]
+
+    def append(self, values, style=None, height=None):
+        """Append plain values, all with the same style."""
+        self.append_styled([(column, value, style) for column, value in enumerate(values, start=1)], height)
+
+    def append_blank(self, count=1, height=None):
+        for _ in range(count):
+            self.append_styled([], height)
+
+    def merge(self, ref):
+        self.ws.merged_cells.add(CellRange(ref))
+
+    def merge_row(self, start_column, end_column, row=None, end_row=None):
+        row = row or self.row_count
+        self.merge(
+            f"{get_column_letter(start_column)}{row}:{get_column_letter(end_column)}{end_row or row}"
+        )
+
+
+def estimated_row_height(values_by_column, template, minimum=LINE_HEIGHT):
+    """Row height for wrapped text: one line per column width of characters."""
+    max_lines = 1
+    for column, value in values_by_column.items():
+        if value:
+            max_lines = max(max_lines, int(len(str(value)) / template.column_width(column)) + 1)
+    return max(minimum, max_lines * LINE_HEIGHT)
+
+
+# -------------------------------
+# Workbook
+# -------------------------------
+def new_workbook():
+    return Workbook(write_only=True)
+
+
+def sheet_title(name, taken):
+    """Valid, unique sheet title: no []:*?/\\ characters, at most 31 long."""
+    base = "".join(" " if ch in "[]:*?/\\" else ch for ch in (name or "")).strip()[:31] or "Sheet"
+    title, n = base, 1
+    while title.lower() in taken:
+        n += 1
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+    taken.add(title.lower())
+    return title
+
+
+def template_path(name):
+    from django.conf import settings
+    return os.path.join(settings.BASE_DIR, "static", "excel_file", name)
+
+
+def template_version(name):
+    """mtime of a template file; exports rendered from an older file are stale."""
+    return os.stat(template_path(name)).st_mtime_ns
@@ -0,0 +1,579 @@
+# apps/gso_reports/exports.py
+import os
+import csv
+import io
+import json
+import time
+import calendar
+import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.functions import Upper
+from django.utils import timezone
+from openpyxl.styles import Alignment, Border, Side, Font
+
+from apps.gso_accounts.models import User, Unit
+from apps.gso_requests.rollups import CC_QUESTIONS, SQD_QUESTIONS
+from . import bundle_worker
+from .models import WorkAccomplishmentReport, SuccessIndicator, IPMT, IPMTSummary, ExportJob
+from .utils import filter_feedback, ipmt_personnel, unit_month_ipmt_rows
+from .excel import (
+    TEMPLATES, estimated_row_height, new_workbook, sheet_title, template_version,
+    WAR_HEADER_ROWS, IPMT_HEADER_ROWS, EXPORT_CHUNK_SIZE,
+)
+
+
+# -------------------------------
+# Shared Helpers
+# -------------------------------
+def export_period(month_filter):
+    """
+    (year, first_month, last_month) for "YYYY-MM", or for "YYYY" (the whole year).
+    Raises ValueError for anything else.
+    """
+    if "-" in month_filter:
+        year, month_num = map(int, month_filter.split("-"))
+        first_month = last_month = month_num
+    else:
+        year, first_month, last_month = int(month_filter), 1, 12
+    if not 1 <= first_month <= 12:
+        raise ValueError(f"Invalid month: {month_filter}")
+    return year, first_month, last_month
+
+
+def fingerprint(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _thin_border(top=False, left=False, bottom=False, right=False):
+    thin_side = Side(border_style="thin", color="000000")
+    return Border(
+        top=thin_side if top else None,
+        left=thin_side if left else None,
+        bottom=thin_side if bottom else None,
+        right=thin_side if right else None
+    )
+
+
+# -------------------------------
+# WAR Excel
+# -------------------------------
+def export_unit_label(job) -> str:
+    """Unit part of an export's filename."""
+    return job.unit.name if job.unit else "All"
+
+
+def war_export_queryset(unit, month_filter, report_ids=None):
+    """WARs of one unit (or every unit for None) in an export period, oldest first."""
+    year, first_month, last_month = export_period(month_filter)
+    wars = WorkAccomplishmentReport.objects.select_related("unit", "request__department").prefetch_related("assigned_personnel").filter(
+        date_started__year=year,
+        date_started__month__gte=first_month,
+        date_started__month__lte=last_month,
+    )
+    if unit:
+        wars = wars.filter(unit=unit)
+    if report_ids:
+        wars = wars.filter(id__in=report_ids)
+    return wars.order_by("date_started", "id")
+
+
+def war_data_version(job) -> str:
+    """Changes whenever anything written into the WAR file changes: rows, personnel names, unit or template."""
+    wars = war_export_queryset(job.unit, job.month, job.params.get("report_ids"))
+    return fingerprint([
+        template_version("samplewar.xlsx"),
+        Unit.objects.filter(pk=job.unit_id).values_list("name", flat=True).first() if job.unit_id else None,
+        list(wars.values_list(
+            "id", "date_started", "date_completed", "activity_name", "description", "status",
+            "requesting_office_name", "request_id", "request__department__name",
+        )),
+        list(WorkAccomplishmentReport.assigned_personnel.through.objects
+             .filter(workaccomplishmentreport__in=wars.values("id"))
+             .order_by("id").values_list("workaccomplishmentreport_id", "user__first_name", "user__last_name")),
+    ])
+
+
+def war_signatories(unit_name):
+    """(prepared by, checked by, noted by) footer texts for a unit."""
+    unit_name_lower = unit_name.lower() if unit_name else ""
+
+    if "electrical" in unit_name_lower:
+        prepared_by_text = "Prepared by:\nPepito Nanalo\nAdministrative Assistant II"
+        checked_by_text = "Checked by:\nJuan Juanone\nOIC Head, Electrical Services Unit"
+    elif "utility" in unit_name_lower:
+        prepared_by_text = "Prepared by:\nLuz Bagani\nAdministrative Assistant II"
+        checked_by_text = "Checked by:\nManny Santos\nOIC Head, Utility Unit"
+    elif "repair" in unit_name_lower or "maintenance" in unit_name_lower:
+        prepared_by_text = "Prepared by:\nRepair/Maintenance Person\nPosition"
+        checked_by_text = "Checked by:\nRepair/Maintenance Head\nPosition"
+    elif "motorpool" in unit_name_lower:
+        prepared_by_text = "Prepared by:\nMotorpool Person\nPosition"
+        checked_by_text = "Checked by:\nMotorpool Head\nPosition"
+    else:
+        prepared_by_text = "Prepared by:\nPrepared Person\nPosition"
+        checked_by_text = "Checked by:\nChecked Person\nPosition"
+
+    noted_by_text = "Noted by:\nENGR. Juan Tamad\nGSO Director"
+    return prepared_by_text, checked_by_text, noted_by_text
+
+
+def render_war(job, output) -> str:
+    """Write the WAR workbook for a job to `output`; returns the download filename."""
+    unit, month_filter = job.unit, job.month
+    year, first_month, last_month = export_period(month_filter)
+    month_range = f"{calendar.month_name[first_month]} 1 - {calendar.month_name[last_month]} {calendar.monthrange(year, last_month)[1]}"
+    wars = war_export_queryset(unit, month_filter, job.params.get("report_ids"))
+
+    # Template header with the month/unit lines filled in
+    centered = Alignment(horizontal="center", vertical="center")
+    template, _ = TEMPLATES.get("samplewar.xlsx", WAR_HEADER_ROWS)
+    wb = new_workbook()
+    ws = template.new_sheet(
+        wb,
+        values={"A7": month_range, "A9": unit.name.upper() if unit else "UNASSIGNED"},
+        styles={"A7": {"alignment": centered}, "A9": {"alignment": centered}},
+    )
+    ws.merge("A7:H7")
+    ws.merge("A9:H9")
+
+    # Wrap text for Project Name and Description; center everything
+    wrapped = {"alignment": Alignment(wrap_text=True, vertical="center", horizontal="center")}
+    plain = {"alignment": centered}
+
+    # Write WAR rows; fetched and flushed in chunks so memory stays flat
+    for war in wars.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        office = (
+            war.request.department.name if war.request and war.request.department
+            else war.requesting_office_name or ""
+        )
+        values = [
+            war.date_started.strftime("%Y-%m-%d") if war.date_started else "",
+            war.date_completed.strftime("%Y-%m-%d") if war.date_completed else "",
+            war.activity_name or "",
+            war.description or "",
+            office,
+            ", ".join([p.get_full_name() for p in war.assigned_personnel.all()]),
+            war.status or "",
+            "",  # rating is filled in by hand
+        ]
+        # Row height only based on Project Name and Description
+        height = estimated_row_height({3: values[2], 4: values[3]}, template)
+        ws.append_styled(
+            [(col, value, wrapped if col in (3, 4) else plain) for col, value in enumerate(values, start=1)],
+            height=height,
+        )
+
+    # --- Footer: Prepared / Checked / Noted by ---
+    # Two blank rows, then a 3-row footer merged A:C, D:F and G:H
+    footer_rows = 3
+    prepared_by_text, checked_by_text, noted_by_text = war_signatories(unit.name if unit else "")
+    ws.append_blank(2)
+    sign_row = ws.next_row
+    ws.append_styled(
+        [(col, text, wrapped) for col, text in ((1, prepared_by_text), (4, checked_by_text), (7, noted_by_text))],
+        height=20,
+    )
+    ws.append_blank(footer_rows - 1, height=20)
+    last_row = sign_row + footer_rows - 1
+    ws.merge_row(1, 3, row=sign_row, end_row=last_row)
+    ws.merge_row(4, 6, row=sign_row, end_row=last_row)
+    ws.merge_row(7, 8, row=sign_row, end_row=last_row)
+
+    wb.save(output)
+    return f"WAR_{export_unit_label(job)}_{month_filter}.xlsx"
+
+
+# -------------------------------
+# IPMT Excel
+# -------------------------------
+# What write_ipmt_sheet prints in a sheet's header and signature boxes
+IPMT_HEADER_FIELDS = (
+    "id", "username", "first_name", "last_name", "unit__name", "position__name",
+    "employment_status__employment_status",
+)
+
+
+def ipmt_data_version(job) -> str:
+    """Changes whenever anything written into the IPMT file changes, including the template."""
+    director = User.objects.filter(role="director").order_by("id").values_list("first_name", "last_name").first()
+    if job.params.get("scope") == "unit":
+        # Whole unit: rows come from the unit-month's WARs, indicators, saved IPMT rows and summaries
+        wars = WorkAccomplishmentReport.objects.filter(unit=job.unit)
+        year, month_num, _ = export_period(job.month)
+        wars = wars.filter(date_started__year=year, date_started__month=month_num)
+        return fingerprint([
+            template_version("sampleipmt.xlsx"),
+            director,
+            list(wars.order_by("id").values_list("id", "date_started", "success_indicator_id", "description")),
+            list(WorkAccomplishmentReport.assigned_personnel.through.objects
+                 .filter(workaccomplishmentreport__in=wars.values("id"))
+                 .order_by("id").values_list("workaccomplishmentreport_id", "user_id")),
+            list(SuccessIndicator.objects.filter(unit=job.unit).order_by("id").values_list("id", "code", "description")),
+            list(IPMT.objects.filter(unit=job.unit, month=job.month).order_by("id").values_list(
+                "personnel_id", "indicator_id", "accomplishment", "remarks",
+            )),
+            list(IPMTSummary.objects.filter(indicator__unit=job.unit, month=job.month).order_by("id").values_list(
+                "personnel_id", "indicator_id", "summary",
+            )),
+            list(User.objects.filter(unit=job.unit, role="personnel").order_by("id").values_list(*IPMT_HEADER_FIELDS)),
+            job.params.get("personnel"),
+        ])
+
+    # The rows are edited in the preview and posted with the export; codes are expanded from SuccessIndicator
+    rows = job.params.get("rows", [])
+    codes = {r["indicator"].split(" - ")[0].strip().upper() for r in rows if r.get("indicator")}
+    personnel_id = job.params.get("personnel_id")
+    return fingerprint([
+        template_version("sampleipmt.xlsx"),
+        director,
+        rows,
+        list(SuccessIndicator.objects.annotate(upper_code=Upper("code")).filter(upper_code__in=codes)
+             .order_by("id").values_list("code", "description")),
+        list(User.objects.filter(id=personnel_id).values_list(*IPMT_HEADER_FIELDS)) if personnel_id else None,
+    ])
+
+
+def clean_indicator(indicator_raw):
+    indicator_raw = " ".join((indicator_raw or "").split())
+    if " - " in indicator_raw:
+        code, desc = indicator_raw.split(" - ", 1)
+        return f"{code.strip()} - {' '.join(desc.split())}"
+    return indicator_raw.strip()
+
+
+def ipmt_month_name(month_filter):
+    if "-" in month_filter:
+        year, month_num = map(int, month_filter.split("-"))
+        return f"{calendar.month_name[month_num]} {year}"
+    return month_filter
+
+
+def write_ipmt_sheet(wb, template, user_obj, month_name, reports, director, title=None):
+    """Append one personnel's IPMT sheet: header, indicator rows, IPCR note and signature boxes."""
+    full_name = user_obj.get_full_name() if user_obj else "No Name"
+
+    # --- Header Section ---
+    ws = template.new_sheet(wb, title=title, values={
+        "B7": user_obj.unit.name if user_obj and user_obj.unit else "No Unit",
+        "B8": full_name,
+        "B9": user_obj.employment_status.employment_status if user_obj and user_obj.employment_status else "No Status",
+        "B10": user_obj.position.name if user_obj and user_obj.position else "No Position",
+        "B11": month_name,
+    })
+
+    centered = Alignment(horizontal="center", vertical="center")
+    data_style = {
+        "alignment": Alignment(horizontal="center", vertical="center", wrap_text=True),
+        "border": _thin_border(top=True, left=True, bottom=True, right=True),
+    }
+
+    # --- Data Table ---
+    for r in reports:
+        desc_clean = " ".join((r.get("description", "") or "").split())
+        remarks_clean = " ".join((r.get("remarks", "") or "").split())
+
+        # Columns A-D centered and bordered; remarks span C:D
+        ws.append([clean_indicator(r.get("indicator", "")), desc_clean, remarks_clean, None], style=data_style)
+        ws.merge_row(3, 4)
+
+    # --- IPCR note ---
+    note = ("(*Based on the IPCR Major Final Output (MFO)/ Program, Activity and Project (PAP), "
+            "select only those success indicators where the accomplishments for the period are aligned to*)")
+    ws.append_styled([
+        (col, note if col == 1 else None, {
+            "font": Font(italic=True),
+            "alignment": Alignment(horizontal="center", vertical="center", wrap_text=True),
+            "border": _thin_border(top=True, left=(col == 1), bottom=True, right=(col == 4)),
+        })
+        for col in range(1, 5)
+    ], height=40)
+    ws.merge_row(1, 4)
+
+    # --- Prepared by (left box) / Checked and Verified by (right box) ---
+    prepared_texts = ["Prepared by:", full_name, "Employee"]
+    checked_texts = [
+        "Checked and Verified by:",
+        director.get_full_name() if director else "Director Name",
+        "(Department Head / Supervisor)"
+    ]
+
+    for i, (prepared, checked) in enumerate(zip(prepared_texts, checked_texts)):
+        font = Font(underline="single") if i == 1 else Font()
+        last = i == 2
+        row = [
+            # Left box border: top, left, bottom only, no right
+            (1, prepared, {"font": font, "alignment": centered,
+                           "border": _thin_border(top=(i == 0), left=True, bottom=last)}),
+        ]
+        if last:
+            row.append((2, None, {"border": _thin_border(bottom=True)}))
+        # Right box border: top, right, bottom only, no left
+        row.append((3, checked, {"font": font, "alignment": centered,
+                                 "border": _thin_border(top=(i == 0), bottom=last, right=True)}))
+        row.append((4, None, {"border": _thin_border(top=(i == 0), bottom=last, right=True)}))
+        ws.append_styled(row)
+        ws.merge_row(3, 4)
+    return ws
+
+
+def render_ipmt(job, output) -> str:
+    """
+    Write the IPMT workbook for a job to `output`; returns the download filename.
+    A "unit" scope job gets one sheet per personnel of the unit; otherwise the posted preview rows are written.
+    """
+    month_filter = job.month
+    if job.params.get("scope") == "unit":
+        year, month_num, _ = export_period(month_filter)
+        build_unit_ipmt_workbook(job.unit, year, month_num, job.params.get("personnel")).save(output)
+        return f"IPMT_{export_unit_label(job)}_{month_filter}.xlsx"
+
+    reports = [dict(r) for r in job.params.get("rows", [])]
+
+    # Clean indicators
+    for r in reports:
+        if not r.get("indicator"):
+            continue
+        code_only = r["indicator"].split(" - ")[0].strip()
+        si = SuccessIndicator.objects.filter(code__iexact=code_only).first()
+        if si:
+            r["indicator"] = f"{si.code} - {si.description}"
+
+    # Only support single personnel for header fields
+    personnel_id = job.params.get("personnel_id")
+    user_obj = User.objects.select_related("unit", "employment_status", "position") \
+        .filter(id=personnel_id).first() if personnel_id else None
+
+    template, _ = TEMPLATES.get("sampleipmt.xlsx", IPMT_HEADER_ROWS)
+    wb = new_workbook()
+    director = User.objects.filter(role="director").first()
+    write_ipmt_sheet(wb, template, user_obj, ipmt_month_name(month_filter), reports, director)
+
+    wb.save(output)
+    return f"IPMT_{export_unit_label(job)}_{month_filter}.xlsx"
+
+
+def build_unit_ipmt_workbook(unit, year, month_num, personnel_names=None):
+    """
+    One IPMT sheet per personnel of a unit-month, written in a single pass.
+    Data comes from a fixed number of queries (personnel, WAR assignments,
+    saved IPMT rows, summaries, director), so time grows with rows, not rows x personnel.
+    """
+    users = ipmt_personnel(unit, personnel_names)
+    rows_by_user = unit_month_ipmt_rows(unit, year, month_num, users)
+    director = User.objects.filter(role="director").first()
+
+    template, _ = TEMPLATES.get("sampleipmt.xlsx", IPMT_HEADER_ROWS)
+    wb = new_workbook()
+    month_name = f"{calendar.month_name[month_num]} {year}"
+    taken = set()
+    for user in users:
+        name = user.get_full_name() or user.username
+        write_ipmt_sheet(wb, template, user, month_name, rows_by_user[user.id], director,
+                         title=sheet_title(name, taken))
+    if not users:
+        write_ipmt_sheet(wb, template, None, month_name, [], director)
+    return wb
+
+
+# -------------------------------
+# Feedback CSV
+# -------------------------------
+def _feedback_queryset(job):
+    return filter_feedback(
+        unit_id=job.unit_id,
+        month=job.month or None,
+        start_date=job.params.get("start_date"),
+        end_date=job.params.get("end_date"),
+    )
+
+
+def feedback_data_version(job) -> str:
+    """Every column the CSV prints, read without building the rows."""
+    return fingerprint(list(_feedback_queryset(job).values_list(
+        "id", "request_id", "request__unit__name",
+        "request__custom_full_name", "request__custom_email",
+        "request__requestor__first_name", "request__requestor__last_name", "request__requestor__email",
+        *SQD_QUESTIONS, *CC_QUESTIONS, "average_score", "suggestions", "date_submitted",
+    )))
+
+
+FEEDBACK_CSV_HEADER = [
+    "Service Request ID",
+    "Unit",
+    "Requestor Name",
+    "Requestor Email",
+    "SQD1","SQD2","SQD3","SQD4","SQD5","SQD6","SQD7","SQD8","SQD9",
+    "CC1","CC2","CC3",
+    "Average Score",
+    "Suggestions",
+    "Date Submitted"
+]
+
+
+def feedback_csv_rows(queryset):
+    """
+    The CSV header, then one row per feedback.
+    Rows are read in chunks (the queryset must select_related request, requestor and unit).
+    """
+    yield FEEDBACK_CSV_HEADER
+    for fb in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        req = fb.request
+        requestor_name = req.custom_full_name or (req.requestor.get_full_name() if req.requestor else "")
+        requestor_email = req.custom_email or (req.requestor.email if req.requestor else "")
+        formatted_date = fb.date_submitted.strftime("%Y-%m-%d %H:%M") if fb.date_submitted else ""
+        yield [
+            req.id,
+            req.unit.name if req.unit else "",
+            requestor_name,
+            requestor_email,
+            fb.sqd1 or "", fb.sqd2 or "", fb.sqd3 or "", fb.sqd4 or "",
+            fb.sqd5 or "", fb.sqd6 or "", fb.sqd7 or "", fb.sqd8 or "", fb.sqd9 or "",
+            fb.cc1 or "", fb.cc2 or "", fb.cc3 or "",
+            round(fb.average_score, 2),
+            fb.suggestions or "",
+            formatted_date
+        ]
+
+
+def render_feedback(job, output) -> str:
+    """Write the feedback CSV for a job to `output`; returns the download filename."""
+    text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    csv.writer(text).writerows(feedback_csv_rows(_feedback_queryset(job)))
+    text.flush()
+    text.detach()  # leave `output` open for the caller
+    return "feedback_report.csv"
+
+
+# -------------------------------
+# Month-End Bundle
+# -------------------------------
+BUNDLE_WORKERS = int(os.getenv("EXPORT_BUNDLE_WORKERS", "4"))  # render processes for a bundle
+
+
+def render_bundle_part(kind, unit_id, month_filter):
+    """
+    Render one unit's WAR or IPMT workbook (in a worker process, via `bundle_worker`).
+    Returns a dict with the file bytes (or the error) and the time it took.
+    """
+    started = time.perf_counter()
+    unit = Unit.objects.get(id=unit_id)
+    part = {"unit": unit.name, "kind": kind, "filename": "", "data": b"", "error": ""}
+    try:
+        output = io.BytesIO()
+        if kind == "war":
+            part["filename"] = render_war(ExportJob(kind="war", unit=unit, month=month_filter), output)
+        else:
+            job = ExportJob(kind="ipmt", unit=unit, month=month_filter, params={"scope": "unit"})
+            part["filename"] = render_ipmt(job, output)
+        part["data"] = output.getvalue()
+    except Exception as e:
+        part["error"] = str(e)
+    part["seconds"] = round(time.perf_counter() - started, 3)
+    return part
+
+
+def _bundle_parts(parts, month_filter, workers, mp_context, fallback):
+    """
+    Render (kind, unit_id) parts in a process pool, yielding each as it finishes.
+    If the pool breaks (a worker failed to start or died), the parts still missing are
+    rendered in this process and the reason is appended to `fallback`.
+    """
+    remaining = set(parts)
+    database_names = {alias: connections[alias].settings_dict["NAME"] for alias in connections}
+    # Child processes open their own connections
+    connections.close_all()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context,
+            initializer=bundle_worker.init_worker, initargs=(settings.SETTINGS_MODULE, database_names),
+        ) as pool:
+            futures = {
+                pool.submit(bundle_worker.render_part, kind, unit_id, month_filter): (kind, unit_id)
+                for kind, unit_id in parts
+            }
+            for future in as_completed(futures):
+                part = future.result()
+                remaining.discard(futures[future])
+                yield part
+    except BrokenProcessPool as e:
+        fallback.append(str(e))
+
+    for kind, unit_id in parts:
+        if (kind, unit_id) in remaining:
+            yield render_bundle_part(kind, unit_id, month_filter)
+
+
+def render_month_end_bundle(month_filter, output, workers=None, mp_context=None) -> dict:
+    """
+    Every unit's WAR and IPMT for a month, rendered in a process pool, zipped into `output`.
+    The ZIP holds one folder per unit plus manifest.json with per-unit timings; the manifest is returned.
+    `mp_context` picks the pool's start method (default: the platform's).
+    """
+    year, first_month, last_month = export_period(month_filter)
+    if first_month != last_month:
+        raise ValueError("The month-end bundle needs a single month (YYYY-MM).")
+
+    units = list(Unit.objects.order_by("name").values_list("id", "name"))
+    workers = max(1, workers or BUNDLE_WORKERS)
+    started = time.perf_counter()
+    by_unit = {name: {"unit": name, "files": [], "errors": [], "seconds": 0.0} for _, name in units}
+    parts = [(kind, unit_id) for unit_id, _ in units for kind in ("war", "ipmt")]
+    fallback = []
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        # Written as each part finishes, so only in-flight parts are held in memory
+        for part in _bundle_parts(parts, month_filter, workers, mp_context, fallback):
+            entry = by_unit[part["unit"]]
+            entry["seconds"] = round(entry["seconds"] + part["seconds"], 3)
+            entry[part["kind"] + "_seconds"] = part["seconds"]
+            if part["error"]:
+                entry["errors"].append(f"{part['kind']}: {part['error']}")
+                continue
+            arcname = f"{part['unit'].replace('/', '-')}/{part['filename'].replace('/', '-')}"
+            bundle.writestr(arcname, part["data"])
+            entry["files"].append(arcname)
+
+        manifest = {
+            "month": month_filter,
+            "generated_at": timezone.now().isoformat(),
+            "workers": workers,
+            "in_process_fallback": fallback[0] if fallback else "",
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "units": [by_unit[name] for _, name in units],
+        }
+        bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+    return manifest
+
+
+def bundle_data_version(job) -> str:
+    """The versions of every unit's WAR and whole-unit IPMT for the month."""
+    versions = []
+    for unit in Unit.objects.order_by("id"):
+        versions.append([
+            unit.id,
+            war_data_version(ExportJob(kind="war", unit=unit, month=job.month)),
+            ipmt_data_version(ExportJob(kind="ipmt", unit=unit, month=job.month, params={"scope": "unit"})),
+        ])
+    return fingerprint(versions)
+
+
+def render_bundle(job, output) -> str:
+    render_month_end_bundle(job.month, output)
+    return f"month_end_{job.month}.zip"
+
+
+# -------------------------------
+# Registry
+# -------------------------------
+# kind -> (render(job, output) -> filename, data_version(job) -> str)
+EXPORTERS = {
+    "war": (render_war, war_data_version),
+    "ipmt": (render_ipmt, ipmt_data_version),
+    "feedback": (render_feedback, feedback_data_version),
+    "bundle": (render_bundle, bundle_data_version),
+}
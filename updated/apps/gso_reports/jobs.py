@@ -0,0 +1,149 @@
+# apps/gso_reports/jobs.py
+import os
+import tempfile
+from datetime import timedelta
+from typing import List, Tuple
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from .models import ExportJob
+from .exports import EXPORTERS, fingerprint
+
+# -------------------------------
+# Export Queue Config
+# -------------------------------
+EXPORT_RETRY_DELAY = int(os.getenv("EXPORT_RETRY_DELAY", "60"))  # seconds before retrying a failed render
+EXPORT_LOCK_TIMEOUT = int(os.getenv("EXPORT_LOCK_TIMEOUT", "900"))  # running jobs older than this were abandoned
+
+QUEUED = ["pending", "running"]
+
+
+# -------------------------------
+# Enqueue
+# -------------------------------
+def enqueue_export(kind: str, user, unit=None, month: str = "", params: dict = None) -> Tuple[ExportJob, bool]:
+    """
+    Queue an export, or join an identical one still queued: same kind, unit, month and params.
+    `unit` is a Unit, or None for every unit.
+    The requester is added to the job's recipients either way.
+    Nothing is read from the exported tables here; the worker computes the data version.
+    Returns (job, created).
+    """
+    params = params or {}
+    job = ExportJob(
+        kind=kind, unit=unit, month=month or "", params=params, params_key=fingerprint(params), requested_by=user
+    )
+    existing = (
+        ExportJob.objects.filter(
+            kind=job.kind, unit=job.unit, month=job.month, params_key=job.params_key, status__in=QUEUED
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if existing:
+        existing.recipients.add(user)
+        return existing, False
+
+    job.save()
+    job.recipients.add(user)
+    return job, True
+
+
+def download_url(job: ExportJob) -> str:
+    return reverse("gso_reports:download_export", args=[job.id])
+
+
+# -------------------------------
+# Worker Helpers
+# -------------------------------
+def claim_export_jobs(limit: int) -> List[ExportJob]:
+    """
+    Lock up to `limit` due jobs and mark them running, oldest first.
+    Jobs left running by a dead worker are reclaimed after EXPORT_LOCK_TIMEOUT.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", run_after__lte=now)
+                | Q(status="running", locked_at__lt=now - timedelta(seconds=EXPORT_LOCK_TIMEOUT))
+            )
+            .order_by("run_after", "id")[:limit]
+        )
+        for job in jobs:
+            job.status = "running"
+            job.locked_at = now
+            job.attempts += 1
+            job.save(update_fields=["status", "locked_at", "attempts", "updated_at"])
+    return jobs
+
+
+def run_export_job(job: ExportJob) -> bool:
+    """
+    Render a claimed job's file into MEDIA_ROOT and notify its recipients.
+    Returns True when the file is ready, False when the job was rescheduled or failed.
+    """
+    render, data_version = EXPORTERS[job.kind]
+    try:
+        job.data_version = data_version(job)
+        previous = _finished_twin(job)
+        if previous:
+            # Same export over unchanged data: share the finished file
+            filename = previous.filename
+            job.file.name = previous.file.name
+        else:
+            with tempfile.TemporaryFile() as output:
+                filename = render(job, output)
+                output.seek(0)
+                job.file.save(filename, File(output), save=False)
+    except Exception as e:
+        job.last_error = str(e)
+        job.locked_at = None
+        if job.attempts < job.max_attempts:
+            job.status = "pending"
+            job.run_after = timezone.now() + timedelta(seconds=EXPORT_RETRY_DELAY)
+        else:
+            job.status = "failed"
+            _notify(job, f"Your {job.get_kind_display()} export could not be generated: {e}", link=None)
+        job.save(update_fields=["status", "run_after", "locked_at", "last_error", "data_version", "updated_at"])
+        return False
+
+    job.filename = filename
+    job.status = "done"
+    job.locked_at = None
+    job.last_error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=[
+        "file", "filename", "data_version", "status", "locked_at", "last_error", "finished_at", "updated_at",
+    ])
+    _notify(job, f"Your {job.get_kind_display()} export ({filename}) is ready to download.", link=download_url(job))
+    return True
+
+
+def _finished_twin(job: ExportJob):
+    """A finished job with the same kind, unit, month, params and data version whose file still exists."""
+    previous = (
+        ExportJob.objects.filter(
+            kind=job.kind, unit=job.unit, month=job.month, params_key=job.params_key,
+            data_version=job.data_version, status="done",
+        )
+        .exclude(pk=job.pk)
+        .exclude(file="")
+        .order_by("-finished_at")
+        .first()
+    )
+    if previous and previous.file.storage.exists(previous.file.name):
+        return previous
+    return None
+
+
+def _notify(job: ExportJob, message: str, link):
+    Notification.objects.bulk_create([
+        Notification(user=user, message=message, link=link) for user in job.recipients.all()
+    ])
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gso_reports.exports import render_month_end_bundle, BUNDLE_WORKERS
+
+
+class Command(BaseCommand):
+    help = "Render every unit's WAR and IPMT for a month in a process pool and write them to one ZIP."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", required=True, help="Month to export, YYYY-MM.")
+        parser.add_argument("--workers", type=int, default=BUNDLE_WORKERS,
+                            help="Render processes to run at the same time.")
+        parser.add_argument("--output", help="ZIP path (default: month_end_<month>.zip).")
+
+    def handle(self, *args, **options):
+        month = options["month"]
+        path = options["output"] or f"month_end_{month}.zip"
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Rendering month-end bundle for {month} (workers={options['workers']})"
+        ))
+
+        try:
+            with open(path, "wb") as output:
+                manifest = render_month_end_bundle(month, output, workers=options["workers"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if manifest["in_process_fallback"]:
+            self.stderr.write(self.style.WARNING(
+                f"The worker pool broke ({manifest['in_process_fallback']}); the rest was rendered in this process."
+            ))
+        for unit in manifest["units"]:
+            line = (f"{unit['unit']}: {len(unit['files'])} file(s) in {unit['seconds']:.2f}s "
+                    f"(WAR {unit.get('war_seconds', 0):.2f}s, IPMT {unit.get('ipmt_seconds', 0):.2f}s)")
+            if unit["errors"]:
+                self.stderr.write(self.style.WARNING(f"{line} - errors: {'; '.join(unit['errors'])}"))
+            else:
+                self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path} in {manifest['total_seconds']:.2f}s."))
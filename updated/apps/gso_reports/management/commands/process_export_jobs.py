@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.gso_reports.excel import TEMPLATES
+from apps.gso_reports.jobs import claim_export_jobs, run_export_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Render queued report exports (WAR, IPMT, month-end bundle, feedback CSV) into MEDIA_ROOT "
+        "and notify the requesters. Must run continuously alongside the web server "
+        "(GSO_System.bat starts it); without it every export stays queued."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-interval", type=float, default=2.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no due jobs are left instead of polling forever.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING("Processing export jobs"))
+        done = failed = 0
+
+        while True:
+            jobs = claim_export_jobs(limit=1)
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = jobs[0]
+            saved_before = TEMPLATES.stats()["saved_seconds"]
+            started = time.perf_counter()
+            if run_export_job(job):
+                done += 1
+                saved = TEMPLATES.stats()["saved_seconds"] - saved_before
+                self.stdout.write(
+                    f"Export #{job.id} ({job.kind}): {job.filename} in {time.perf_counter() - started:.2f}s "
+                    f"(template cache saved {saved:.3f}s)."
+                )
+            else:
+                failed += 1
+                self.stderr.write(self.style.WARNING(
+                    f"Export #{job.id} ({job.kind}): attempt {job.attempts} failed ({job.status}): {job.last_error}"
+                ))
+
+        self.stdout.write(self.style.SUCCESS(f"Finished: {done} done, {failed} failed or rescheduled."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.gso_requests.models import ServiceRequest
+from apps.gso_reports.models import WorkAccomplishmentReport
+from apps.gso_reports.search import search_enabled, reindex_requests, reindex_wars
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vectors of every ServiceRequest and WAR (migrations backfill them once)."
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            self.stderr.write(self.style.WARNING("Full-text search needs PostgreSQL; nothing to rebuild."))
+            return
+
+        count = reindex_requests(ServiceRequest.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} service request(s)."))
+
+        count = reindex_wars(WorkAccomplishmentReport.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} WAR(s)."))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.gso_reports.summaries import refresh_dirty_summaries, mark_all_cells_dirty
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute dirty IPMT accomplishment summaries (precomputed for the IPMT preview). "
+        "Must run continuously alongside the web server (GSO_System.bat starts it); "
+        "without it summaries are never refreshed after WAR changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50,
+                            help="Dirty cells summarized per AI batch call.")
+        parser.add_argument("--poll-interval", type=float, default=10.0,
+                            help="Seconds to sleep when nothing is dirty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit after one pass over the dirty cells instead of polling forever.")
+        parser.add_argument("--backfill", action="store_true",
+                            help="First mark every cell that has WARs dirty.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+
+        if options["backfill"]:
+            marked = mark_all_cells_dirty()
+            self.stdout.write(self.style.SUCCESS(f"Backfill marked {marked} IPMT cell(s) dirty."))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Refreshing IPMT summaries (batch size={batch_size})"))
+        total_refreshed = total_failed = 0
+
+        while True:
+            refreshed, failed = refresh_dirty_summaries(limit=batch_size)
+            total_refreshed += refreshed
+            total_failed += failed
+            if refreshed or failed:
+                self.stdout.write(f"Refreshed {refreshed} cell(s), {failed} failed.")
+
+            if not refreshed:
+                # Nothing left, or everything left is failing: stop or wait
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Finished: {total_refreshed} refreshed, {total_failed} failed."))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_reports', '0005_remove_successindicator_activity_name_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IPMTSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.CharField(max_length=7)),
+                ('summary', models.TextField(blank=True)),
+                ('is_dirty', models.BooleanField(db_index=True, default=True)),
+                ('dirtied_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('indicator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ipmt_summaries', to='gso_reports.successindicator')),
+                ('personnel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ipmt_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['dirtied_at', 'id'],
+                'unique_together': {('personnel', 'indicator', 'month')},
+            },
+        ),
+    ]
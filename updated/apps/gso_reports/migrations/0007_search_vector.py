@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_accounts', '0003_employmentstatus_position_user_employment_status_and_more'),
+        ('gso_reports', '0006_ipmtsummary'),
+        ('gso_requests', '0014_remove_motorpoolrequest_driver'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workaccomplishmentreport',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='workaccomplishmentreport',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='war_search_gin'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_accounts', '0003_employmentstatus_position_user_employment_status_and_more'),
+        ('gso_reports', '0007_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('war', 'Work Accomplishment Report'), ('ipmt', 'IPMT'), ('feedback', 'Feedback CSV'), ('bundle', 'Month-end bundle')], max_length=10)),
+                ('month', models.CharField(blank=True, max_length=7)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('params_key', models.CharField(blank=True, max_length=64)),
+                ('data_version', models.CharField(blank=True, max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=10)),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/')),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('recipients', models.ManyToManyField(blank=True, related_name='received_exports', to=settings.AUTH_USER_MODEL)),
+                ('unit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='gso_accounts.unit')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['kind', 'unit', 'month', 'params_key', 'data_version'], name='export_dedupe_idx')],
+            },
+        ),
+    ]
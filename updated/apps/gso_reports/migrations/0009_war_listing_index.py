@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_reports', '0008_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workaccomplishmentreport',
+            index=models.Index(fields=['date_started', 'id'], name='war_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+
+# Same text and weights as apps.gso_reports.search at the time of writing
+SEARCH_CONFIG = "english"
+
+
+def _vector(parts):
+    vector = None
+    for text, weight in parts:
+        part = SearchVector(Value(text or "", output_field=TextField()), weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def _full_name(user):
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def _names(users):
+    return " ".join(_full_name(u) for u in users)
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Index the rows that existed before search_vector was added; later saves keep them current."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    ServiceRequest = apps.get_model("gso_requests", "ServiceRequest")
+    WorkAccomplishmentReport = apps.get_model("gso_reports", "WorkAccomplishmentReport")
+
+    requests_qs = ServiceRequest.objects.filter(search_vector__isnull=True) \
+        .select_related("department", "requestor", "unit").prefetch_related("assigned_personnel").order_by()
+    for request_obj in requests_qs.iterator(chunk_size=500):
+        vector = _vector([
+            (f"{request_obj.activity_name or ''} {request_obj.description or ''}", "A"),
+            (f"{request_obj.department.name if request_obj.department else ''} {request_obj.unit.name}", "B"),
+            (f"{_names(request_obj.assigned_personnel.all())} {request_obj.custom_full_name or ''} "
+             f"{_full_name(request_obj.requestor)}", "C"),
+        ])
+        ServiceRequest.objects.filter(pk=request_obj.pk).update(search_vector=vector)
+
+    wars_qs = WorkAccomplishmentReport.objects.filter(search_vector__isnull=True) \
+        .select_related("request__department").prefetch_related("assigned_personnel").order_by()
+    for war in wars_qs.iterator(chunk_size=500):
+        office = (
+            war.request.department.name if war.request and war.request.department
+            else war.requesting_office_name or ""
+        )
+        vector = _vector([
+            (f"{war.activity_name or ''} {war.description or ''}", "A"),
+            (office, "B"),
+            (f"{_names(war.assigned_personnel.all())} {war.personnel_names or ''}", "C"),
+        ])
+        WorkAccomplishmentReport.objects.filter(pk=war.pk).update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_reports', '0009_war_listing_index'),
+        ('gso_requests', '0015_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from apps.gso_accounts.models import Unit, User
 
 User = settings.AUTH_USER_MODEL
@@ -76,6 +78,16 @@ class WorkAccomplishmentReport(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search (kept current by signals.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="war_search_gin"),
+            # Keyset order of the accomplishment report listing
+            models.Index(fields=["date_started", "id"], name="war_listing_idx"),
+        ]
+
     def generate_description(self):
         """
         Returns the WAR description, or fallback text if missing.
@@ -128,4 +140,92 @@ class IPMT(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.personnel} - {self.month} - {self.indicator.code}"
\ No newline at end of file
+        return f"{self.personnel} - {self.month} - {self.indicator.code}"
+
+# -------------------------------------------------------------------
+# IPMT SUMMARY (precomputed AI accomplishment per IPMT cell)
+# -------------------------------------------------------------------
+class IPMTSummary(models.Model):
+    """
+    Materialized AI summary for one IPMT cell (personnel, indicator, month).
+    WAR changes mark the cell dirty; `refresh_ipmt_summaries` recomputes it,
+    so the IPMT preview only reads.
+    """
+    personnel = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ipmt_summaries")
+    indicator = models.ForeignKey(SuccessIndicator, on_delete=models.CASCADE, related_name="ipmt_summaries")
+    month = models.CharField(max_length=7)  # "YYYY-MM", same as the preview filter
+
+    summary = models.TextField(blank=True)
+    is_dirty = models.BooleanField(default=True, db_index=True)
+    dirtied_at = models.DateTimeField(default=timezone.now)
+    computed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ("personnel", "indicator", "month")
+        ordering = ["dirtied_at", "id"]
+
+    def __str__(self):
+        state = "dirty" if self.is_dirty else "fresh"
+        return f"{self.personnel} - {self.month} - {self.indicator.code} ({state})"
+
+
+# -------------------------------------------------------------------
+# EXPORT JOB (WAR / IPMT / feedback files rendered by a worker)
+# -------------------------------------------------------------------
+class ExportJob(models.Model):
+    """
+    Durable queue entry for a report export.
+    Picked up by `manage.py process_export_jobs`, which renders the file under
+    MEDIA_ROOT and notifies every recipient with a download link. Requests for
+    the same (kind, unit, month, params) share one job while it is queued, and the
+    worker reuses the file of a finished job with the same data_version.
+    """
+
+    KIND_CHOICES = [
+        ("war", "Work Accomplishment Report"),
+        ("ipmt", "IPMT"),
+        ("feedback", "Feedback CSV"),
+        ("bundle", "Month-end bundle"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    unit = models.ForeignKey(
+        Unit, on_delete=models.CASCADE, null=True, blank=True, related_name="export_jobs"
+    )  # None = all units
+    month = models.CharField(max_length=7, blank=True)  # "YYYY-MM", or "YYYY" for a whole-year WAR
+    params = models.JSONField(default=dict, blank=True)
+    params_key = models.CharField(max_length=64, blank=True)  # fingerprint of params, for dedupe
+    data_version = models.CharField(max_length=64, blank=True)  # fingerprint of the exported rows, set by the worker
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="export_jobs"
+    )
+    recipients = models.ManyToManyField(settings.AUTH_USER_MODEL, blank=True, related_name="received_exports")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending", db_index=True)
+    file = models.FileField(upload_to="exports/%Y/%m/", blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, db_index=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            models.Index(fields=["kind", "unit", "month", "params_key", "data_version"], name="export_dedupe_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} export {self.unit or 'all'} {self.month or ''} ({self.status})"
@@ -0,0 +1,121 @@
+# apps/gso_reports/search.py
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q, TextField, Value
+
+from apps.gso_requests.models import ServiceRequest
+from .models import WorkAccomplishmentReport
+
+# -------------------------------
+# Full-Text Search Config
+# -------------------------------
+SEARCH_CONFIG = "english"
+SEARCH_RESULT_LIMIT = 200  # ranked results shown for a search (no paging by rank)
+
+
+def search_enabled() -> bool:
+    """Full-text search needs Postgres; other databases fall back to icontains."""
+    return connection.vendor == "postgresql"
+
+
+# -------------------------------
+# Maintained Search Vectors
+# -------------------------------
+def _weighted_vector(parts):
+    """
+    tsvector from (text, weight) pairs computed in Python.
+    Related names (office, personnel) can't be joined in an UPDATE, so the text is passed as values.
+    """
+    vector = None
+    for text, weight in parts:
+        part = SearchVector(Value(text or "", output_field=TextField()), weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def _names(users):
+    return " ".join(u.get_full_name() or u.username for u in users)
+
+
+def update_request_search_vector(request_obj: ServiceRequest):
+    if not search_enabled():
+        return
+    requestor = request_obj.requestor
+    vector = _weighted_vector([
+        (f"{request_obj.activity_name or ''} {request_obj.description or ''}", "A"),
+        (f"{request_obj.department.name if request_obj.department else ''} {request_obj.unit.name}", "B"),
+        (f"{_names(request_obj.assigned_personnel.all())} {request_obj.custom_full_name or ''} "
+         f"{requestor.get_full_name() or requestor.username}", "C"),
+    ])
+    ServiceRequest.objects.filter(pk=request_obj.pk).update(search_vector=vector)
+
+
+def update_war_search_vector(war: WorkAccomplishmentReport):
+    if not search_enabled():
+        return
+    office = (
+        war.request.department.name if war.request and war.request.department
+        else war.requesting_office_name or ""
+    )
+    vector = _weighted_vector([
+        (f"{war.activity_name or ''} {war.description or ''}", "A"),
+        (office, "B"),
+        (f"{_names(war.assigned_personnel.all())} {war.personnel_names or ''}", "C"),
+    ])
+    WorkAccomplishmentReport.objects.filter(pk=war.pk).update(search_vector=vector)
+
+
+def reindex_requests(queryset) -> int:
+    """Recompute the search vector of every request in `queryset`; returns the count."""
+    count = 0
+    queryset = queryset.select_related("department", "requestor", "unit") \
+        .prefetch_related("assigned_personnel").order_by()
+    for request_obj in queryset.iterator(chunk_size=500):
+        update_request_search_vector(request_obj)
+        count += 1
+    return count
+
+
+def reindex_wars(queryset) -> int:
+    """Recompute the search vector of every WAR in `queryset`; returns the count."""
+    count = 0
+    queryset = queryset.select_related("request__department").prefetch_related("assigned_personnel").order_by()
+    for war in queryset.iterator(chunk_size=500):
+        update_war_search_vector(war)
+        count += 1
+    return count
+
+
+# -------------------------------
+# Ranked Search
+# -------------------------------
+def search_query(text: str) -> SearchQuery:
+    # websearch syntax: words, "quoted phrases", -exclusions, OR
+    return SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def ranked(queryset, text: str, fallback: Q):
+    """
+    Filter by the GIN-indexed search vector and annotate `search_rank`.
+    Without Postgres, filter by `fallback` and rank everything 0.
+    """
+    if not search_enabled():
+        return queryset.filter(fallback).annotate(search_rank=Value(0.0))
+    query = search_query(text)
+    return queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F("search_vector"), query))
+
+
+def search_requests(queryset, text: str):
+    return ranked(queryset, text, (
+        Q(description__icontains=text) | Q(activity_name__icontains=text)
+        | Q(department__name__icontains=text) | Q(unit__name__icontains=text)
+        | Q(requestor__first_name__icontains=text)
+        | Q(requestor__last_name__icontains=text) | Q(requestor__username__icontains=text)
+    ))
+
+
+def search_wars(queryset, text: str):
+    return ranked(queryset, text, (
+        Q(description__icontains=text) | Q(activity_name__icontains=text)
+        | Q(requesting_office_name__icontains=text) | Q(personnel_names__icontains=text)
+    ))
@@ -0,0 +1,160 @@
+# apps/gso_reports/signals.py
+from django.db.models.signals import pre_save, post_save, pre_delete, m2m_changed
+from django.db.models import Q
+from django.dispatch import receiver
+
+from apps.gso_accounts.models import Department, Unit, User
+from apps.gso_requests.models import ServiceRequest
+from .models import WorkAccomplishmentReport
+from .summaries import war_cells, mark_cells_dirty
+from .search import (
+    search_enabled, update_request_search_vector, update_war_search_vector, reindex_requests, reindex_wars,
+)
+
+
+# -------------------------------
+# Keep IPMT summaries in step with WARs
+# -------------------------------
+def _personnel_ids(war):
+    return list(war.assigned_personnel.values_list("id", flat=True))
+
+
+@receiver(pre_save, sender=WorkAccomplishmentReport)
+def remember_previous_cell(sender, instance, raw=False, **kwargs):
+    # The WAR may be moving to another indicator or month; the old cell loses it
+    instance._previous_cell = None
+    if raw or not instance.pk:
+        return
+    instance._previous_cell = (
+        WorkAccomplishmentReport.objects.filter(pk=instance.pk)
+        .values_list("success_indicator_id", "date_started")
+        .first()
+    )
+
+
+@receiver(post_save, sender=WorkAccomplishmentReport)
+def dirty_cells_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return  # a new WAR has no personnel yet; m2m_changed covers it
+    personnel_ids = _personnel_ids(instance)
+    cells = war_cells(instance.success_indicator_id, instance.date_started, personnel_ids)
+    previous = getattr(instance, "_previous_cell", None)
+    if previous:
+        cells |= war_cells(previous[0], previous[1], personnel_ids)
+    mark_cells_dirty(cells)
+
+
+@receiver(pre_delete, sender=WorkAccomplishmentReport)
+def dirty_cells_on_delete(sender, instance, **kwargs):
+    mark_cells_dirty(war_cells(instance.success_indicator_id, instance.date_started, _personnel_ids(instance)))
+
+
+@receiver(m2m_changed, sender=WorkAccomplishmentReport.assigned_personnel.through)
+def dirty_cells_on_personnel_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # pk_set is not provided for clear(); remember who is being removed
+        if reverse:
+            instance._cleared_wars = list(instance.war_personnel.values_list("id", flat=True))
+        else:
+            instance._cleared_personnel = _personnel_ids(instance)
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        personnel_ids = pk_set if action != "post_clear" else getattr(instance, "_cleared_personnel", [])
+        mark_cells_dirty(war_cells(instance.success_indicator_id, instance.date_started, personnel_ids or []))
+        return
+
+    # user.war_personnel.add(...): instance is the user, pk_set are WAR ids
+    war_ids = pk_set if action != "post_clear" else getattr(instance, "_cleared_wars", [])
+    cells = set()
+    for indicator_id, date_started in WorkAccomplishmentReport.objects.filter(id__in=war_ids or []) \
+            .values_list("success_indicator_id", "date_started"):
+        cells |= war_cells(indicator_id, date_started, [instance.pk])
+    mark_cells_dirty(cells)
+
+
+# -------------------------------
+# Keep full-text search vectors current
+# -------------------------------
+@receiver(post_save, sender=WorkAccomplishmentReport)
+def index_war(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_war_search_vector(instance)
+
+
+@receiver(post_save, sender=ServiceRequest)
+def index_request(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_request_search_vector(instance)
+
+
+@receiver(m2m_changed, sender=WorkAccomplishmentReport.assigned_personnel.through)
+def index_war_personnel(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        update_war_search_vector(instance)
+    elif pk_set:
+        for war in WorkAccomplishmentReport.objects.filter(id__in=pk_set):
+            update_war_search_vector(war)
+
+
+@receiver(m2m_changed, sender=ServiceRequest.assigned_personnel.through)
+def index_request_personnel(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        update_request_search_vector(instance)
+    elif pk_set:
+        for request_obj in ServiceRequest.objects.filter(id__in=pk_set):
+            update_request_search_vector(request_obj)
+
+
+# Names copied into other rows' vectors: renaming one re-indexes the rows that mention it
+NAME_FIELDS = {
+    Department: ("name",),
+    Unit: ("name",),
+    User: ("first_name", "last_name", "username"),
+}
+
+
+@receiver(pre_save, sender=Department)
+@receiver(pre_save, sender=Unit)
+@receiver(pre_save, sender=User)
+def remember_previous_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_name = None
+    fields = NAME_FIELDS[sender]
+    if raw or not instance.pk or not search_enabled():
+        return
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return  # e.g. the last_login update on every sign-in
+    instance._previous_name = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def _renamed(sender, instance):
+    previous = getattr(instance, "_previous_name", None)
+    return previous is not None and previous != tuple(getattr(instance, f) for f in NAME_FIELDS[sender])
+
+
+@receiver(post_save, sender=Department)
+def reindex_department_rename(sender, instance, **kwargs):
+    if _renamed(sender, instance):
+        reindex_requests(ServiceRequest.objects.filter(department=instance))
+        reindex_wars(WorkAccomplishmentReport.objects.filter(request__department=instance))
+
+
+@receiver(post_save, sender=Unit)
+def reindex_unit_rename(sender, instance, **kwargs):
+    if _renamed(sender, instance):
+        reindex_requests(ServiceRequest.objects.filter(unit=instance))
+
+
+@receiver(post_save, sender=User)
+def reindex_user_rename(sender, instance, **kwargs):
+    if _renamed(sender, instance):
+        reindex_requests(ServiceRequest.objects.filter(
+            Q(requestor=instance) | Q(assigned_personnel=instance)
+        ).distinct())
+        reindex_wars(WorkAccomplishmentReport.objects.filter(assigned_personnel=instance))
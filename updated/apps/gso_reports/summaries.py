@@ -0,0 +1,125 @@
+# apps/gso_reports/summaries.py
+from typing import Iterable, List, Set, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.ai_service.utils import summarize_indicator_groups, ipmt_summary_workers
+from apps.ai_service.exceptions import AIServiceError
+from .models import WorkAccomplishmentReport, IPMTSummary
+
+# (personnel_id, indicator_id, "YYYY-MM")
+Cell = Tuple[int, int, str]
+
+DIRTY_CHUNK_SIZE = 200  # cells per UPDATE when marking dirty
+
+
+# -------------------------------
+# Dirty Marking
+# -------------------------------
+def month_key(date) -> str:
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def war_cells(indicator_id, date_started, personnel_ids: Iterable[int]) -> Set[Cell]:
+    """IPMT cells a WAR counts towards: one per assigned personnel."""
+    if not indicator_id or not date_started:
+        return set()
+    month = month_key(date_started)
+    return {(personnel_id, indicator_id, month) for personnel_id in personnel_ids}
+
+
+def mark_cells_dirty(cells: Iterable[Cell]) -> int:
+    """
+    Flag IPMT cells for recomputation, creating the rows that don't exist yet.
+    Returns the number of cells marked.
+    """
+    cells = list(set(cells))
+    now = timezone.now()
+    IPMTSummary.objects.bulk_create(
+        [IPMTSummary(personnel_id=p, indicator_id=i, month=m, dirtied_at=now) for p, i, m in cells],
+        ignore_conflicts=True,
+        batch_size=DIRTY_CHUNK_SIZE,
+    )
+    for start in range(0, len(cells), DIRTY_CHUNK_SIZE):
+        match = Q()
+        for personnel_id, indicator_id, month in cells[start:start + DIRTY_CHUNK_SIZE]:
+            match |= Q(personnel_id=personnel_id, indicator_id=indicator_id, month=month)
+        IPMTSummary.objects.filter(match).update(is_dirty=True, dirtied_at=now)
+    return len(cells)
+
+
+def mark_all_cells_dirty() -> int:
+    """Backfill: flag every cell that has at least one WAR behind it."""
+    rows = WorkAccomplishmentReport.objects.filter(
+        success_indicator__isnull=False, assigned_personnel__isnull=False
+    ).values_list("assigned_personnel", "success_indicator_id", "date_started")
+    return mark_cells_dirty((p, i, month_key(d)) for p, i, d in rows)
+
+
+# -------------------------------
+# Recompute
+# -------------------------------
+def cell_wars(summary: IPMTSummary):
+    """WARs shown in the IPMT preview for this cell."""
+    year, month = map(int, summary.month.split("-"))
+    return WorkAccomplishmentReport.objects.filter(
+        unit_id=summary.indicator.unit_id,
+        assigned_personnel=summary.personnel_id,
+        success_indicator=summary.indicator_id,
+        date_started__year=year,
+        date_started__month=month,
+    )
+
+
+def refresh_dirty_summaries(limit: int = 50, priority: str = "bulk") -> Tuple[int, int]:
+    """
+    Recompute up to `limit` dirty cells with one AI batch call.
+
+    Cells with one WAR take its description as-is; cells with several are summarized.
+    A cell dirtied again while it was being computed stays dirty for the next pass.
+    Returns (refreshed, failed).
+    """
+    dirty: List[IPMTSummary] = list(
+        IPMTSummary.objects.filter(is_dirty=True).select_related("indicator")[:limit]
+    )
+    if not dirty:
+        return 0, 0
+
+    summaries, groups = {}, {}
+    for cell in dirty:
+        descriptions = [
+            d.strip() for d in cell_wars(cell).values_list("description", flat=True) if (d or "").strip()
+        ]
+        if len(descriptions) <= 1:
+            summaries[cell.id] = descriptions[0] if descriptions else ""
+        else:
+            groups[cell.id] = (cell.indicator.code, descriptions)
+
+    error = ""
+    if groups:
+        try:
+            summaries.update(summarize_indicator_groups(
+                groups, priority=priority, max_workers=ipmt_summary_workers()
+            ))
+        except AIServiceError as e:
+            error = str(e)
+
+    refreshed = failed = 0
+    now = timezone.now()
+    for cell in dirty:
+        if cell.id not in summaries:
+            failed += 1
+            # Still dirty; move it to the back so it doesn't block the rest of the queue
+            IPMTSummary.objects.filter(pk=cell.pk).update(
+                last_error=error or "Model returned no summary.", dirtied_at=now
+            )
+            continue
+        refreshed += 1
+        # Only clear the flag if nothing re-dirtied the cell since we read it
+        cleared = IPMTSummary.objects.filter(pk=cell.pk, dirtied_at=cell.dirtied_at).update(
+            summary=summaries[cell.id], is_dirty=False, computed_at=now, last_error=""
+        )
+        if not cleared:
+            IPMTSummary.objects.filter(pk=cell.pk).update(summary=summaries[cell.id], computed_at=now, last_error="")
+    return refreshed, failed
@@ -1,3 +1,282 @@
-from django.test import TestCase
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date, datetime, timezone as dt_timezone
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from apps.gso_accounts.models import Unit, User
+from apps.gso_reports import excel, exports
+from apps.gso_reports.exports import build_unit_ipmt_workbook, render_month_end_bundle
+from apps.gso_reports.jobs import enqueue_export, run_export_job
+from apps.gso_reports.utils import accomplishment_listing, decode_listing_cursor
+from apps.gso_requests.models import ServiceRequest
+from apps.gso_reports.models import IPMT, IPMTSummary, SuccessIndicator, WorkAccomplishmentReport
+
+
+class TemplateRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        shutil.copy(excel.template_path("samplewar.xlsx"), self.tmpdir)
+        self.path = os.path.join(self.tmpdir, "samplewar.xlsx")
+        patcher = mock.patch.object(excel, "template_path", lambda name: os.path.join(self.tmpdir, name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.registry = excel.TemplateRegistry()
+
+    def test_template_is_compiled_once(self):
+        first, saved_first = self.registry.get("samplewar.xlsx", excel.WAR_HEADER_ROWS)
+        second, saved_second = self.registry.get("samplewar.xlsx", excel.WAR_HEADER_ROWS)
+
+        self.assertIs(first, second)
+        self.assertEqual(saved_first, 0.0)
+        self.assertEqual(saved_second, first.compile_seconds)
+        self.assertEqual(self.registry.stats()["hits"], 1)
+        self.assertEqual(self.registry.stats()["misses"], 1)
+
+    def test_changed_file_is_recompiled(self):
+        first, _ = self.registry.get("samplewar.xlsx", excel.WAR_HEADER_ROWS)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second, saved = self.registry.get("samplewar.xlsx", excel.WAR_HEADER_ROWS)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(saved, 0.0)
+
+    def test_each_workbook_gets_a_fresh_header(self):
+        template, _ = self.registry.get("samplewar.xlsx", excel.WAR_HEADER_ROWS)
+        outputs = []
+        for unit in ("ELECTRICAL", "UTILITY"):
+            wb = excel.new_workbook()
+            sheet = template.new_sheet(wb, values={"A9": unit})
+            sheet.append(["2025-01-01", "", "Activity"])
+            buffer = BytesIO()
+            wb.save(buffer)
+            outputs.append(load_workbook(BytesIO(buffer.getvalue())).active)
+
+        self.assertEqual([ws["A9"].value for ws in outputs], ["ELECTRICAL", "UTILITY"])
+        for ws in outputs:
+            self.assertEqual(ws["C11"].value, "Activity")
+            self.assertEqual(len(ws._images), len(template.images))
+            self.assertIn("A1:H1", {str(r) for r in ws.merged_cells.ranges})
+
+
+class MonthEndBundleSpawnTests(TransactionTestCase):
+    def setUp(self):
+        # Spawned workers open their own connection, so they need a test database they can see
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("worker processes cannot share an in-memory test database")
+
+    def test_bundle_renders_in_spawned_workers(self):
+        Unit.objects.create(name="Electrical")
+        Unit.objects.create(name="Utility")
+        output = BytesIO()
+
+        manifest = render_month_end_bundle("2025-01", output, workers=2, mp_context=multiprocessing.get_context("spawn"))
+
+        self.assertEqual(manifest["in_process_fallback"], "")
+        self.assertEqual([u["errors"] for u in manifest["units"]], [[], []])
+        with zipfile.ZipFile(BytesIO(output.getvalue())) as bundle:
+            names = set(bundle.namelist())
+            self.assertEqual(json.loads(bundle.read("manifest.json"))["month"], "2025-01")
+        self.assertEqual(names, {
+            "manifest.json",
+            "Electrical/WAR_Electrical_2025-01.xlsx", "Electrical/IPMT_Electrical_2025-01.xlsx",
+            "Utility/WAR_Utility_2025-01.xlsx", "Utility/IPMT_Utility_2025-01.xlsx",
+        })
+
+
+class ExportReuseTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.unit = Unit.objects.create(name="Electrical")
+        self.director = User.objects.create(username="director", role="director")
+        self.worker = User.objects.create(username="worker", first_name="Old", last_name="Name", role="personnel", unit=self.unit)
+        war = WorkAccomplishmentReport.objects.create(unit=self.unit, date_started=date(2025, 3, 4), activity_name="Rewiring")
+        war.assigned_personnel.add(self.worker)
+
+    def export(self):
+        job, _ = enqueue_export("war", self.director, unit=self.unit, month="2025-03")
+        self.assertTrue(run_export_job(job))
+        return job
+
+    def personnel_cell(self, job):
+        with job.file.open("rb") as f:
+            return load_workbook(BytesIO(f.read())).active.cell(row=excel.WAR_HEADER_ROWS + 1, column=6).value
+
+    def test_unchanged_data_reuses_the_file(self):
+        first, second = self.export(), self.export()
+
+        self.assertNotEqual(first.pk, second.pk)
+        self.assertEqual(first.file.name, second.file.name)
+
+    def test_changed_rendered_field_renders_a_new_file(self):
+        first = self.export()
+        self.worker.first_name = "New"
+        self.worker.save()
+
+        second = self.export()
+
+        self.assertNotEqual(first.data_version, second.data_version)
+        self.assertNotEqual(first.file.name, second.file.name)
+        self.assertEqual(self.personnel_cell(first), "Old Name")
+        self.assertEqual(self.personnel_cell(second), "New Name")
+
+    def test_renamed_unit_changes_the_version(self):
+        first = self.export()
+        self.unit.name = "Electrical Services"
+        self.unit.save()
+
+        self.assertNotEqual(first.data_version, self.export().data_version)
+
+    def test_edited_template_renders_a_new_file(self):
+        first = self.export()
+        with mock.patch.object(exports, "template_version", return_value=1):
+            second = self.export()
+
+        self.assertNotEqual(first.file.name, second.file.name)
+
+
+# session, user, unit, personnel, then WAR assignments, active indicators, saved IPMT rows, summaries
+PREVIEW_QUERIES = 8
+# personnel, WAR assignments, saved IPMT rows, summaries, director
+WORKBOOK_QUERIES = 5
+
+
+class IPMTQueryCountTests(TestCase):
+    """The preview and the unit workbook read a unit-month with a fixed number of queries."""
+
+    def setUp(self):
+        self.unit = Unit.objects.create(name="Electrical")
+        self.director = User.objects.create(username="director", role="director")
+        self.indicators = [
+            SuccessIndicator.objects.create(unit=self.unit, code=f"CF{i}", description=f"Core function {i}")
+            for i in range(1, 4)
+        ]
+        self.client.force_login(self.director)
+
+    def add_personnel(self, count):
+        users = []
+        for i in range(count):
+            user = User.objects.create(username=f"worker{i}", first_name="Worker", last_name=str(i),
+                                       role="personnel", unit=self.unit)
+            for day, indicator in enumerate(self.indicators[:2], start=1):
+                war = WorkAccomplishmentReport.objects.create(
+                    unit=self.unit, date_started=date(2025, 3, day), success_indicator=indicator,
+                    description=f"Work {i}-{day}",
+                )
+                war.assigned_personnel.add(user)
+            IPMT.objects.create(personnel=user, unit=self.unit, month="2025-03", indicator=self.indicators[0],
+                                accomplishment="Saved text", remarks="COMPLIED")
+            IPMTSummary.objects.update_or_create(personnel=user, indicator=self.indicators[1], month="2025-03",
+                                                 defaults={"summary": "AI summary", "is_dirty": False})
+            users.append(user)
+        return users
+
+    def preview(self, users):
+        return self.client.get(reverse("gso_reports:preview_ipmt"), {
+            "month": "2025-03", "unit": self.unit.name, "personnel[]": [u.username for u in users],
+        })
+
+    def test_preview_queries_do_not_grow_with_personnel(self):
+        for count in (3, 12):
+            with self.subTest(personnel=count):
+                User.objects.filter(role="personnel").delete()
+                users = self.add_personnel(count)
+                with self.assertNumQueries(PREVIEW_QUERIES):
+                    response = self.preview(users)
+                self.assertEqual(len(response.context["reports"]), count * len(self.indicators))
+
+    def test_unit_workbook_queries_do_not_grow_with_personnel(self):
+        excel.TEMPLATES.get("sampleipmt.xlsx", excel.IPMT_HEADER_ROWS)  # compiled outside the count
+        for count in (3, 12):
+            with self.subTest(personnel=count):
+                User.objects.filter(role="personnel").delete()
+                self.add_personnel(count)
+                with self.assertNumQueries(WORKBOOK_QUERIES):
+                    wb = build_unit_ipmt_workbook(self.unit, 2025, 3)
+                self.assertEqual(len(wb.worksheets), count)
+
+
+class AccomplishmentListingPagingTests(TestCase):
+    """Keyset paging over WARs and completed requests that share the same days."""
+
+    @classmethod
+    def setUpTestData(cls):
+        requestor = User.objects.create(username="requestor", role="requestor")
+        cls.expected = []  # (day, rank, type, id, unit, status, description)
+        for unit_name in ("Electrical", "Utility"):
+            unit = Unit.objects.create(name=unit_name)
+            for day in (3, 4, 5):
+                for i in range(7):
+                    war = WorkAccomplishmentReport.objects.create(
+                        unit=unit, date_started=date(2025, 3, day), activity_name="Repair",
+                        status="Completed" if i % 2 else "In Progress",
+                        description=f"{'pipe' if i % 3 == 0 else 'wiring'} work {i}",
+                    )
+                    cls.expected.append((war.date_started, 0, "WorkAccomplishmentReport", war.id,
+                                         unit_name, war.status, war.description))
+                for i in range(6):
+                    request = ServiceRequest.objects.create(
+                        requestor=requestor, unit=unit, status="Completed",
+                        description=f"{'pipe' if i % 3 == 0 else 'wiring'} request {i}",
+                    )
+                    # created_at is auto_now_add; move it onto the same day as the WARs
+                    created = datetime(2025, 3, day, 12, tzinfo=dt_timezone.utc)
+                    ServiceRequest.objects.filter(pk=request.pk).update(created_at=created)
+                    cls.expected.append((created.date(), 1, "ServiceRequest", request.id,
+                                         unit_name, "Completed", request.description))
+        cls.expected.sort(key=lambda row: row[:2] + (row[3],), reverse=True)
+
+    def page_through(self, **filters):
+        seen, after, pages = [], None, 0
+        while True:
+            rows, cursor = accomplishment_listing(after=after, page_size=7, **filters)
+            seen += [(row["type"], row["id"]) for row in rows]
+            pages += 1
+            self.assertLess(pages, 50, "paging does not terminate")
+            if not cursor:
+                return seen
+            after = decode_listing_cursor(cursor)
+
+    def keys(self, rows):
+        return [(row[2], row[3]) for row in rows]
+
+    def test_pages_cover_every_row_once_in_order(self):
+        self.assertEqual(len(self.expected), 78)
+        self.assertEqual(self.page_through(), self.keys(self.expected))
+
+    def test_filtered_pages_cover_every_match_once(self):
+        expected = [row for row in self.expected if row[4] == "Utility" and row[5] == "Completed"]
+
+        self.assertEqual(self.page_through(unit="utility", status="Completed"), self.keys(expected))
+
+    def test_date_range_pages_cover_every_match_once(self):
+        expected = [row for row in self.expected if row[0] == date(2025, 3, 4)]
+
+        rows = self.page_through(date_from=date(2025, 3, 4), date_to=date(2025, 3, 4))
+        self.assertEqual(rows, self.keys(expected))
+
+    def test_search_returns_every_match_once(self):
+        rows, cursor = accomplishment_listing(search="pipe", unit="Electrical")
+        found = [(row["type"], row["id"]) for row in rows]
+
+        expected = {(row[2], row[3]) for row in self.expected if row[4] == "Electrical" and "pipe" in row[6]}
+        self.assertIsNone(cursor)
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(found), expected)
@@ -9,10 +9,15 @@ urlpatterns = [
     path('ipmt/generate/', views.generate_ipmt, name='generate_ipmt'),
     path("ipmt/preview/", views.preview_ipmt, name="preview_ipmt"),
     path('war-description/<int:war_id>/', views.get_war_description, name='get_war_description'),
+    path('war-description/stream/', views.stream_war_descriptions, name='stream_war_descriptions'),
 
     path("war/save/", views.save_war, name="save_war"),
     path("war/generate/", views.generate_war, name="generate_war"),
 
+    path("exports/month-end/", views.generate_month_end_bundle, name="generate_month_end_bundle"),
+    path("exports/<int:job_id>/", views.export_status, name="export_status"),
+    path("exports/<int:job_id>/download/", views.download_export, name="download_export"),
+
 
 
     # New unified preview
@@ -1,11 +1,11 @@
 from django.utils import timezone
-from datetime import datetime
+from datetime import datetime, date
+from django.db.models import Q, F, Value, CharField, IntegerField
+from django.db.models.functions import Coalesce, TruncDate
 from apps.gso_accounts.models import Unit, User
-from apps.gso_requests.models import ServiceRequest
-from .models import WorkAccomplishmentReport, SuccessIndicator, IPMT
-import io
-import calendar
-import pandas as pd
+from apps.gso_requests.models import ServiceRequest, Feedback
+from .models import WorkAccomplishmentReport, SuccessIndicator, IPMT, IPMTSummary
+from .search import search_requests, search_wars, SEARCH_RESULT_LIMIT
 
 
 # -------------------------------
@@ -62,11 +62,222 @@ def normalize_report(obj):
         }
 
 
+# -------------------------------
+# Accomplishment Report Listing (one UNION query, keyset paginated)
+# -------------------------------
+ACCOMPLISHMENT_PAGE_SIZE = 50
+
+# Tie-breaker between the two sources on the same date
+WAR_RANK, REQUEST_RANK = 0, 1
+
+
+def encode_listing_cursor(row):
+    return f"{row['day'].isoformat()}_{row['rank']}_{row['obj_id']}"
+
+
+def decode_listing_cursor(cursor):
+    """Parse "YYYY-MM-DD_rank_id"; returns None for a missing or malformed cursor."""
+    try:
+        day, rank, obj_id = cursor.split("_")
+        return date.fromisoformat(day), int(rank), int(obj_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _listing_branch(qs, rank, day, unit_name, after):
+    """Shape one source into the common (day, rank, obj_id) columns and apply the keyset."""
+    qs = qs.annotate(
+        day=day,
+        rank=Value(rank, output_field=IntegerField()),
+        obj_id=F("id"),
+        unit_label=unit_name,
+    )
+    if after:
+        after_day, after_rank, after_id = after
+        keyset = Q(day__lt=after_day)
+        if rank < after_rank:
+            keyset |= Q(day=after_day)
+        elif rank == after_rank:
+            keyset |= Q(day=after_day, obj_id__lt=after_id)
+        qs = qs.filter(keyset)
+    return qs
+
+
+def accomplishment_listing(unit=None, status=None, date_from=None, date_to=None, search=None,
+                           after=None, page_size=ACCOMPLISHMENT_PAGE_SIZE):
+    """
+    One page of the accomplishment report, newest first.
+
+    Completed requests without a WAR (live) and all WARs (live and migrated) are
+    unioned in the database with every filter pushed into both branches, and
+    paged by keyset on (date, source, id) so each page costs the same.
+    Only the rows on the page are loaded and normalized.
+    A search returns up to SEARCH_RESULT_LIMIT full-text matches ordered by rank instead.
+    Returns (normalized rows, cursor for the next page or None).
+    """
+    requests_qs = ServiceRequest.objects.filter(status="Completed", war__isnull=True)
+    wars_qs = WorkAccomplishmentReport.objects.all()
+
+    requests_qs = _listing_branch(requests_qs, REQUEST_RANK, TruncDate("created_at"), F("unit__name"), after)
+    wars_qs = _listing_branch(
+        wars_qs, WAR_RANK, F("date_started"),
+        Coalesce("request__unit__name", "unit__name", output_field=CharField()), after,
+    )
+
+    if unit:
+        requests_qs = requests_qs.filter(unit_label__iexact=unit)
+        wars_qs = wars_qs.filter(unit_label__iexact=unit)
+    if status:
+        # Requests in this listing are all Completed
+        requests_qs = requests_qs if status == "Completed" else requests_qs.none()
+        wars_qs = wars_qs.filter(status=status)
+    if date_from:
+        requests_qs = requests_qs.filter(day__gte=date_from)
+        wars_qs = wars_qs.filter(day__gte=date_from)
+    if date_to:
+        requests_qs = requests_qs.filter(day__lte=date_to)
+        wars_qs = wars_qs.filter(day__lte=date_to)
+
+    columns = ["day", "rank", "obj_id"]
+    ordering = ["-day", "-rank", "-obj_id"]
+    if search:
+        # Ranked full-text results, best match first, as one page
+        requests_qs = search_requests(requests_qs, search)
+        wars_qs = search_wars(wars_qs, search)
+        columns.append("search_rank")
+        ordering.insert(0, "-search_rank")
+        page_size = SEARCH_RESULT_LIMIT
+
+    keys = list(
+        requests_qs.order_by().values(*columns)  # clear Meta.ordering: not allowed inside a UNION
+        .union(wars_qs.order_by().values(*columns), all=True)
+        .order_by(*ordering)[:page_size + 1]
+    )
+    next_cursor = encode_listing_cursor(keys[page_size - 1]) if len(keys) > page_size and not search else None
+    keys = keys[:page_size]
+
+    # Load only this page's objects, with everything normalize_report touches
+    request_ids = [k["obj_id"] for k in keys if k["rank"] == REQUEST_RANK]
+    war_ids = [k["obj_id"] for k in keys if k["rank"] == WAR_RANK]
+    requests_by_id = ServiceRequest.objects.select_related("unit", "department") \
+        .prefetch_related("assigned_personnel").in_bulk(request_ids)
+    wars_by_id = WorkAccomplishmentReport.objects.select_related(
+        "request", "request__unit", "request__department", "unit", "success_indicator"
+    ).prefetch_related("assigned_personnel").in_bulk(war_ids)
+
+    rows = []
+    for key in keys:
+        source = requests_by_id if key["rank"] == REQUEST_RANK else wars_by_id
+        obj = source.get(key["obj_id"])
+        if obj is None:
+            continue  # deleted between the two queries
+        norm = normalize_report(obj)
+        norm["id"] = obj.id
+        rows.append(norm)
+    return rows, next_cursor
+
+
 # -------------------------------
 # Collect IPMT Reports (based on WAR Success Indicators)
 # -------------------------------
+def ipmt_personnel(unit, personnel_names: list = None):
+    """Personnel of a unit, optionally narrowed to names or usernames ("all" keeps everyone)."""
+    users = list(
+        User.objects.filter(unit=unit, role="personnel")
+        .select_related("unit", "employment_status", "position")
+        .order_by("last_name", "first_name", "id")
+    )
+    if not personnel_names or "all" in [p.lower() for p in personnel_names]:
+        return users
+    wanted = {" ".join(p.lower().split()) for p in personnel_names}
+    return [
+        u for u in users
+        if u.username.lower() in wanted or " ".join(u.get_full_name().lower().split()) in wanted
+    ]
+
+
+def unit_month_ipmt_rows(unit, year: int, month_num: int, users, all_indicators: bool = False) -> dict:
+    """
+    IPMT rows for every user of one unit-month, shared by the preview and the exports.
+    Three queries however many users (four with all_indicators):
+    WAR assignments (with indicator and description), saved IPMT rows and precomputed AI summaries.
+
+    Returns {user_id: [row, ...]}; each row has "indicator" ("CODE - description"), "code",
+    "indicator_description", "description", "remarks", "war_ids", "summary" (the IPMTSummary or None)
+    and "stale" (the summary is being recomputed).
+    Rows follow their first WAR's date; all_indicators appends the unit's other active indicators.
+    Text comes from the saved IPMT row, else the precomputed summary, else the WAR descriptions.
+    """
+    month_key = f"{year:04d}-{month_num:02d}"
+    user_ids = [u.id for u in users]
+
+    # --- WARs per (personnel, indicator), in date order ---
+    cells = {}
+    assignments = WorkAccomplishmentReport.assigned_personnel.through.objects.filter(
+        user_id__in=user_ids,
+        workaccomplishmentreport__unit=unit,
+        workaccomplishmentreport__date_started__year=year,
+        workaccomplishmentreport__date_started__month=month_num,
+    ).values_list(
+        "user_id",
+        "workaccomplishmentreport_id",
+        "workaccomplishmentreport__success_indicator_id",
+        "workaccomplishmentreport__success_indicator__code",
+        "workaccomplishmentreport__success_indicator__description",
+        "workaccomplishmentreport__description",
+    ).order_by("workaccomplishmentreport__date_started", "workaccomplishmentreport_id")
+    for user_id, war_id, indicator_id, code, indicator_desc, description in assignments:
+        cell = cells.setdefault((user_id, indicator_id), {
+            "code": code or "", "indicator_description": indicator_desc or "", "war_ids": [], "descriptions": [],
+        })
+        cell["war_ids"].append(war_id)
+        if (description or "").strip():
+            cell["descriptions"].append(description.strip())
+
+    if all_indicators:
+        indicators = SuccessIndicator.objects.filter(unit=unit, is_active=True).order_by("id")
+        for indicator_id, code, indicator_desc in indicators.values_list("id", "code", "description"):
+            for user_id in user_ids:
+                cells.setdefault((user_id, indicator_id), {
+                    "code": code, "indicator_description": indicator_desc, "war_ids": [], "descriptions": [],
+                })
+
+    # --- Saved IPMT rows and precomputed summaries for the same cells ---
+    saved = {
+        (row.personnel_id, row.indicator_id): row
+        for row in IPMT.objects.filter(personnel_id__in=user_ids, unit=unit, month=month_key)
+    }
+    precomputed = {
+        (row.personnel_id, row.indicator_id): row
+        for row in IPMTSummary.objects.filter(personnel_id__in=user_ids, indicator__unit=unit, month=month_key)
+    }
+
+    rows_by_user = {user_id: [] for user_id in user_ids}
+    for (user_id, indicator_id), cell in cells.items():
+        ipmt_obj = saved.get((user_id, indicator_id))
+        summary = precomputed.get((user_id, indicator_id))
+        stale = False
+        if ipmt_obj and ipmt_obj.accomplishment:
+            description, remarks = ipmt_obj.accomplishment, ipmt_obj.remarks or ""
+        else:
+            description = (summary.summary if summary else "") or "\n".join(cell["descriptions"])
+            remarks = "COMPLIED" if description else ""
+            # Recomputed in the background by refresh_ipmt_summaries
+            stale = bool(cell["war_ids"]) and (summary is None or summary.is_dirty)
+        rows_by_user[user_id].append({
+            "indicator": f"{cell['code']} - {cell['indicator_description']}" if indicator_id else "Unspecified Indicator",
+            "code": cell["code"] if indicator_id else "Unspecified",
+            "indicator_description": cell["indicator_description"],
+            "description": description,
+            "remarks": remarks,
+            "war_ids": cell["war_ids"],
+            "summary": summary,
+            "stale": stale,
+        })
+    return rows_by_user
+
+
 def collect_ipmt_reports(year: int, month_num: int, unit_name: str = None, personnel_names: list = None):
-    from apps.ai_service.tasks import generate_ipmt_summary
     """
     Collect IPMT preview rows using the success indicator directly from WARs.
 
@@ -85,126 +296,56 @@ def collect_ipmt_reports(year: int, month_num: int, unit_name: str = None, perso
         }
     ]
     """
-
-    result = []
-
-    # 1. Get unit
-    try:
-        unit = Unit.objects.get(name__iexact=unit_name)
-    except Unit.DoesNotExist:
+    unit = Unit.objects.filter(name__iexact=unit_name).first() if unit_name else None
+    if not unit:
         return []
 
-    # 2. Filter personnel
-    if personnel_names and "all" not in [p.lower() for p in personnel_names]:
-        users = User.objects.filter(
-            first_name__in=[p.split()[0].capitalize() for p in personnel_names],
-            unit=unit
-        )
-    else:
-        users = User.objects.filter(unit=unit, role="personnel")
-
-    # 3. Filter WARs for this unit/month
-    wars = WorkAccomplishmentReport.objects.filter(
-        unit=unit,
-        date_started__year=year,
-        date_started__month=month_num
-    ).prefetch_related("assigned_personnel", "success_indicator")
-
-    for user in users:
-        personnel_rows = []
-
-        # Get all WARs assigned to this user
-        user_wars = [w for w in wars if user in w.assigned_personnel.all()]
-
-        # Group WARs by their success indicator
-        grouped = {}
-        for w in user_wars:
-            indicator_name = w.success_indicator.name if w.success_indicator else "Unspecified Indicator"
-            grouped.setdefault(indicator_name, []).append(w)
-
-        # Build rows for each indicator
-        for indicator_name, war_list in grouped.items():
-            if len(war_list) == 1:
-                description = war_list[0].description
-                war_ids = [war_list[0].id]
-            else:
-                war_descriptions = [w.description for w in war_list if w.description]
-                description = generate_ipmt_summary(indicator_name, war_descriptions)
-                war_ids = [w.id for w in war_list]
-
-            personnel_rows.append({
-                "indicator": indicator_name,
-                "description": description,
-                "remarks": description,
-                "war_ids": war_ids
-            })
-
-        result.append({
-            "personnel": user.get_full_name() or user.username,
-            "rows": personnel_rows
-        })
-
-    return result
+    users = ipmt_personnel(unit, personnel_names)
+    rows_by_user = unit_month_ipmt_rows(unit, year, month_num, users)
+    return [
+        {"personnel": user.get_full_name() or user.username, "rows": rows_by_user[user.id]}
+        for user in users
+    ]
 
 
 # -------------------------------
-# Generate IPMT Excel
+# Feedback Filters
 # -------------------------------
-def generate_ipmt_excel(month_filter: str, unit_name: str = None, personnel_names: list = None):
+def filter_feedback(unit_id=None, month=None, start_date=None, end_date=None):
     """
-    Generate an Excel file for IPMT reports.
-    - One sheet per personnel
-    - Columns: Indicator, Accomplishment, Remarks
+    Feedback for the reports page and its CSV export, newest first.
+    Filters that fail to parse are ignored.
     """
-    try:
-        year, month_num = map(int, month_filter.split("-"))  # expects "YYYY-MM"
-    except ValueError:
-        raise ValueError("Month filter must be in 'YYYY-MM' format.")
-
-    if not personnel_names or "all" in [p.lower() for p in personnel_names]:
-        personnel_names = set()
-        wars = WorkAccomplishmentReport.objects.filter(
-            date_started__year=year,
-            date_started__month=month_num,
-        )
-        if unit_name and unit_name.lower() != "all":
-            wars = wars.filter(unit__name__iexact=unit_name)
-        for war in wars:
-            for p in war.assigned_personnel.all():
-                personnel_names.add(p.get_full_name() or p.username)
-        personnel_names = list(personnel_names)
-
-    buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-        for person in personnel_names:
-            reports = collect_ipmt_reports(year, month_num, unit_name, [person])
-            rows = []
-            for r in reports:
-                rows.extend(r["rows"])
-
-            df = pd.DataFrame(rows)
-
-            if df.empty:
-                df = pd.DataFrame([{"indicator": "N/A", "description": "No reports", "remarks": ""}])
-
-            df = df.rename(columns={
-                "indicator": "Success Indicator",
-                "description": "Accomplishment",
-                "remarks": "Remarks"
-            })
-
-            sheet_title = (person[:30] if len(person) > 30 else person) or "Unassigned"
-            df.to_excel(writer, index=False, sheet_name=sheet_title)
-
-            worksheet = writer.sheets[sheet_title]
-            worksheet.write(0, 4, f"Month: {calendar.month_name[month_num]} {year}")
-            worksheet.write(1, 4, f"Personnel: {person}")
-            if unit_name:
-                worksheet.write(2, 4, f"Unit: {unit_name}")
-
-    buffer.seek(0)
-
-    from openpyxl import load_workbook
-    wb = load_workbook(buffer)
-
-    return wb
+    feedback_list = Feedback.objects.select_related("request", "request__requestor", "request__unit").order_by("-date_submitted")
+
+    # Filter by unit
+    if unit_id:
+        feedback_list = feedback_list.filter(request__unit_id=unit_id)
+
+    # Filter by month ('YYYY-MM')
+    if month:
+        try:
+            year, month_num = map(int, month.split("-"))
+            feedback_list = feedback_list.filter(
+                date_submitted__year=year,
+                date_submitted__month=month_num
+            )
+        except ValueError:
+            pass
+
+    # Filter by custom date range
+    if start_date:
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            feedback_list = feedback_list.filter(date_submitted__date__gte=start)
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            end = datetime.strptime(end_date, "%Y-%m-%d")
+            feedback_list = feedback_list.filter(date_submitted__date__lte=end)
+        except ValueError:
+            pass
+
+    return feedback_list
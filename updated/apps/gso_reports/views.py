@@ -1,28 +1,32 @@
 # apps/gso_reports/views.py
-import os
 import csv
 import json
+import time
+import asyncio
 import calendar
-import openpyxl
-from datetime import datetime
-from django.utils import timezone
-from django.conf import settings
-from django.http import HttpResponse, JsonResponse
-from django.db.models import Q
-from django.shortcuts import render
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.dateparse import parse_date
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse, FileResponse, Http404
+from django.db.models import Q, Avg
+from django.db.models.functions import Round
+from django.core.paginator import Paginator
+from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Side, Font
-from openpyxl.utils import range_boundaries
 
 
-from apps.gso_requests.models import ServiceRequest, Feedback
+from apps.gso_requests.models import Feedback
+from apps.gso_requests.rollups import OVERALL, quarter_months, rated, satisfaction_summary
 from apps.gso_accounts.models import User, Unit
-from .models import WorkAccomplishmentReport, SuccessIndicator, IPMT
-from .utils import normalize_report
-from apps.ai_service.utils import generate_war_description
-from apps.ai_service.utils import generate_ipmt_summary_sync
+from .models import WorkAccomplishmentReport, SuccessIndicator, IPMT, ExportJob
+from .utils import accomplishment_listing, decode_listing_cursor, filter_feedback, unit_month_ipmt_rows
+from .exports import export_period, feedback_csv_rows
+from .jobs import enqueue_export, download_url
+from apps.ai_service.jobs import enqueue_war_descriptions
+from apps.ai_service.models import WARDescriptionJob
 
 
 # -------------------------------
@@ -35,68 +39,50 @@ def is_gso_or_director(user):
 # -------------------------------
 # Accomplishment Report View
 # -------------------------------
+def _date_param(request, name):
+    """YYYY-MM-DD query parameter as a date, or None if missing/invalid."""
+    try:
+        return parse_date(request.GET.get(name) or "")
+    except ValueError:
+        return None
+
+
 @login_required
 @user_passes_test(is_gso_or_director)
 def accomplishment_report(request):
-    completed_requests = ServiceRequest.objects.filter(status="Completed").order_by("-created_at")
-    all_wars = WorkAccomplishmentReport.objects.select_related("request", "unit") \
-        .prefetch_related("assigned_personnel").all().order_by("-date_started")
-
-    reports = []
-    war_request_ids = set(war.request_id for war in all_wars if war.request_id)
-
-    # Process completed requests (no WAR yet)
-    for r in completed_requests:
-        if r.id in war_request_ids:
-            continue
-        norm = normalize_report(r)
-        norm["id"] = r.id
-
-        if not norm.get("description") or not norm["description"].strip():
-            try:
-                desc = generate_war_description(
-                    activity_name=getattr(r, "activity_name", getattr(r, "title", "Task")),
-                    unit=getattr(r.unit, "name", None),
-                    personnel_names=[p.get_full_name() for p in r.assigned_personnel.all()] if hasattr(r, "assigned_personnel") else None
-                )
-                r.description = desc or "No description generated."
-                r.save(update_fields=["description"])
-                norm["description"] = r.description
-            except Exception as e:
-                norm["description"] = f"Error generating description: {e}"
-
-        reports.append(norm)
-
-    # Process existing WARs
-    for war in all_wars:
-        norm = normalize_report(war)
-        norm["id"] = war.id
-
-        if not norm.get("description") or not norm["description"].strip():
-            try:
-                desc = generate_war_description(
-                    activity_name=getattr(war, "activity_name", getattr(war, "title", "Task")),
-                    unit=getattr(war.unit, "name", None),
-                    personnel_names=[p.get_full_name() for p in war.assigned_personnel.all()] if hasattr(war, "assigned_personnel") else None
-                )
-                war.description = desc or "No description generated."
-                war.save(update_fields=["description"])
-                norm["description"] = war.description
-            except Exception as e:
-                norm["description"] = f"Error generating description: {e}"
-
-        reports.append(norm)
-
-    # Filters
-    search_query = request.GET.get("q")
-    if search_query:
-        reports = [r for r in reports if search_query.lower() in str(r).lower()]
+    """
+    Live and migrated accomplishments, newest first, one keyset page at a time.
+    Listing, filters and search run in the database (see accomplishment_listing).
+    """
+    filters = {
+        "unit": request.GET.get("unit") or None,
+        "status": request.GET.get("status") or None,
+        "date_from": _date_param(request, "date_from"),
+        "date_to": _date_param(request, "date_to"),
+        "search": (request.GET.get("q") or "").strip() or None,
+    }
+    reports, next_cursor = accomplishment_listing(
+        after=decode_listing_cursor(request.GET.get("after")), **filters
+    )
 
-    unit_filter = request.GET.get("unit")
-    if unit_filter:
-        reports = [r for r in reports if r["unit"].lower() == unit_filter.lower()]
+    # Never generate while rendering: blank WAR descriptions show as pending
+    # and are queued in one batch for the description worker (process_war_jobs).
+    pending_war_ids = []
+    for norm in reports:
+        norm["description_pending"] = (
+            norm["type"] == "WorkAccomplishmentReport"
+            and norm["request"] is not None
+            and not (norm.get("description") or "").strip()
+        )
+        if norm["description_pending"]:
+            pending_war_ids.append(norm["id"])
+    enqueue_war_descriptions(pending_war_ids)
 
-    reports.sort(key=lambda r: r["date"], reverse=True)
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params["after"] = next_cursor
+        next_query = params.urlencode()
 
     personnel_qs = User.objects.filter(role="personnel", account_status="active") \
         .select_related('unit').order_by('unit__name', 'first_name')
@@ -113,7 +99,12 @@ def accomplishment_report(request):
     return render(
         request,
         "gso_office/accomplishment_report/accomplishment_report.html",
-        {"reports": reports, "personnel_list": personnel_list},
+        {
+            "reports": reports,
+            "personnel_list": personnel_list,
+            "next_query": next_query,
+            "is_first_page": not request.GET.get("after"),
+        },
     )
 
 @login_required
@@ -146,182 +137,64 @@ def update_success_indicator(request):
 @login_required
 @user_passes_test(is_gso_or_director)
 def generate_ipmt(request):
-    reports = []
-    personnel_list = []
+    """
+    Queue the IPMT Excel export; the file is rendered by `process_export_jobs`.
+    scope="unit" exports every personnel of the unit from the saved data instead of the posted rows.
+    """
+    if request.method != "POST":
+        return HttpResponse("Only POST allowed.", status=400)
 
-    if request.method == "POST":
+    try:
+        body = json.loads(request.body.decode("utf-8"))
+        month_filter = body.get("month")
+        unit_filter = body.get("unit")
+        personnel_param = body.get("personnel", "")
+        scope = body.get("scope", "")
+        reports = body.get("rows", [])
+    except Exception:
+        month_filter = request.POST.get("month")
+        unit_filter = request.POST.get("unit")
+        personnel_param = request.POST.get("personnel", "")
+        scope = request.POST.get("scope", "")
+        rows_data = request.POST.get("rows", "[]")
         try:
-            body = json.loads(request.body.decode("utf-8"))
-            month_filter = body.get("month")
-            unit_filter = body.get("unit")
-            personnel_param = body.get("personnel", "")
-            reports = body.get("rows", [])
-        except Exception:
-            month_filter = request.POST.get("month")
-            unit_filter = request.POST.get("unit")
-            personnel_param = request.POST.get("personnel", "")
-            rows_data = request.POST.get("rows", "[]")
-            try:
-                reports = json.loads(rows_data)
-            except json.JSONDecodeError:
-                reports = []
+            reports = json.loads(rows_data)
+        except json.JSONDecodeError:
+            reports = []
 
-        personnel_list = [p.strip() for p in personnel_param.split(",") if p.strip()]
-
-        # Clean indicators
-        for r in reports:
-            if not r.get("indicator"):
-                continue
-            code_only = r["indicator"].split(" - ")[0].strip()
-            si = SuccessIndicator.objects.filter(code__iexact=code_only).first()
-            if si:
-                r["indicator"] = f"{si.code} - {si.description}"
+    if not month_filter:
+        return JsonResponse({"error": "Month filter required"}, status=400)
 
-    else:
-        return HttpResponse("Only POST allowed.", status=400)
+    personnel_list = [p.strip() for p in (personnel_param or "").split(",") if p.strip()]
+    unit = Unit.objects.filter(name__iexact=unit_filter).first() if unit_filter else None
 
-    template_path = os.path.join(settings.BASE_DIR, "static", "excel_file", "sampleipmt.xlsx")
-    wb = openpyxl.load_workbook(template_path)
-    ws = wb.active
+    if scope == "unit":
+        try:
+            _, first_month, last_month = export_period(month_filter)
+        except ValueError:
+            first_month, last_month = None, 0
+        if first_month != last_month:
+            return JsonResponse({"error": "Invalid month format. Use YYYY-MM"}, status=400)
+        if not unit:
+            return JsonResponse({"error": "Unit required"}, status=400)
+        job, created = enqueue_export("ipmt", request.user, unit=unit, month=month_filter, params={
+            "scope": "unit",
+            "personnel": personnel_list,
+        })
+        return _export_job_response(job, created)
 
     # Only support single personnel for header fields
-    if personnel_list:
-        user_obj = get_user_by_identifier(personnel_list[0])
-    else:
-        user_obj = None
-
-    # --- Header Section ---
-    ws["B7"] = user_obj.unit.name if user_obj and user_obj.unit else "No Unit"
-    ws["B8"] = user_obj.get_full_name() if user_obj else "No Name"
-    ws["B9"] = user_obj.employment_status.employment_status if user_obj and user_obj.employment_status else "No Status"
-    ws["B10"] = user_obj.position.name if user_obj and user_obj.position else "No Position"
-
-    # Month
-    if "-" in month_filter:
-        year, month_num = map(int, month_filter.split("-"))
-        month_name = f"{calendar.month_name[month_num]} {year}"
-    else:
-        month_name = month_filter
-    ws["B11"] = month_name
-
-    # Define a thin border style
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    # --- Data Table ---
-    start_row = 13
-    for i, r in enumerate(reports, start=start_row):
-        # Clean indicator string
-        indicator_raw = r.get("indicator", "")
-        indicator_raw = " ".join(indicator_raw.split())
-        if " - " in indicator_raw:
-            code, desc = indicator_raw.split(" - ", 1)
-            code = code.strip()
-            desc = " ".join(desc.split())
-            indicator_clean = f"{code} - {desc}"
-        else:
-            indicator_clean = indicator_raw.strip()
-
-        desc_clean = " ".join((r.get("description", "") or "").split())
-        remarks_clean = " ".join((r.get("remarks", "") or "").split())
-
-        # Write to Excel
-        ws.cell(row=i, column=1).value = indicator_clean
-        ws.cell(row=i, column=2).value = desc_clean
-        ws.cell(row=i, column=3).value = remarks_clean
-
-        # Merge columns C and D for this row
-        ws.merge_cells(start_row=i, start_column=3, end_row=i, end_column=4)
-
-        # Center alignment for all columns A-D
-        for col in range(1, 5):
-            ws.cell(row=i, column=col).alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            ws.cell(row=i, column=col).border = thin_border
-
-    thin_side = Side(border_style="thin", color="000000")
-
-    def outside_border(top=False, left=False, bottom=False, right=False):
-        return Border(
-            top=thin_side if top else None,
-            left=thin_side if left else None,
-            bottom=thin_side if bottom else None,
-            right=thin_side if right else None
-        )
-
-    footer_start = start_row + len(reports)  # after last data row
-
-    # --- IPCR note ---
-    ws.merge_cells(start_row=footer_start, start_column=1, end_row=footer_start, end_column=4)
-    note_cell = ws.cell(row=footer_start, column=1)
-    note_cell.value = ("(*Based on the IPCR Major Final Output (MFO)/ Program, Activity and Project (PAP), "
-                    "select only those success indicators where the accomplishments for the period are aligned to*)")
-    note_cell.font = Font(italic=True)
-    note_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    ws.row_dimensions[footer_start].height = 40
-
-    # Outside border for IPCR note
-    for col in range(1, 5):
-        ws.cell(row=footer_start, column=col).border = outside_border(
-            top=True, left=(col==1), bottom=True, right=(col==4)
-        )
-
-    # --- Prepared by (left box) ---
-    prepared_row_start = footer_start + 1
-    for i, text in enumerate(["Prepared by:", ws["B8"].value if user_obj else "No Name", "Employee"]):
-        row = prepared_row_start + i
-        ws.cell(row=row, column=1).value = text
-        if i == 1:
-            ws.cell(row=row, column=1).font = Font(underline='single')
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal="center", vertical="center")
-        # Left box border: top, left, bottom only, no right
-        ws.cell(row=row, column=1).border = outside_border(
-            top=(i==0),
-            left=True,
-            bottom=(i==2),
-            right=False
-        )
-
-    # Add left border, top/bottom, and bottom across B as well
-    if i == 2:  # last row of box
-        for col in [1, 2]:
-            ws.cell(row=row, column=col).border = outside_border(top=False, left=(col==1), bottom=True, right=False)
-    else:
-        ws.cell(row=row, column=1).border = outside_border(top=(i==0), left=True, bottom=False, right=False)
-
-    # --- Checked and Verified by (right box) ---
-    director = User.objects.filter(role="director").first()
-    checked_texts = [
-        "Checked and Verified by:",
-        director.get_full_name() if director else "Director Name",
-        "(Department Head / Supervisor)"
-    ]
-
-    for i, text in enumerate(checked_texts):
-        row = prepared_row_start + i
-        ws.merge_cells(start_row=row, start_column=3, end_row=row, end_column=4)
-        ws.cell(row=row, column=3).value = text
-        if i == 1:
-            ws.cell(row=row, column=3).font = Font(underline='single')
-        ws.cell(row=row, column=3).alignment = Alignment(horizontal="center", vertical="center")
-        # Right box border: top, right, bottom only, no left
-        for col in range(3, 5):
-            ws.cell(row=row, column=col).border = outside_border(
-                top=(i==0),
-                left=False,
-                bottom=(i==2),
-                right=True
-            )
+    user_obj = get_user_by_identifier(personnel_list[0]) if personnel_list else None
+
+    job, created = enqueue_export("ipmt", request.user, unit=unit, month=month_filter, params={
+        "personnel_id": user_obj.id if user_obj else None,
+        "rows": [
+            {"indicator": r.get("indicator", ""), "description": r.get("description", ""), "remarks": r.get("remarks", "")}
+            for r in reports
+        ],
+    })
+    return _export_job_response(job, created)
 
-    # --- Save Response ---
-    response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    filename = f"IPMT_{unit_filter}_{month_filter}.xlsx"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    wb.save(response)
-    return response
 
 
 
@@ -346,6 +219,29 @@ def get_user_by_identifier(identifier):
 
     return User.objects.filter(Q(first_name__icontains=identifier) | Q(last_name__icontains=identifier)).first()
 
+
+def get_users_by_identifiers(identifiers):
+    """
+    Resolve many identifiers, in order, skipping unknown ones.
+    Usernames (what the report forms send) resolve in one query;
+    anything else falls back to get_user_by_identifier.
+    """
+    identifiers = [i.strip() for i in identifiers if i and i.strip()]
+    if not identifiers:
+        return []
+    match = Q()
+    for identifier in identifiers:
+        match |= Q(username__iexact=identifier)
+    by_username = {u.username.lower(): u for u in User.objects.filter(match)}
+
+    users, seen = [], set()
+    for identifier in identifiers:
+        user = by_username.get(identifier.lower()) or get_user_by_identifier(identifier)
+        if user and user.id not in seen:
+            seen.add(user.id)
+            users.append(user)
+    return users
+
 # -------------------------------
 # Get WAR Description (AJAX)
 # -------------------------------
@@ -357,7 +253,99 @@ def get_war_description(request, war_id):
         return JsonResponse({'description': war.description or ""})
     except WorkAccomplishmentReport.DoesNotExist:
         return JsonResponse({'error': 'WAR not found'}, status=404)
-    
+
+
+# -------------------------------
+# Stream WAR Descriptions (Server-Sent Events)
+# -------------------------------
+SSE_POLL_INTERVAL = 2  # seconds between server-side checks
+SSE_STREAM_TIMEOUT = 120  # seconds before the stream ends and the browser reconnects
+SSE_RETRY_MS = 3000  # reconnect delay sent to the browser
+SSE_MAX_IDS = 1000
+
+
+def _sse_event(event, payload, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def _war_description_tick(remaining):
+    """One check of every WAR still pending; removes the finished ones from `remaining`."""
+    events = []
+    ready = WorkAccomplishmentReport.objects.filter(id__in=remaining) \
+        .exclude(description="").values_list("id", "description")
+    async for war_id, description in ready:
+        remaining.discard(war_id)
+        events.append(("description", {"id": war_id, "description": description}))
+
+    if remaining:
+        failed = WARDescriptionJob.objects.filter(war_id__in=remaining, status="failed") \
+            .exclude(war__description_jobs__status__in=["pending", "running"]) \
+            .values_list("war_id", flat=True).distinct()
+        async for war_id in failed:
+            remaining.discard(war_id)
+            events.append(("failed", {"id": war_id}))
+    return events
+
+
+async def war_description_events(war_ids, delivered=(), poll_interval=SSE_POLL_INTERVAL,
+                                 timeout=SSE_STREAM_TIMEOUT):
+    """
+    Yields an SSE `description` event for each WAR as soon as its description exists,
+    a `failed` event when its generation job gave up, and an `end` event once none are left.
+
+    Each event's id lists the WARs delivered so far; the browser sends it back as
+    Last-Event-ID when it reconnects, so a new stream skips them. At `timeout` the
+    stream ends without `end` and the browser reconnects after SSE_RETRY_MS.
+    """
+    delivered = set(delivered)
+    remaining = set(war_ids) - delivered
+    deadline = time.monotonic() + timeout
+    yield f"retry: {SSE_RETRY_MS}\n\n"
+
+    while remaining:
+        for event, payload in await _war_description_tick(remaining):
+            delivered.add(payload["id"])
+            yield _sse_event(event, payload, event_id=",".join(map(str, sorted(delivered))))
+        if not remaining or time.monotonic() >= deadline:
+            break
+        yield ": keep-alive\n\n"
+        await asyncio.sleep(poll_interval)
+
+    if not remaining:
+        yield _sse_event("end", {})
+
+
+def _parse_ids(value):
+    return [int(i) for i in (value or "").split(",") if i.strip()]
+
+
+@login_required
+@user_passes_test(is_gso_or_director)
+def stream_war_descriptions(request):
+    """
+    One SSE stream per page: `?ids=1,2,3`. Replaces per-row polling of get_war_description.
+
+    Under ASGI the stream stays open, checking every SSE_POLL_INTERVAL without holding a thread.
+    Under WSGI a long stream would pin a worker thread, so each request answers with one
+    check and the browser's reconnect (every SSE_RETRY_MS) does the polling.
+    """
+    try:
+        war_ids = _parse_ids(request.GET.get("ids"))[:SSE_MAX_IDS]
+        delivered = set(_parse_ids(request.headers.get("Last-Event-ID"))) & set(war_ids)
+    except ValueError:
+        return JsonResponse({"error": "ids must be comma-separated integers"}, status=400)
+
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(war_description_events(war_ids, delivered), content_type="text/event-stream")
+    else:
+        async def one_check():
+            return "".join([chunk async for chunk in war_description_events(war_ids, delivered, timeout=0)])
+        response = HttpResponse(async_to_sync(one_check)(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # keep nginx from buffering the stream
+    return response
+
 
 # -------------------------------
 # Preview IPMT (Web) with AI Summarization
@@ -367,9 +355,8 @@ def get_war_description(request, war_id):
 @user_passes_test(is_gso_or_director)
 def preview_ipmt(request):
     """
-    Preview IPMT rows for the selected unit, personnel, and month.
-    Fetches WARs linked to each SuccessIndicator and assigned personnel.
-    AI summarizes multiple WARs per Success Indicator into one concise description.
+    Preview IPMT rows for the selected unit, personnel, and month (see `unit_month_ipmt_rows`).
+    Shows the saved IPMT text, else the precomputed AI summary (flagged stale while it is recomputed).
     """
     month_filter = request.GET.get("month")
     unit_filter = request.GET.get("unit")
@@ -387,65 +374,10 @@ def preview_ipmt(request):
     if not unit:
         return HttpResponse("Unit not found.", status=404)
 
-    reports = []
-
-    for person_name in personnel_names:
-        user = get_user_by_identifier(person_name)
-        if not user:
-            continue
-
-        # Fetch all active success indicators under the unit
-        indicators = SuccessIndicator.objects.filter(unit=unit, is_active=True)
-
-        for indicator in indicators:
-            # Get WARs for this user and indicator within the selected month
-            wars = WorkAccomplishmentReport.objects.filter(
-                unit=unit,
-                assigned_personnel=user,
-                success_indicator=indicator,
-                date_started__year=year,
-                date_started__month=month_num
-            )
-
-            war_ids = [w.id for w in wars]
-
-            # --- AI summarization per Success Indicator ---
-            ipmt_obj = IPMT.objects.filter(
-                personnel=user,
-                unit=unit,
-                month=month_filter,
-                indicator=indicator
-            ).first()
-
-            if ipmt_obj and ipmt_obj.accomplishment:
-                # Use saved summary
-                summary_text = ipmt_obj.accomplishment
-            else:
-                # First-time AI generation
-                if war_ids:
-                    if len(war_ids) == 1:
-                        # Get the single WAR directly — NO AI summarization
-                        single_war = WorkAccomplishmentReport.objects.get(id=war_ids[0])
-                        summary_text = (
-                            getattr(single_war, "work_done", None)
-                            or getattr(single_war, "description", None)
-                            or ""
-                        )
-
-                    else:
-                        # AI summarization for multiple WARs
-                        summary_dict = generate_ipmt_summary_sync(war_ids)
-                        summary_text = summary_dict.get(indicator.code, "")
-                else:
-                    summary_text = ""
-
-            reports.append({
-                "indicator": indicator.code,
-                "indicator_description": indicator.description,
-                "description": summary_text,  # AI summarized description
-                "remarks": "COMPLIED" if summary_text else "",
-                "war_ids": war_ids,
-            })
+    users = get_users_by_identifiers(personnel_names)
+    # Same rows and text as the export, plus the unit's active indicators that have no WARs yet
+    rows_by_user = unit_month_ipmt_rows(unit, year, month_num, users, all_indicators=True)
+    reports = [row for user in users for row in rows_by_user[user.id]]
 
     context = {
         "reports": reports,
@@ -569,101 +501,102 @@ def update_war_success_indicator(request, war_id):
 
 
 
+FEEDBACK_PAGE_SIZE = 50
+FEEDBACK_STREAM_MAX_ROWS = 20000  # larger CSV exports go to the export queue
+
+
+class _Echo:
+    """Pseudo-buffer for csv.writer: write() hands the formatted line back to the stream."""
+
+    def write(self, value):
+        return value
+
+
+def _sqd_summary_rows(summary):
+    """satisfaction_summary() as labelled rows for the feedback page."""
+    rows = []
+    for question, result in summary.items():
+        label = "Overall rating" if question == OVERALL else Feedback._meta.get_field(question).verbose_name
+        rows.append({"question": question.upper(), "label": label, **result})
+    return rows
+
+
 @login_required
 @user_passes_test(is_gso_or_director)
 def feedback_reports(request):
-    """Show feedbacks with optional filtering by unit and date range, and export CSV."""
-    
-    feedback_list = Feedback.objects.select_related("request", "request__requestor", "request__unit").order_by("-date_submitted")
+    """Show feedbacks with optional filtering by unit, month, quarter or date range, and export CSV."""
     units = Unit.objects.all()
 
     # Get filter parameters from GET
     unit_id = request.GET.get("unit_id")
     month = request.GET.get("month")          # format: 'YYYY-MM'
+    quarter = request.GET.get("quarter")      # format: 'YYYY-Qn'
     start_date = request.GET.get("start_date")
     end_date = request.GET.get("end_date")
 
-    # Filter by unit
-    if unit_id:
-        feedback_list = feedback_list.filter(request__unit_id=unit_id)
-
-    # Filter by month
-    if month:
-        try:
-            year, month_num = map(int, month.split("-"))
-            feedback_list = feedback_list.filter(
-                date_submitted__year=year,
-                date_submitted__month=month_num
-            )
-        except ValueError:
-            pass
+    # A quarter is a date range over its three months (a month filter takes precedence)
+    months = [month] if month else quarter_months(quarter)
+    list_start, list_end = start_date, end_date
+    if not month and months and not (start_date or end_date):
+        year, last = map(int, months[-1].split("-"))
+        list_start = f"{months[0]}-01"
+        list_end = f"{months[-1]}-{calendar.monthrange(year, last)[1]:02d}"
 
-    # Filter by custom date range
-    if start_date:
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            feedback_list = feedback_list.filter(date_submitted__date__gte=start)
-        except ValueError:
-            pass
+    feedback_list = filter_feedback(unit_id, month, list_start, list_end)
 
-    if end_date:
-        try:
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-            feedback_list = feedback_list.filter(date_submitted__date__lte=end)
-        except ValueError:
-            pass
-
-    # CSV Export
+    # CSV Export: streamed row by row; very large exports are rendered in the background
     if "export" in request.GET:
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="feedback_report.csv"'
-        writer = csv.writer(response)
-        writer.writerow([
-            "Service Request ID",
-            "Unit",
-            "Requestor Name",
-            "Requestor Email",
-            "SQD1","SQD2","SQD3","SQD4","SQD5","SQD6","SQD7","SQD8","SQD9",
-            "CC1","CC2","CC3",
-            "Average Score",
-            "Suggestions",
-            "Date Submitted"
-        ])
-        for fb in feedback_list:
-            req = fb.request
-            requestor_name = req.custom_full_name or (req.requestor.get_full_name() if req.requestor else "")
-            requestor_email = req.custom_email or (req.requestor.email if req.requestor else "")
-            request_id = req.id
-            unit_name = req.unit.name if req.unit else ""
-            formatted_date = fb.date_submitted.strftime("%Y-%m-%d %H:%M") if fb.date_submitted else ""
-            writer.writerow([
-                request_id,
-                unit_name,
-                requestor_name,
-                requestor_email,
-                fb.sqd1 or "", fb.sqd2 or "", fb.sqd3 or "", fb.sqd4 or "",
-                fb.sqd5 or "", fb.sqd6 or "", fb.sqd7 or "", fb.sqd8 or "", fb.sqd9 or "",
-                fb.cc1 or "", fb.cc2 or "", fb.cc3 or "",
-                round(fb.average_score, 2),
-                fb.suggestions or "",
-                formatted_date
-            ])
-        return response
-
-    # Compute average_rating for template display
-    for fb in feedback_list:
-        scores = [fb.sqd1, fb.sqd2, fb.sqd3, fb.sqd4, fb.sqd5, fb.sqd6, fb.sqd7, fb.sqd8, fb.sqd9]
-        valid_scores = [s for s in scores if s is not None]
-        fb.average_rating = round(sum(valid_scores)/len(valid_scores), 2) if valid_scores else 0
+        if feedback_list.count() <= FEEDBACK_STREAM_MAX_ROWS:
+            writer = csv.writer(_Echo())
+            response = StreamingHttpResponse(
+                (writer.writerow(row) for row in feedback_csv_rows(feedback_list)),
+                content_type="text/csv",
+            )
+            response["Content-Disposition"] = 'attachment; filename="feedback_report.csv"'
+            return response
+
+        unit = Unit.objects.filter(id=unit_id).first() if (unit_id or "").isdigit() else None
+        job, created = enqueue_export("feedback", request.user, unit=unit, month=month, params={
+            "start_date": list_start or None,
+            "end_date": list_end or None,
+        })
+        messages.info(request, "The feedback CSV is being prepared. You will get a notification with the download link.")
+        query = request.GET.copy()
+        query.pop("export")
+        return redirect(f"{request.path}?{query.urlencode()}")
+
+    # Rating per row comes from the stored average_score
+    feedback_list = feedback_list.annotate(average_rating=Round("average_score", 2))
+
+    page_obj = Paginator(feedback_list, FEEDBACK_PAGE_SIZE).get_page(request.GET.get("page"))
+    total_feedback = page_obj.paginator.count  # every feedback, rated or not
+
+    # Per-question results and the overall rating come from the unit/month rollups;
+    # a custom date range doesn't line up with months, so it is aggregated directly
+    sqd_summary = None
+    if not (start_date or end_date):
+        sqd_summary = satisfaction_summary(unit_id, months)
+        overall_average = sqd_summary[OVERALL]["mean"]
+    else:
+        totals = feedback_list.aggregate(overall_average=Avg("average_score", filter=rated()))
+        overall_average = totals["overall_average"]
+    page_query = request.GET.copy()
+    page_query.pop("page", None)
 
     return render(
         request,
         "gso_office/feedbacks/feedback_reports.html",
         {
-            "feedback_list": feedback_list,
+            "feedback_list": page_obj.object_list,
+            "page_obj": page_obj,
+            "page_query": page_query.urlencode(),
+            "total_feedback": total_feedback,
+            "overall_average": overall_average,
+            "sqd_summary": _sqd_summary_rows(sqd_summary) if sqd_summary else None,
             "units": units,
             "selected_unit": unit_id,
             "selected_month": month,
+            "selected_quarter": quarter,
             "start_date": start_date,
             "end_date": end_date
         }
@@ -674,8 +607,6 @@ def feedback_reports(request):
 
 
 # GSO Analytics View
-from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
 from apps.gso_requests.models import ServiceRequest as Request
 from apps.gso_inventory.models import InventoryItem as Material
 
@@ -815,11 +746,7 @@ def save_war(request):
 @login_required
 @user_passes_test(is_gso_or_director)
 def generate_war(request):
-    import calendar, os, json
-    from openpyxl import load_workbook
-    from openpyxl.styles import Alignment
-    from django.http import HttpResponse, JsonResponse
-
+    """Queue the WAR Excel export; the file is rendered by `process_export_jobs`."""
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=400)
 
@@ -834,124 +761,82 @@ def generate_war(request):
     if not month_filter:
         return JsonResponse({"error": "Month filter required"}, status=400)
 
-    # Parse month filter
+    # "YYYY-MM", or "YYYY" for the whole year
     try:
-        year, month_num = map(int, month_filter.split("-"))
+        export_period(month_filter)
+    except ValueError:
+        return JsonResponse({"error": "Invalid month format. Use YYYY-MM or YYYY"}, status=400)
+
+    # An unknown unit name exports every unit, as in the preview
+    unit = Unit.objects.filter(name__iexact=unit_name).first() if unit_name else None
+    job, created = enqueue_export("war", request.user, unit=unit, month=month_filter, params={
+        "report_ids": sorted(int(i) for i in report_ids or []),
+    })
+    return _export_job_response(job, created)
+
+
+@login_required
+@user_passes_test(is_gso_or_director)
+def generate_month_end_bundle(request):
+    """Queue every unit's WAR and IPMT for a month as one ZIP (see `month_end_bundle`)."""
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=400)
+
+    try:
+        month_filter = json.loads(request.body).get("month")
     except Exception:
+        month_filter = request.POST.get("month")
+
+    try:
+        _, first_month, last_month = export_period(month_filter or "")
+    except ValueError:
+        first_month, last_month = None, 0
+    if first_month != last_month:
         return JsonResponse({"error": "Invalid month format. Use YYYY-MM"}, status=400)
 
-    month_range = f"{calendar.month_name[month_num]} 1 - {calendar.month_name[month_num]} {calendar.monthrange(year, month_num)[1]}"
-    unit = Unit.objects.filter(name__iexact=unit_name).first() if unit_name else None
+    job, created = enqueue_export("bundle", request.user, month=month_filter)
+    return _export_job_response(job, created)
 
-    # Fetch WARs
-    wars = WorkAccomplishmentReport.objects.select_related("unit").prefetch_related("assigned_personnel").filter(
-        date_started__year=year,
-        date_started__month=month_num
-    )
-    if unit:
-        wars = wars.filter(unit=unit)
-    if report_ids:
-        wars = wars.filter(id__in=report_ids)
-    wars = wars.order_by("date_started")
-
-    # Load template
-    template_path = os.path.join(settings.BASE_DIR, "static", "excel_file", "samplewar.xlsx")
-    wb = load_workbook(template_path)
-    ws = wb.active
-
-    # Merge and write month/unit headers
-    ws.merge_cells("A7:H7")
-    ws.cell(row=7, column=1, value=month_range).alignment = Alignment(horizontal="center", vertical="center")
-
-    ws.merge_cells("A9:H9")
-    ws.cell(row=9, column=1, value=unit.name.upper() if unit else "UNASSIGNED").alignment = Alignment(horizontal="center", vertical="center")
-
-    start_row = 11
-
-    # Helper: adjust row height dynamically
-    from openpyxl.utils import get_column_letter
-    def adjust_row_height(row, columns):
-        max_lines = 1
-        for col in columns:
-            cell = ws.cell(row=row, column=col)
-            if cell.value:
-                col_width = ws.column_dimensions[get_column_letter(col)].width or 10
-                lines = len(str(cell.value)) / col_width
-                max_lines = max(max_lines, int(lines) + 1)
-        ws.row_dimensions[row].height = max(15, max_lines * 15)
-
-    # Write WAR rows
-    for i, war in enumerate(wars, start=start_row):
-        ws.cell(row=i, column=1).value = war.date_started.strftime("%Y-%m-%d") if war.date_started else ""
-        ws.cell(row=i, column=2).value = getattr(war, "date_completed", None).strftime("%Y-%m-%d") if getattr(war, "date_completed", None) else ""
-        ws.cell(row=i, column=3).value = getattr(war, "project_name", "")
-        ws.cell(row=i, column=4).value = getattr(war, "description", "")
-        ws.cell(row=i, column=5).value = getattr(war, "requesting_office", "")
-        ws.cell(row=i, column=6).value = ", ".join([p.get_full_name() for p in war.assigned_personnel.all()])
-        ws.cell(row=i, column=7).value = getattr(war, "status", "")
-        ws.cell(row=i, column=8).value = getattr(war, "rating", "")
-
-        # Wrap text for Project Name and Description, center vertically and horizontally
-        for col in [3, 4]:
-            ws.cell(row=i, column=col).alignment = Alignment(wrap_text=True, vertical="center", horizontal="center")
-
-        # Center all other columns
-        for col in [1,2,5,6,7,8]:
-            ws.cell(row=i, column=col).alignment = Alignment(vertical="center", horizontal="center")
-
-        # Adjust row height only based on Project Name and Description
-        adjust_row_height(i, [3,4])
-
-    # TOTAL row (optional, if you want to keep a total or leave blank)
-    total_row = start_row + len(wars)
-
-    # --- Footer: Prepared / Checked / Noted by ---
-    sign_row = total_row + 2
-    footer_rows = 3
-    unit_name_lower = unit_name.lower() if unit_name else ""
-
-    if "electrical" in unit_name_lower:
-        prepared_by_text = "Prepared by:\nPepito Nanalo\nAdministrative Assistant II"
-        checked_by_text = "Checked by:\nJuan Juanone\nOIC Head, Electrical Services Unit"
-    elif "utility" in unit_name_lower:
-        prepared_by_text = "Prepared by:\nLuz Bagani\nAdministrative Assistant II"
-        checked_by_text = "Checked by:\nManny Santos\nOIC Head, Utility Unit"
-    elif "repair" in unit_name_lower or "maintenance" in unit_name_lower:
-        prepared_by_text = "Prepared by:\nRepair/Maintenance Person\nPosition"
-        checked_by_text = "Checked by:\nRepair/Maintenance Head\nPosition"
-    elif "motorpool" in unit_name_lower:
-        prepared_by_text = "Prepared by:\nMotorpool Person\nPosition"
-        checked_by_text = "Checked by:\nMotorpool Head\nPosition"
-    else:
-        prepared_by_text = "Prepared by:\nPrepared Person\nPosition"
-        checked_by_text = "Checked by:\nChecked Person\nPosition"
-
-    noted_by_text = "Noted by:\nENGR. Juan Tamad\nGSO Director"
-
-    # Merge cells for 3-row footer
-    ws.merge_cells(start_row=sign_row, start_column=1, end_row=sign_row+footer_rows-1, end_column=3)
-    ws.merge_cells(start_row=sign_row, start_column=4, end_row=sign_row+footer_rows-1, end_column=6)
-    ws.merge_cells(start_row=sign_row, start_column=7, end_row=sign_row+footer_rows-1, end_column=8)
-
-    ws.cell(row=sign_row, column=1, value=prepared_by_text)
-    ws.cell(row=sign_row, column=4, value=checked_by_text)
-    ws.cell(row=sign_row, column=7, value=noted_by_text)
-
-    # Wrap text and center vertically & horizontally
-    for col in [1,4,7]:
-        cell = ws.cell(row=sign_row, column=col)
-        cell.alignment = Alignment(wrap_text=True, vertical="center", horizontal="center")
-
-    # Adjust row heights for footer
-    for r in range(sign_row, sign_row + footer_rows):
-        ws.row_dimensions[r].height = 20
-
-    # Return Excel
-    response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    filename = f"WAR_{unit_name}_{month_filter}.xlsx"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    wb.save(response)
-    return response
+
+# -------------------------------
+# Export Jobs
+# -------------------------------
+def _export_job_payload(job):
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "error": job.last_error if job.status == "failed" else "",
+        "status_url": reverse("gso_reports:export_status", args=[job.id]),
+        "download_url": download_url(job) if job.status == "done" else None,
+    }
+
+
+def _export_job_response(job, created):
+    payload = _export_job_payload(job)
+    payload["deduplicated"] = not created
+    return JsonResponse(payload, status=202 if job.status != "done" else 200)
+
+
+def _visible_export(request, job_id):
+    job = get_object_or_404(ExportJob, id=job_id)
+    if request.user.role != "director" and not job.recipients.filter(id=request.user.id).exists():
+        raise Http404("Export not found.")
+    return job
+
+
+@login_required
+@user_passes_test(is_gso_or_director)
+def export_status(request, job_id):
+    return JsonResponse(_export_job_payload(_visible_export(request, job_id)))
+
+
+@login_required
+@user_passes_test(is_gso_or_director)
+def download_export(request, job_id):
+    job = _visible_export(request, job_id)
+    if job.status != "done" or not job.file:
+        raise Http404("Export is not ready.")
+    return FileResponse(job.file.open("rb"), as_attachment=True, filename=job.filename)
 
 
 
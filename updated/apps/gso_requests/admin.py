@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ServiceRequest, RequestMaterial, TaskReport, Vehicle
+from .models import ServiceRequest, RequestMaterial, TaskReport, Vehicle, FeedbackRollup
 from auditlog.mixins import AuditlogHistoryAdminMixin
 from auditlog.models import LogEntry
 
@@ -130,3 +130,12 @@ class VehicleAdmin(admin.ModelAdmin):
     search_fields = ('plate_number', 'make_model')
     list_filter = ('active',)
 
+
+# -----------------------------
+# Feedback Rollup Admin
+# -----------------------------
+@admin.register(FeedbackRollup)
+class FeedbackRollupAdmin(admin.ModelAdmin):
+    list_display = ("month", "unit", "question", "responses", "total", "updated_at")
+    list_filter = ("month", "unit", "question")
+    readonly_fields = ("unit", "month", "question", "responses", "total", "distribution", "updated_at")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.gso_requests.models import Feedback
+from apps.gso_requests.rollups import rebuild_feedback_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-unit, per-month SQD/CC feedback rollups from the Feedback table."
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Rebuilding feedback rollups from {Feedback.objects.count()} feedback(s)"
+        ))
+        written = rebuild_feedback_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup row(s)."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_accounts', '0003_employmentstatus_position_user_employment_status_and_more'),
+        ('gso_requests', '0015_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.CharField(max_length=7)),
+                ('question', models.CharField(max_length=10)),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('distribution', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_rollups', to='gso_accounts.unit')),
+            ],
+            options={
+                'ordering': ['month', 'unit', 'question'],
+                'unique_together': {('unit', 'month', 'question')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:11
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gso_requests', '0016_feedbackrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('created_at'), models.F('id'), condition=models.Q(('status', 'Completed')), name='request_listing_idx'),
+        ),
+    ]
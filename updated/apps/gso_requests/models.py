@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import TruncDate
 from apps.gso_accounts.models import Unit, Department
 from apps.gso_inventory.models import InventoryItem
 from apps.gso_reports.models import SuccessIndicator 
@@ -94,9 +97,20 @@ class ServiceRequest(models.Model):
         help_text="Temporary field where personnel can choose success indicator before WAR generation."
     )
 
+    # Full-text search (kept current by apps.gso_reports.signals)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # === GLOBAL DEFAULT ORDERING (Emergency requests first) ===
     class Meta:
         ordering = ['-is_emergency', '-created_at']
+        indexes = [
+            GinIndex(fields=["search_vector"], name="request_search_gin"),
+            # Keyset order of the accomplishment report listing (completed requests by day, id)
+            models.Index(
+                TruncDate("created_at"), models.F("id"),
+                name="request_listing_idx", condition=models.Q(status="Completed"),
+            ),
+        ]
 
     def __str__(self):
         display_name = self.custom_full_name or self.requestor.get_full_name()
@@ -244,19 +258,51 @@ class Feedback(models.Model):
     date_submitted = models.DateTimeField(auto_now_add=True)
 
     def save(self, *args, **kwargs):
-        """Automatically compute average score when saving."""
+        """Automatically compute average score when saving, and keep the unit/month rollups current."""
+        from .rollups import feedback_rollup_delta
+
         scores = [
             self.sqd1, self.sqd2, self.sqd3, self.sqd4,
             self.sqd5, self.sqd6, self.sqd7, self.sqd8, self.sqd9
         ]
         valid_scores = [s for s in scores if s is not None]
         self.average_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = Feedback.objects.select_related("request").filter(pk=self.pk).first() if self.pk else None
+            super().save(*args, **kwargs)
+            feedback_rollup_delta(previous, self)
 
     def __str__(self):
         return f"Feedback for Request #{self.request.id} by {self.user.username}"
 
 
+class FeedbackRollup(models.Model):
+    """
+    Materialized Citizen's Charter / SQD results for one unit, month and question.
+    Kept current by Feedback.save() and a pre_delete receiver; `manage.py rebuild_feedback_rollups`
+    recomputes everything from the Feedback table.
+    """
+    unit = models.ForeignKey(Unit, on_delete=models.CASCADE, related_name="feedback_rollups")
+    month = models.CharField(max_length=7)  # "YYYY-MM" of date_submitted
+    question = models.CharField(max_length=10)  # "sqd1".."sqd9", "cc1".."cc3", or "overall" (average_score)
+
+    responses = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)  # sum of numeric answers (SQD and overall), for the mean
+    distribution = models.JSONField(default=dict, blank=True)  # answer -> count
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("unit", "month", "question")
+        ordering = ["month", "unit", "question"]
+
+    @property
+    def mean(self):
+        return self.total / self.responses if self.responses and self.question.startswith(("sqd", "overall")) else None
+
+    def __str__(self):
+        return f"{self.unit} {self.month} {self.question}: {self.responses} response(s)"
+
+
 
 
 
@@ -268,6 +314,7 @@ class Feedback(models.Model):
 auditlog.register(
     ServiceRequest,
     m2m_fields={"assigned_personnel", "materials"},  # Track changes on M2M
+    exclude_fields=["search_vector"],                 # Derived search data, not history
     serialize_data=True,                              # Store entire state
     serialize_auditlog_fields_only=True               # Only include fields tracked by Auditlog
 )
@@ -0,0 +1,208 @@
+# apps/gso_requests/rollups.py
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Feedback, FeedbackRollup
+
+SQD_QUESTIONS = [f"sqd{i}" for i in range(1, 10)]
+CC_QUESTIONS = ["cc1", "cc2", "cc3"]
+OVERALL = "overall"  # one response per rated feedback: its average_score
+QUESTIONS = SQD_QUESTIONS + CC_QUESTIONS + [OVERALL]
+
+# A feedback counts for its request's unit; both the incremental and the full path read it from here
+UNIT_PATH = "request__unit_id"
+
+
+def feedback_unit_id(feedback):
+    value = feedback
+    for attr in UNIT_PATH.split("__"):
+        value = getattr(value, attr)
+    return value
+
+
+def rated(prefix: str = "") -> Q:
+    """Feedback with at least one SQD answer; the rest (all blank or N/A) have no overall score."""
+    condition = Q()
+    for question in SQD_QUESTIONS:
+        condition |= Q(**{f"{prefix}{question}__isnull": False})
+    return condition
+
+
+# -------------------------------
+# Incremental Updates
+# -------------------------------
+def month_key(submitted) -> str:
+    local = timezone.localtime(submitted) if timezone.is_aware(submitted) else submitted
+    return f"{local.year:04d}-{local.month:02d}"
+
+
+def answer_key(question: str, value):
+    """(distribution key, numeric value or None) for one answer, or None when unanswered."""
+    if question in CC_QUESTIONS:
+        value = (value or "").strip()
+        return (value, None) if value else None
+    if value is None:
+        return None
+    if question == OVERALL:
+        # Half-up rounding into a 1-5 bucket; the mean keeps the exact score
+        return str(int(value + 0.5)), value
+    return str(value), value
+
+
+def feedback_answers(feedback: Feedback) -> dict:
+    """question -> answer_key() for every answered question of one feedback."""
+    answers = {}
+    for question in QUESTIONS:
+        if question == OVERALL and not any(q in answers for q in SQD_QUESTIONS):
+            continue  # average_score is a placeholder 0 when no SQD was answered
+        field = "average_score" if question == OVERALL else question
+        answer = answer_key(question, getattr(feedback, field))
+        if answer:
+            answers[question] = answer
+    return answers
+
+
+def feedback_rollup_delta(previous, current):
+    """
+    Move one feedback's contribution from its previous state to its current state.
+    Either side may be None (created / deleted). Must run inside a transaction.
+    """
+    changes = defaultdict(lambda: [0, 0.0, Counter()])  # (unit_id, month, question) -> [responses, total, distribution]
+    for feedback, sign in ((previous, -1), (current, 1)):
+        if feedback is None or not feedback.date_submitted:
+            continue
+        unit_id, month = feedback_unit_id(feedback), month_key(feedback.date_submitted)
+        for question, (answer, value) in feedback_answers(feedback).items():
+            change = changes[(unit_id, month, question)]
+            change[0] += sign
+            change[1] += sign * (value or 0)
+            change[2][answer] += sign
+
+    # An edit that changed nothing cancels out
+    changes = {
+        key: change for key, change in changes.items()
+        if change[0] or change[1] or any(change[2].values())
+    }
+    if not changes:
+        return
+
+    FeedbackRollup.objects.bulk_create(
+        [FeedbackRollup(unit_id=u, month=m, question=q) for u, m, q in changes],
+        ignore_conflicts=True,
+    )
+    match = Q()
+    for unit_id, month in {(u, m) for u, m, _ in changes}:
+        match |= Q(unit_id=unit_id, month=month)
+    rollups = FeedbackRollup.objects.select_for_update().filter(
+        match, question__in={q for _, _, q in changes}
+    )
+
+    updated, emptied = [], []
+    for rollup in rollups:
+        change = changes.get((rollup.unit_id, rollup.month, rollup.question))
+        if not change:
+            continue
+        responses, total, distribution = change
+        rollup.responses = max(0, rollup.responses + responses)
+        rollup.total += total
+        for answer, count in distribution.items():
+            rollup.distribution[answer] = rollup.distribution.get(answer, 0) + count
+            if rollup.distribution[answer] <= 0:
+                del rollup.distribution[answer]
+        if rollup.responses:
+            updated.append(rollup)
+        else:
+            emptied.append(rollup.pk)  # a rebuild writes no row for a question nobody answered
+    FeedbackRollup.objects.bulk_update(updated, ["responses", "total", "distribution", "updated_at"])
+    FeedbackRollup.objects.filter(pk__in=emptied).delete()
+
+
+# -------------------------------
+# Full Rebuild
+# -------------------------------
+def rebuild_feedback_rollups() -> int:
+    """
+    Recompute every rollup from the Feedback table with one grouped query per question
+    (grouped by unit, month and raw answer).
+    Returns the number of rollup rows written.
+    """
+    rollups = {}
+    base = Feedback.objects.annotate(rollup_month=TruncMonth("date_submitted")).order_by()
+
+    for question in QUESTIONS:
+        field = "average_score" if question == OVERALL else question
+        if question in CC_QUESTIONS:
+            answered = base.exclude(**{field: ""})
+        elif question == OVERALL:
+            answered = base.filter(rated())
+        else:
+            answered = base.filter(**{f"{field}__isnull": False})
+        grouped = answered.values(UNIT_PATH, "rollup_month", field).annotate(n=Count("id"))
+
+        for row in grouped:
+            month = f"{row['rollup_month'].year:04d}-{row['rollup_month'].month:02d}"
+            key = (row[UNIT_PATH], month, question)
+            answer = answer_key(question, row[field])
+            if not answer:
+                continue
+            answer, value = answer
+            rollup = rollups.setdefault(key, FeedbackRollup(unit_id=key[0], month=month, question=question))
+            rollup.responses += row["n"]
+            rollup.total += (value or 0) * row["n"]
+            rollup.distribution[answer] = rollup.distribution.get(answer, 0) + row["n"]
+
+    with transaction.atomic():
+        FeedbackRollup.objects.all().delete()
+        FeedbackRollup.objects.bulk_create(rollups.values(), batch_size=500)
+    return len(rollups)
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def quarter_months(quarter: str):
+    """["YYYY-MM", ...] for a "YYYY-Qn" quarter, or None if it doesn't parse."""
+    match = re.fullmatch(r"(\d{4})-Q([1-4])", (quarter or "").strip().upper())
+    if not match:
+        return None
+    year, q = int(match.group(1)), int(match.group(2))
+    return [f"{year:04d}-{m:02d}" for m in range(3 * q - 2, 3 * q + 1)]
+
+
+def satisfaction_summary(unit_id=None, months=None) -> dict:
+    """
+    Per-question results merged over the selected unit(s) and month(s), read from the rollups
+    (units x months x questions rows, whatever the number of feedbacks).
+
+    Returns {question: {"responses", "mean", "distribution": [(answer, count), ...]}} in QUESTIONS order.
+    """
+    rollups = FeedbackRollup.objects.all()
+    if unit_id:
+        rollups = rollups.filter(unit_id=unit_id)
+    if months is not None:
+        rollups = rollups.filter(month__in=months)
+
+    merged = {question: [0, 0.0, Counter()] for question in QUESTIONS}
+    for question, responses, total, distribution in rollups.values_list("question", "responses", "total", "distribution"):
+        if question not in merged:
+            continue
+        merged[question][0] += responses
+        merged[question][1] += total
+        merged[question][2].update(distribution)
+
+    summary = {}
+    for question, (responses, total, distribution) in merged.items():
+        numeric = question in SQD_QUESTIONS or question == OVERALL
+        summary[question] = {
+            "responses": responses,
+            "mean": round(total / responses, 2) if responses and numeric else None,
+            "distribution": sorted(
+                distribution.items(), key=lambda item: int(item[0]) if numeric else item[0], reverse=numeric
+            ),
+        }
+    return summary
@@ -0,0 +1,15 @@
+# apps/gso_requests/signals.py
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Feedback
+from .rollups import feedback_rollup_delta
+
+
+# -------------------------------
+# Keep feedback rollups in step with deletes
+# -------------------------------
+@receiver(pre_delete, sender=Feedback)
+def remove_feedback_from_rollups(sender, instance, **kwargs):
+    # Also runs for queryset and cascade deletes (e.g. a deleted ServiceRequest)
+    feedback_rollup_delta(instance, None)
@@ -1,3 +1,74 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
-# Create your tests here.
+from apps.gso_accounts.models import Unit, User
+from apps.gso_requests.models import Feedback, FeedbackRollup, ServiceRequest
+from apps.gso_requests.rollups import OVERALL, answer_key, feedback_answers, quarter_months, rebuild_feedback_rollups
+
+
+class FeedbackRollupAnswerTests(SimpleTestCase):
+    def test_answers_of_one_feedback(self):
+        feedback = Feedback(sqd1=5, sqd2=4, cc1=" Yes ", cc2="", average_score=4.5)
+
+        answers = feedback_answers(feedback)
+
+        self.assertEqual(answers["sqd1"], ("5", 5))
+        self.assertEqual(answers["cc1"], ("Yes", None))
+        self.assertNotIn("sqd3", answers)
+        self.assertNotIn("cc2", answers)
+        self.assertEqual(answers[OVERALL], ("5", 4.5))  # half-up bucket, exact score for the mean
+
+    def test_feedback_without_sqd_answers_has_no_overall(self):
+        feedback = Feedback(cc1="Yes", average_score=0)
+
+        self.assertEqual(list(feedback_answers(feedback)), ["cc1"])
+
+    def test_unanswered(self):
+        self.assertIsNone(answer_key("sqd1", None))
+        self.assertIsNone(answer_key("cc3", "   "))
+
+    def test_quarter_months(self):
+        self.assertEqual(quarter_months("2025-Q1"), ["2025-01", "2025-02", "2025-03"])
+        self.assertEqual(quarter_months(" 2025-q4"), ["2025-10", "2025-11", "2025-12"])
+        self.assertIsNone(quarter_months("2025-Q5"))
+        self.assertIsNone(quarter_months(None))
+
+
+class FeedbackRollupConsistencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="requestor", role="requestor")
+        self.electrical = Unit.objects.create(name="Electrical")
+        self.utility = Unit.objects.create(name="Utility")
+
+    def feedback(self, unit, **answers):
+        request = ServiceRequest.objects.create(requestor=self.user, unit=unit, description="Repair")
+        return Feedback.objects.create(request=request, user=self.user, **answers)
+
+    def rollups(self):
+        return sorted(
+            (r.unit_id, r.month, r.question, r.responses, round(r.total, 6), r.distribution)
+            for r in FeedbackRollup.objects.all()
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollups()
+        rebuild_feedback_rollups()
+        self.assertEqual(incremental, self.rollups())
+
+    def test_incremental_rollups_equal_a_full_rebuild(self):
+        first = self.feedback(self.electrical, sqd1=5, sqd2=4, cc1="Yes")
+        self.feedback(self.electrical, cc2="No")  # every SQD blank or N/A
+        unrated = self.feedback(self.utility)
+        self.assertMatchesRebuild()
+        self.assertFalse(FeedbackRollup.objects.filter(unit=self.utility, question=OVERALL).exists())
+
+        first.sqd2 = None
+        first.sqd3 = 2
+        first.cc1 = ""
+        first.save()
+        unrated.sqd9 = 3
+        unrated.save()
+        self.assertMatchesRebuild()
+
+        first.delete()
+        ServiceRequest.objects.filter(pk=unrated.request_id).delete()  # cascades to the feedback
+        self.assertMatchesRebuild()
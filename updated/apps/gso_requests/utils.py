@@ -2,10 +2,10 @@ from django.db.models import Q
 from apps.gso_requests.models import ServiceRequest
 from apps.gso_inventory.models import InventoryItem
 from apps.gso_reports.models import WorkAccomplishmentReport, SuccessIndicator
-from apps.ai_service.utils import generate_war_description  # AI util
+from apps.gso_reports.search import search_requests
+from apps.ai_service.jobs import enqueue_war_description  # AI job queue
 from apps.notifications.models import Notification
 from django.utils import timezone
-import threading
 
 
 # -------------------------------
@@ -13,13 +13,8 @@ import threading
 # -------------------------------
 def filter_requests(queryset, search_query=None, unit_filter=None, status_filter=None):
     if search_query:
-        queryset = queryset.filter(
-            Q(requestor__username__icontains=search_query)
-            | Q(requestor__first_name__icontains=search_query)
-            | Q(requestor__last_name__icontains=search_query)
-            | Q(unit__name__icontains=search_query)
-            | Q(requestor__department__name__icontains=search_query)
-        )
+        # Ranked full-text search (GIN index), best match first
+        queryset = search_requests(queryset, search_query).order_by("-search_rank", "-is_emergency", "-created_at")
     if unit_filter:
         try:
             queryset = queryset.filter(unit_id=int(unit_filter))
@@ -50,7 +45,8 @@ def get_unit_inventory(unit, search_query=None):
 def create_war_from_request(request):
     """
     Auto-generate a Work Accomplishment Report (WAR) when a request is completed.
-    Generates AI description in a background thread to avoid blocking the request.
+    Queues the AI description as a durable job (see `manage.py process_war_jobs`)
+    so it is not lost if the web worker restarts.
     Personnel can later update the Success Indicator.
     """
     # Combine all task reports (if any)
@@ -85,19 +81,10 @@ def create_war_from_request(request):
 
 
     # ---------------------------
-    # Generate AI description asynchronously
+    # Queue AI description generation
     # ---------------------------
-    def generate_description_thread(war_instance, req):
-        description = generate_war_description(req)
-        if description:
-            war_instance.description = description
-            war_instance.save(update_fields=["description"])
-
-    threading.Thread(
-        target=generate_description_thread,
-        args=(war, request),
-        daemon=True,
-    ).start()
+    if not (war.description or "").strip():
+        enqueue_war_description(war)
 
     return war
 
@@ -0,0 +1,15 @@
+// Poll a queued export job (see gso_reports export_status); download when ready,
+// otherwise the notification carries the link.
+async function waitForExport(job) {
+    for (let i = 0; i < 30 && !["done", "failed"].includes(job.status); i++) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        job = await (await fetch(job.status_url)).json();
+    }
+    if (job.status === "done") {
+        window.location.href = job.download_url;
+    } else if (job.status === "failed") {
+        alert("Export failed: " + job.error);
+    } else {
+        alert("The export is still being prepared. You will get a notification with the download link.");
+    }
+}